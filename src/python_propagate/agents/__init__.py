@@ -7,6 +7,7 @@ Date: 2025-01-30
 
 """
 
+import os
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -20,12 +21,35 @@ from python_propagate.dynamics.j2 import J2
 from python_propagate.dynamics.j3 import J3
 from python_propagate.dynamics.drag import Drag
 from python_propagate.dynamics.stm import STM
+from python_propagate.dynamics.zonal import fuse_zonal_gravity
+from python_propagate.dynamics.compiled import compiled_propagator
 
 from python_propagate.agents.state import State, OrbitalElements
+from python_propagate.agents.ephemeris import Ephemeris
+
+from python_propagate.propagators import iterate_output
+from python_propagate.propagators.integrators import (
+    INTEGRATORS,
+    build_integrator,
+    error_tolerances,
+)
+from python_propagate.propagators.kepler import UniversalKepler
+from python_propagate.propagators.mean_elements import propagate_mean_elements
+from python_propagate.propagators.encke import propagate_encke
+from python_propagate.propagators.regularized import propagate_regularized
+from python_propagate.events import event_occurrences
 
 from python_propagate.utilities.transforms import classical2cart
 from python_propagate.utilities.string_format import DATESTR
-from python_propagate.utilities.units import DEG2RAD
+from python_propagate.utilities.units import DEG2RAD, CanonicalUnits
+from python_propagate.utilities.epochs import epoch_seconds, load_epochs
+
+# The propagation of the formulations other than cowell
+FORMULATIONS = {
+    "mean_elements": propagate_mean_elements,
+    "encke": propagate_encke,
+    "ks": propagate_regularized,
+}
 
 
 class Agent:
@@ -36,8 +60,9 @@ class Agent:
     ----------
     state : State
         The current state of the agent.
-    state_data : list
-        A list to store the state data of the agent.
+    state_data : Ephemeris or list
+        The states of the agent on the output grid, an empty list before
+        the agent is propagated.
     start_time : datetime
         The start time of the simulation.
     """
@@ -52,6 +77,11 @@ class Agent:
         mass=None,
         area=None,
         name="Agent",
+        integrator="RK45",
+        jit=False,
+        formulation="cowell",
+        canonical=False,
+        epochs=None,
     ):
         """
         Initializes the Agent with the given parameters.
@@ -72,6 +102,32 @@ class Agent:
             The mass of the agent (default is None).
         area : float, optional
             The area of the agent (default is None).
+        name : str, optional
+            The name of the agent (default is 'Agent').
+        integrator : str, optional
+            The integrator used to propagate the agent (default is 'RK45').
+            'rk4' and 'rk8' select the in-house fixed step integrators,
+            'abm' the fixed step Adams-Bashforth-Moulton multistep integrator
+            and 'dop853' the in-house adaptive integrator, any other name is
+            passed to scipy's solve_ivp.
+        jit : bool, optional
+            Propagate with the compiled numba dynamics (default is False).
+            Falls back to the Python dynamics with a warning when numba is
+            not installed or a dynamic is not supported.
+        formulation : str, optional
+            The formulation of the equations of motion (default is 'cowell').
+            'cowell' integrates the full state, 'encke' only its deviation
+            from a rectified Keplerian reference, 'ks' the Kustaanheimo-Stiefel
+            regularized state in fictitious time and 'mean_elements'
+            propagates the orbit averaged mean elements.
+        canonical : bool, optional
+            Integrate in the canonical units of the central body, see
+            ``CanonicalUnits`` (default is False). The tolerances then apply
+            to the canonical state, the output stays in km, km/s and s.
+        epochs : array-like or str, optional
+            The output epochs, datetimes, ISO 8601 strings or seconds after
+            the start time, or the path of a file read with ``load_epochs``
+            (default is None). The output is on the ``dt`` grid if None.
 
         """
         if isinstance(start_time, str):
@@ -86,6 +142,11 @@ class Agent:
         if area is not None:
             self._area = area * (1e-6)
 
+        if isinstance(epochs, (str, os.PathLike)):
+            epochs = load_epochs(epochs)
+        if epochs is not None:
+            epochs = epoch_seconds(epochs, start_time)
+
         self.state = state
         self._start_time = start_time
         self._duration = duration
@@ -94,8 +155,17 @@ class Agent:
         self._mass = mass
 
         self._name = name
+        self._integrator = integrator
+        self._jit = jit
+        self._formulation = formulation
+        self._canonical = canonical
+        self._epochs = epochs
         self.state_data = []
         self.time_data = []
+        self.integration_statistics = {}
+        self.ephemeris = None
+        self.event_data = []
+        self.mean_elements = None
         self.scenario = None
         self.dynamics = []
 
@@ -134,8 +204,43 @@ class Agent:
         """Returns the name of the agent."""
         return self._name
 
+    @property
+    def integrator(self):
+        """Returns the integrator of the agent."""
+        return self._integrator
+
+    @property
+    def jit(self):
+        """Returns True if the agent uses the compiled dynamics."""
+        return self._jit
+
+    @property
+    def formulation(self):
+        """Returns the formulation of the equations of motion."""
+        return self._formulation
+
+    @property
+    def canonical(self):
+        """Returns True if the agent is integrated in canonical units."""
+        return self._canonical
+
+    @property
+    def epochs(self):
+        """Returns the output epochs in seconds after the start time, or None."""
+        return self._epochs
+
+    @property
+    def two_body(self):
+        """Returns whether the agent only has Keplerian dynamics and the STM."""
+        types = {type(dynamic) for dynamic in self.dynamics}
+        return Keplerian in types and types <= {Keplerian, STM}
+
     def add_dynamics(self, dynamics: tuple):
         """Adds dynamics to the agent.
+
+        When several of the Keplerian, J2 and J3 dynamics are added they are
+        replaced by one ``ZonalGravity`` dynamic at the place of the first.
+
         Parameters
         dynamics : tuple
             A tuple of dynamics to be added to the agent.
@@ -159,12 +264,16 @@ class Agent:
                 self.dynamics.append(STM(scenario=self.scenario, agent=self))
 
             elif isinstance(dynamic, Dynamic):
+                if dynamic.agent is None:
+                    dynamic.agent = self
                 self.dynamics.append(dynamic)
             else:
                 raise NotImplementedError(
                     f"Dynamic <{dynamic}> is not an option or is spelled wrong"
                 )
 
+        fuse_zonal_gravity(self)
+
     def set_scenario(self, scenario: Scenario):
         """Sets the scenario for the agent.
         Parameters
@@ -256,7 +365,56 @@ class Agent:
 
         return state.dot()
 
-    def propagate(self, tolerance=1e-12):
+    def flat_propagator(self, time, state):
+        """
+        Propagates the agent's state using the flat array dynamics contract.
+
+        Used instead of ``propagator`` and ``stm_propagator`` when every
+        dynamic implements ``accel_into``, so no ``State`` objects are built
+        per call. The STM is propagated as well if the state vector has it.
+
+        Parameters
+        ----------
+        time : float
+            The current time in seconds.
+        state : np.ndarray
+            The current state vector of the agent.
+
+        Returns
+        -------
+        np.ndarray
+            The derivative of the state vector.
+        """
+        stm = state.size == 42
+        state_dot = np.zeros(state.size)
+        state_dot[0:3] = state[3:6]
+
+        position = state[0:3]
+        velocity = state[3:6]
+        acceleration = state_dot[3:6]
+
+        for dynamic in self.dynamics:
+            dynamic.accel_into(position, velocity, time, acceleration)
+
+            if stm and dynamic.stm:
+                dynamic.stm_dot_into(
+                    position,
+                    velocity,
+                    state[6:].reshape(6, 6),
+                    time,
+                    state_dot[6:].reshape(6, 6),
+                )
+
+        return state_dot
+
+    def propagate(
+        self,
+        tolerance=1e-12,
+        ephemeris=False,
+        events=(),
+        atol=None,
+        control_stm=True,
+    ):
         """
         Propagates the agent's state using numerical integration.
 
@@ -264,43 +422,348 @@ class Agent:
         ----------
         tolerance : float, optional
             The tolerance for the numerical integration (default is 1e-12).
+            Not used by the fixed step integrators.
+        ephemeris : bool, optional
+            Keep the integrator's steps as a continuous ``Ephemeris`` in
+            ``ephemeris`` so it can be sampled at any time (default is False).
+        events : tuple, optional
+            Events located during the propagation, see
+            ``python_propagate.events`` (default is ()).
+        atol : float or array-like, optional
+            The absolute tolerance of each component of the state vector,
+            ``tolerance`` if None (default is None), see
+            ``python_propagate.propagators.integrators.error_tolerances``.
+        control_stm : bool, optional
+            Include the STM in the error control of the adaptive integrators
+            (default is True). Without it an STM run takes the same steps as
+            a run of the state alone.
+
+        The number of right hand side evaluations, accepted steps and
+        rejected steps of the run are stored in ``integration_statistics``.
+        The located events are stored in ``event_data`` sorted by time, and a
+        terminal event ends the propagation and the output at the event.
+
+        Pure two-body agents are propagated analytically with the universal
+        Kepler equation, and the STM with its closed form, unless an
+        ephemeris or events are requested.
         """
 
-        # TODO Create own propagators instead of using scipy
+        time, t_eval = self.output_times()
 
-        time = [0, self.duration.total_seconds()]
-        method = "RK45"
+        if self.formulation in FORMULATIONS:
+            if ephemeris or events or self.state.stm is not None:
+                raise NotImplementedError(
+                    "Ephemerides, events and the STM are not supported for "
+                    f"formulation <{self.formulation}>"
+                )
+            ode_state = FORMULATIONS[self.formulation](self, time, t_eval, tolerance)
 
-        rtol = tolerance
-        atol = tolerance
-        t_eval = np.arange(time[0], time[1] + self.dt.seconds, self.dt.seconds)
+        elif self.formulation != "cowell":
+            raise NotImplementedError(
+                f"Formulation <{self.formulation}> is not an option or is spelled wrong"
+            )
 
-        if self.state.stm is not None:
-            ode_state = sci_int.solve_ivp(
-                self.stm_propagator,
+        elif self.two_body and not ephemeris and not events:
+            ode_state = UniversalKepler(
+                self.scenario.central_body.mu, time[0], self.state.compile()
+            ).integrate(t_eval)
+            self.integration_statistics = {
+                "nfev": 0,
+                "n_steps": 0,
+                "n_rejected": 0,
+                "step_size": None,
+            }
+        else:
+            rtol, atol = error_tolerances(
+                tolerance, atol, control_stm, self.state.stm is not None
+            )
+            ode_state = self.solve(
+                self.right_hand_side(),
                 time,
                 self.state.compile(),
-                method=method,
-                rtol=rtol,
+                t_eval,
+                tolerance=rtol,
+                record_steps=ephemeris,
+                events=events,
                 atol=atol,
-                t_eval=t_eval,
             )
-            self.state.position = ode_state.y[0:3, -1]
-            self.state.velocity = ode_state.y[3:6, -1]
-            self.state.stm = np.reshape(ode_state.y[6:, -1], (6, 6))
+
+        if ephemeris:
+            self.ephemeris = Ephemeris.from_steps(self.start_time, *ode_state.steps)
+
+        final_state = ode_state.y[:, -1]
+        if events:
+            self.event_data = event_occurrences(events, ode_state, self.start_time)
+            if ode_state.status == 1:
+                final_state = self.event_data[-1].state
+
+        self.state.position = final_state[0:3]
+        self.state.velocity = final_state[3:6]
+
+        if self.state.stm is not None:
+            self.state.stm = np.reshape(final_state[6:], (6, 6))
         else:
-            ode_state = sci_int.solve_ivp(
-                self.propagator,
+            self.save_state_data(ode_state=ode_state)
+
+    def propagate_iter(self, chunk=1000, tolerance=1e-12):
+        """
+        Propagates the agent's state and yields the output in chunks.
+
+        The integration only advances as far as the chunk being yielded, so
+        consumers can process the output while the propagation continues.
+        Nothing is stored in ``state_data``, the agent's state is set to the
+        final state once the generator is exhausted.
+
+        Parameters
+        ----------
+        chunk : int, optional
+            The number of output times per chunk (default is 1000).
+        tolerance : float, optional
+            The tolerance for the numerical integration (default is 1e-12).
+
+        Yields
+        ------
+        np.ndarray
+            The output times in seconds, shape (n_chunk,).
+        np.ndarray
+            The positions, shape (n_chunk, 3).
+        np.ndarray
+            The velocities, shape (n_chunk, 3).
+        np.ndarray
+            The STMs, shape (n_chunk, 6, 6), only if the state has an STM.
+        """
+        if self.formulation != "cowell":
+            raise NotImplementedError(
+                f"Formulation <{self.formulation}> is not supported for propagate_iter"
+            )
+
+        time, t_eval = self.output_times()
+        function = self.right_hand_side()
+        initial_state = self.state.compile()
+
+        units = None
+        step_size = self.dt.total_seconds()
+        if self.canonical:
+            units = CanonicalUnits.of(self.scenario.central_body)
+            scale = units.state_scale(initial_state.size)
+            function, time, initial_state, t_eval = units.problem(
+                function, time, initial_state, t_eval
+            )
+            step_size = step_size / units.time
+
+        integrator = build_integrator(
+            self.integrator,
+            function,
+            time,
+            initial_state,
+            tolerance=tolerance,
+            step_size=step_size,
+        )
+
+        final_state = self.state.compile()
+        for times, states in iterate_output(integrator, t_eval, chunk):
+            if units is not None:
+                times = times * units.time
+                states = states * scale[:, np.newaxis]
+            final_state = states[:, -1]
+
+            positions = states[0:3].T
+            velocities = states[3:6].T
+
+            if self.state.stm is not None:
+                yield times, positions, velocities, states[6:].T.reshape(-1, 6, 6)
+            else:
+                yield times, positions, velocities
+
+        self.state.position = final_state[0:3]
+        self.state.velocity = final_state[3:6]
+        if self.state.stm is not None:
+            self.state.stm = np.reshape(final_state[6:], (6, 6))
+
+        step_size = getattr(integrator, "step_size", None)
+        if units is not None and step_size is not None:
+            step_size = step_size * units.time
+
+        self.integration_statistics = {
+            "nfev": integrator.nfev,
+            "n_steps": getattr(integrator, "n_steps", None),
+            "n_rejected": getattr(integrator, "n_rejected", None),
+            "step_size": step_size,
+        }
+
+    def right_hand_side(self):
+        """
+        Returns the right hand side the agent is propagated with.
+
+        Returns
+        -------
+        callable
+            The compiled right hand side if ``jit`` is set and supported,
+            otherwise the flat or ``State`` based propagator, with the STM if
+            the state has one.
+        """
+        function = compiled_propagator(self) if self.jit else None
+
+        if function is None:
+            flat = all(dynamic.flat for dynamic in self.dynamics)
+
+            if self.state.stm is not None:
+                function = self.flat_propagator if flat else self.stm_propagator
+            else:
+                function = self.flat_propagator if flat else self.propagator
+
+        return function
+
+    def output_times(self):
+        """
+        Returns the integration span and output grid of the agent.
+
+        The output grid is ``epochs`` if set, the integration then ends at
+        the last epoch. Otherwise it runs from the start time in steps of
+        ``dt``, which may be a fraction of a second, up to the duration.
+
+        Returns
+        -------
+        list
+            The start and end time of the integration in seconds.
+        np.ndarray
+            The output times in seconds.
+        """
+        time = [0, self.duration.total_seconds()]
+
+        if self.epochs is not None:
+            t_eval = self.epochs
+            if t_eval.size == 0 or t_eval[0] < time[0] or t_eval[-1] > time[1]:
+                raise ValueError(
+                    f"The epochs of <{self.name}> must lie within its duration"
+                )
+            time[1] = t_eval[-1]
+        else:
+            # Exact count of whole steps, the last output may not pass the end
+            n_steps = self.duration // self.dt
+            t_eval = self.dt.total_seconds() * np.arange(n_steps + 1)
+            t_eval = np.minimum(t_eval, time[1])
+
+        return time, t_eval
+
+    def solve(
+        self,
+        function,
+        time,
+        initial_state,
+        t_eval,
+        tolerance=1e-12,
+        record_steps=False,
+        first_step=None,
+        events=(),
+        atol=None,
+        n_systems=1,
+    ):
+        """
+        Integrates a right hand side with the agent's integrator.
+
+        Parameters
+        ----------
+        function : callable
+            The right hand side ``function(time, state)`` to integrate.
+        time : list
+            The start and end time of the integration in seconds.
+        initial_state : array-like
+            The initial state vector.
+        t_eval : np.ndarray
+            The output times in seconds.
+        tolerance : float, optional
+            The tolerance for the numerical integration (default is 1e-12).
+        record_steps : bool, optional
+            Keep the time, state and derivative of every accepted step in
+            ``steps`` of the result (default is False).
+        first_step : float, optional
+            The initial step size of the adaptive integrators, selected
+            automatically if None.
+        events : tuple, optional
+            Event functions located during the integration (default is ()).
+        atol : float or np.ndarray, optional
+            The absolute tolerance, per component or for all, ``tolerance``
+            if None.
+        n_systems : int, optional
+            The number of independent systems stacked in the state vector,
+            each held to the tolerances on its own by the in-house adaptive
+            integrator (default is 1).
+
+        Returns
+        -------
+        IntegrationResult or OdeResult
+            The output times and states.
+
+        With ``canonical`` set the integration runs in the canonical units
+        of the central body and the result is converted back.
+        """
+        units = None
+        step_size = self.dt.total_seconds()
+        if self.canonical:
+            units = CanonicalUnits.of(self.scenario.central_body)
+            n = np.size(initial_state)
+            function, time, initial_state, t_eval = units.problem(
+                function, time, initial_state, t_eval
+            )
+            events = [units.event(event, n) for event in events]
+            step_size = step_size / units.time
+            if first_step is not None:
+                first_step = first_step / units.time
+
+        if self.integrator.lower() in INTEGRATORS:
+            integrator = build_integrator(
+                self.integrator,
+                function,
                 time,
-                self.state.compile(),
-                method=method,
-                rtol=rtol,
+                initial_state,
+                tolerance=tolerance,
+                first_step=first_step,
                 atol=atol,
+                step_size=step_size,
+                n_systems=n_systems,
+            )
+            ode_state = integrator.integrate(
+                t_eval, record_steps=record_steps, events=events
+            )
+            step_size = getattr(integrator, "step_size", None)
+        else:
+            ode_state = sci_int.solve_ivp(
+                function,
+                time,
+                initial_state,
+                method=self.integrator,
+                rtol=tolerance,
+                atol=tolerance if atol is None else atol,
                 t_eval=t_eval,
+                dense_output=record_steps,
+                first_step=first_step,
+                events=events or None,
             )
-            self.state.position = ode_state.y[0:3, -1]
-            self.state.velocity = ode_state.y[3:6, -1]
-            self.save_state_data(ode_state=ode_state)
+            step_size = None
+
+            if record_steps:
+                # solve_ivp does not return the derivatives at its steps
+                times = ode_state.sol.ts
+                states = ode_state.sol(times)
+                derivatives = np.column_stack(
+                    [function(t, y) for t, y in zip(times, states.T)]
+                )
+                ode_state.steps = (times, states, derivatives)
+
+        if units is not None:
+            units.restore(ode_state, n)
+            if step_size is not None:
+                step_size = step_size * units.time
+
+        self.integration_statistics = {
+            "nfev": ode_state.nfev,
+            "n_steps": getattr(ode_state, "n_steps", None),
+            "n_rejected": getattr(ode_state, "n_rejected", None),
+            "step_size": step_size,
+        }
+
+        return ode_state
 
     def update_state(self, new_state):
         """
@@ -319,17 +782,14 @@ class Agent:
         """
         Saves the state data from the ODE solver.
 
+        The output is kept as an ``Ephemeris`` of contiguous arrays, the
+        ``State`` of a sample is only built when it is indexed.
+
         Parameters
         ----------
         ode_state : OdeResult
             The result object from the ODE solver containing the state and time data.
         """
-        for state, time in zip(ode_state.y.transpose(), ode_state.t):
-            delta_time = timedelta(seconds=time)
-            self.state_data.append(
-                State(
-                    position=state[0:3],
-                    velocity=state[3:6],
-                    time=self.start_time + delta_time,
-                )
-            )
+        self.state_data = Ephemeris.from_output(
+            self.start_time, ode_state.t, ode_state.y
+        )
@@ -0,0 +1,347 @@
+"""
+ensemble.py
+
+This module contains the Ensemble class.
+
+Classes:
+- Ensemble: A class to propagate many agents in one integration.
+
+Functions:
+- propagate_ensembles: Propagates agents, batching the ones that share a setup.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+import copy
+
+import numpy as np
+
+from python_propagate.agents import Agent
+from python_propagate.propagators import IntegrationResult
+from python_propagate.propagators.integrators import INTEGRATORS
+
+
+def stack_parameter(values):
+    """Stacks per agent parameters into an array, None if any is missing."""
+    if any(value is None for value in values):
+        return None
+    return np.array(values, dtype=float)
+
+
+class Ensemble(Agent):
+    """
+    A class to propagate many agents in one integration.
+
+    The states of N agents are stacked into a single state vector and the
+    dynamics are evaluated as array operations across all agents, with the
+    drag parameters held as arrays. The integrator controls one step size
+    for the whole ensemble, with the error norm of the worst agent, so every
+    agent is held to the tolerance on its own.
+
+    Attributes
+    ----------
+    states : np.ndarray
+        The current states of the agents, shape (N, 6).
+    state_data : np.ndarray
+        The states of the agents on the output grid, shape (N, n_points, 6).
+    time_data : np.ndarray
+        The output times in seconds.
+    agents : list
+        The agents the ensemble was built from, updated after propagation.
+    """
+
+    def __init__(
+        self,
+        states,
+        start_time,
+        duration,
+        dt,
+        coefficent_of_drag=None,
+        mass=None,
+        area=None,
+        name="Ensemble",
+        integrator="dop853",
+        epochs=None,
+        jit=False,
+        formulation="cowell",
+        canonical=False,
+    ):
+        """
+        Constructs all the necessary attributes for the Ensemble object.
+
+        Parameters
+        ----------
+        states : array-like
+            The initial cartesian states of the agents, shape (N, 6).
+        start_time : datetime, str
+            The start time of the simulation.
+        duration : timedelta, dict
+            The duration of the simulation.
+        dt : timedelta, dict
+            The time step of the simulation.
+        coefficent_of_drag : array-like, optional
+            The coefficient of drag of each agent (default is None).
+        mass : array-like, optional
+            The mass of each agent (default is None).
+        area : array-like, optional
+            The area of each agent (default is None).
+        name : str, optional
+            The name of the ensemble (default is 'Ensemble').
+        integrator : str, optional
+            The integrator used to propagate the ensemble (default is 'dop853').
+        epochs : array-like, optional
+            The output epochs, see ``Agent`` (default is None).
+        jit : bool, optional
+            The setting of the agents, the ensemble is always integrated
+            with its array dynamics (default is False).
+        formulation : str, optional
+            The formulation of the equations of motion, only 'cowell' is
+            supported (default is 'cowell').
+        canonical : bool, optional
+            Integrate in canonical units, which is not supported for the
+            stacked state of an ensemble (default is False).
+        """
+        if coefficent_of_drag is not None:
+            coefficent_of_drag = np.asarray(coefficent_of_drag, dtype=float)
+        if mass is not None:
+            mass = np.asarray(mass, dtype=float)
+        if area is not None:
+            area = np.asarray(area, dtype=float)
+
+        super().__init__(
+            None,
+            start_time,
+            duration,
+            dt,
+            coefficent_of_drag=coefficent_of_drag,
+            mass=mass,
+            area=area,
+            name=name,
+            integrator=integrator,
+            epochs=epochs,
+            jit=jit,
+            formulation=formulation,
+            canonical=canonical,
+        )
+
+        self.states = np.array(states, dtype=float).reshape(-1, 6)
+        self.agents = []
+
+    def __len__(self):
+        """Returns the number of agents in the ensemble."""
+        return self.states.shape[0]
+
+    @classmethod
+    def from_agents(cls, agents):
+        """
+        Builds an ensemble from agents that share a setup.
+
+        The agents must have the same start time, duration, time step,
+        integrator, formulation, jit and canonical settings and dynamics, and
+        a scenario must already be set.
+
+        Parameters
+        ----------
+        agents : list
+            The agents to propagate together.
+
+        Returns
+        -------
+        Ensemble
+            The ensemble, linked back to the agents.
+        """
+        reference = agents[0]
+        for agent in agents[1:]:
+            if (
+                agent.start_time != reference.start_time
+                or agent.duration != reference.duration
+                or agent.dt != reference.dt
+                or not np.array_equal(
+                    agent.epochs if agent.epochs is not None else [],
+                    reference.epochs if reference.epochs is not None else [],
+                )
+                or agent.integrator.lower() != reference.integrator.lower()
+                or agent.formulation != reference.formulation
+                or agent.jit != reference.jit
+                or agent.canonical != reference.canonical
+                or [dynamic.terms for dynamic in agent.dynamics]
+                != [dynamic.terms for dynamic in reference.dynamics]
+            ):
+                raise ValueError(
+                    f"Agent <{agent.name}> does not share the setup of <{reference.name}>"
+                )
+
+        ensemble = cls(
+            [agent.state.compile()[:6] for agent in agents],
+            start_time=reference.start_time,
+            duration=reference.duration,
+            dt=reference.dt,
+            epochs=reference.epochs,
+            coefficent_of_drag=stack_parameter(
+                [agent.coefficent_of_drag for agent in agents]
+            ),
+            mass=stack_parameter([agent.mass for agent in agents]),
+            name=f"{reference.name} ensemble",
+            integrator=reference.integrator,
+            jit=reference.jit,
+            formulation=reference.formulation,
+            canonical=reference.canonical,
+        )
+        # Agent areas are already stored in km^2
+        ensemble._area = stack_parameter(
+            [getattr(agent, "_area", None) for agent in agents]
+        )
+
+        ensemble.set_scenario(reference.scenario)
+        ensemble.dynamics = [copy.copy(dynamic) for dynamic in reference.dynamics]
+        for dynamic in ensemble.dynamics:
+            dynamic.agent = ensemble
+        ensemble.agents = list(agents)
+
+        return ensemble
+
+    def set_scenario(self, scenario):
+        """Sets the scenario for the ensemble."""
+        self.scenario = scenario
+
+    def add_dynamics(self, dynamics: tuple):
+        """Adds dynamics to the ensemble, the STM is not supported."""
+        if "stm" in dynamics:
+            raise NotImplementedError("The STM is not supported for ensembles")
+
+        super().add_dynamics(dynamics)
+
+    def flat_propagator(self, time, state):
+        """
+        Propagates the ensemble state using the flat array dynamics contract.
+
+        Parameters
+        ----------
+        time : float
+            The current time in seconds.
+        state : np.ndarray
+            The stacked state vector, ordered as a (6, N) array.
+
+        Returns
+        -------
+        np.ndarray
+            The derivative of the stacked state vector.
+        """
+        state = state.reshape(6, -1)
+        state_dot = np.zeros_like(state)
+        state_dot[0:3] = state[3:6]
+
+        position = state[0:3]
+        velocity = state[3:6]
+        acceleration = state_dot[3:6]
+
+        for dynamic in self.dynamics:
+            dynamic.accel_into(position, velocity, time, acceleration)
+
+        return state_dot.ravel()
+
+    def propagate(self, tolerance=1e-12):
+        """
+        Propagates all agents of the ensemble in one integration.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            The tolerance for the numerical integration (default is 1e-12).
+        """
+        if self.formulation != "cowell":
+            raise NotImplementedError(
+                f"Formulation <{self.formulation}> is not supported for ensembles"
+            )
+        if self.canonical:
+            raise NotImplementedError("Canonical units are not supported for ensembles")
+        if not all(dynamic.flat for dynamic in self.dynamics):
+            raise NotImplementedError(
+                "Every dynamic of an ensemble must implement accel_into"
+            )
+        if self.integrator.lower() not in INTEGRATORS:
+            raise NotImplementedError(
+                f"Integrator <{self.integrator}> can not hold every agent of an "
+                "ensemble to the tolerance"
+            )
+
+        time, t_eval = self.output_times()
+
+        ode_state = self.solve(
+            self.flat_propagator,
+            time,
+            self.states.T.ravel(),
+            t_eval,
+            tolerance=tolerance,
+            n_systems=len(self),
+        )
+
+        n_agents = len(self)
+        self.time_data = ode_state.t
+        self.state_data = np.moveaxis(ode_state.y.reshape(6, n_agents, -1), 0, -1)
+        self.states = self.state_data[:, -1].copy()
+
+        for agent, state_data in zip(self.agents, self.state_data):
+            agent.state.position = state_data[-1, 0:3]
+            agent.state.velocity = state_data[-1, 3:6]
+            agent.integration_statistics = self.integration_statistics
+            agent.save_state_data(
+                ode_state=IntegrationResult(
+                    t=ode_state.t,
+                    y=state_data.T,
+                    nfev=ode_state.nfev,
+                    n_steps=self.integration_statistics["n_steps"],
+                )
+            )
+
+
+def propagate_ensembles(agents, tolerance=1e-12):
+    """
+    Propagates agents, batching the ones that share a setup.
+
+    Agents with the same start time, duration, time step, epochs, integrator,
+    formulation, jit and canonical settings and dynamics are propagated
+    together as an Ensemble. Agents propagating an STM, with a formulation
+    other than Cowell's, in canonical units, with a scipy integrator, using
+    dynamics without ``accel_into`` or with the two-body dynamics alone,
+    which are propagated analytically, are propagated on their own.
+
+    Parameters
+    ----------
+    agents : list
+        The agents to propagate.
+    tolerance : float, optional
+        The tolerance for the numerical integration (default is 1e-12).
+    """
+    groups = {}
+    for agent in agents:
+        if (
+            agent.state.stm is not None
+            or agent.formulation != "cowell"
+            or agent.canonical
+            or agent.two_body
+            or agent.integrator.lower() not in INTEGRATORS
+            or not all(dynamic.flat for dynamic in agent.dynamics)
+        ):
+            agent.propagate(tolerance=tolerance)
+            continue
+
+        key = (
+            agent.start_time,
+            agent.duration,
+            agent.dt,
+            None if agent.epochs is None else tuple(agent.epochs),
+            agent.integrator.lower(),
+            agent.formulation,
+            agent.jit,
+            agent.canonical,
+            tuple(dynamic.terms for dynamic in agent.dynamics),
+        )
+        groups.setdefault(key, []).append(agent)
+
+    for group in groups.values():
+        if len(group) == 1:
+            group[0].propagate(tolerance=tolerance)
+        else:
+            Ensemble.from_agents(group).propagate(tolerance=tolerance)
@@ -0,0 +1,356 @@
+"""
+ephemeris.py
+
+This module contains the Ephemeris class.
+
+Classes:
+- Ephemeris: A class to hold the trajectory of an agent in contiguous arrays.
+
+Functions:
+- quintic_hermite: Interpolates position and velocity from accelerations.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from python_propagate.agents.state import State
+
+
+def quintic_hermite(x, h, r0, v0, a0, r1, v1, a1):
+    """
+    Interpolates position and velocity from the accelerations at both ends.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The normalized times in [0, 1], shape (N,).
+    h : np.ndarray
+        The segment lengths in seconds, shape (N,).
+    r0, v0, a0 : np.ndarray
+        The position, velocity and acceleration at the segment starts, shape
+        (N, ...).
+    r1, v1, a1 : np.ndarray
+        The position, velocity and acceleration at the segment ends, shape
+        (N, ...).
+
+    Returns
+    -------
+    np.ndarray
+        The interpolated positions, shape (N, ...).
+    np.ndarray
+        The interpolated velocities, shape (N, ...).
+    """
+    shape = (-1,) + (1,) * (np.ndim(r0) - 1)
+    x = x.reshape(shape)
+    h = h.reshape(shape)
+    x2, x3, x4, x5 = x**2, x**3, x**4, x**5
+
+    position = (
+        (1 - 10 * x3 + 15 * x4 - 6 * x5) * r0
+        + (x - 6 * x3 + 8 * x4 - 3 * x5) * h * v0
+        + (x2 - 3 * x3 + 3 * x4 - x5) / 2 * h**2 * a0
+        + (x3 - 2 * x4 + x5) / 2 * h**2 * a1
+        + (-4 * x3 + 7 * x4 - 3 * x5) * h * v1
+        + (10 * x3 - 15 * x4 + 6 * x5) * r1
+    )
+
+    velocity = (
+        (-30 * x2 + 60 * x3 - 30 * x4) * (r0 - r1) / h
+        + (1 - 18 * x2 + 32 * x3 - 15 * x4) * v0
+        + (2 * x - 9 * x2 + 12 * x3 - 5 * x4) / 2 * h * a0
+        + (3 * x2 - 8 * x3 + 5 * x4) / 2 * h * a1
+        + (-12 * x2 + 28 * x3 - 15 * x4) * v1
+    )
+
+    return position, velocity
+
+
+class Ephemeris:
+    """
+    A class to hold the trajectory of an agent in contiguous arrays.
+
+    The samples are either the output grid of a propagation, kept in the
+    agent's ``state_data``, or the integrator's step boundaries, kept in its
+    ``ephemeris``. Indexing with an integer builds the ``State`` of one
+    sample on demand, slicing returns an ephemeris of views into the same
+    arrays, so nothing is copied.
+
+    The accelerations of the step boundaries may be stored as well. Each
+    pair of neighbouring samples is then a segment. Its position and
+    velocity are interpolated with a quintic Hermite polynomial through the
+    positions, velocities and accelerations at both ends. Sampling at any
+    time needs no further integration. The STM is interpolated the same way,
+    its velocity rows are the derivative of its position rows.
+
+    Attributes
+    ----------
+    epoch : datetime
+        The epoch the times are counted from.
+    times : np.ndarray
+        The sample times in seconds since the epoch, shape (N,).
+    position : np.ndarray
+        The positions, shape (N, 3).
+    velocity : np.ndarray
+        The velocities, shape (N, 3).
+    acceleration : np.ndarray or None
+        The accelerations, shape (N, 3).
+    stm : np.ndarray or None
+        The state transition matrices, shape (N, 6, 6).
+    stm_dot : np.ndarray or None
+        The time derivatives of the state transition matrices, shape (N, 6, 6).
+    """
+
+    def __init__(
+        self,
+        epoch,
+        times,
+        position,
+        velocity,
+        acceleration=None,
+        stm=None,
+        stm_dot=None,
+    ):
+        """
+        Constructs all the necessary attributes for the Ephemeris object.
+
+        Parameters
+        ----------
+        epoch : datetime
+            The epoch the times are counted from.
+        times : array-like
+            The sorted sample times in seconds since the epoch, shape (N,).
+        position : array-like
+            The positions, shape (N, 3).
+        velocity : array-like
+            The velocities, shape (N, 3).
+        acceleration : array-like, optional
+            The accelerations, shape (N, 3), needed by ``at`` (default is None).
+        stm : array-like, optional
+            The state transition matrices, shape (N, 6, 6) (default is None).
+        stm_dot : array-like, optional
+            The time derivatives of the state transition matrices, shape
+            (N, 6, 6) (default is None).
+        """
+        self.epoch = epoch
+        self.times = np.asarray(times, dtype=float)
+        self.position = np.asarray(position, dtype=float)
+        self.velocity = np.asarray(velocity, dtype=float)
+        self.acceleration = (
+            None if acceleration is None else np.asarray(acceleration, dtype=float)
+        )
+        self.stm = None if stm is None else np.asarray(stm, dtype=float)
+        self.stm_dot = None if stm_dot is None else np.asarray(stm_dot, dtype=float)
+
+    @classmethod
+    def from_steps(cls, epoch, times, states, derivatives):
+        """
+        Builds an ephemeris from the states at the integrator's steps.
+
+        Parameters
+        ----------
+        epoch : datetime
+            The epoch the times are counted from.
+        times : np.ndarray
+            The step times in seconds, shape (N,).
+        states : np.ndarray
+            The state vectors at the steps, shape (6, N) or (42, N) with the
+            STM appended row major.
+        derivatives : np.ndarray
+            The derivatives of the state vectors at the steps, same shape as
+            ``states``.
+
+        Returns
+        -------
+        Ephemeris
+            The ephemeris of the steps.
+        """
+        stm = stm_dot = None
+        if states.shape[0] == 42:
+            stm = states[6:].T.reshape(-1, 6, 6)
+            stm_dot = derivatives[6:].T.reshape(-1, 6, 6)
+
+        return cls(
+            epoch,
+            times,
+            states[0:3].T,
+            states[3:6].T,
+            derivatives[3:6].T,
+            stm=stm,
+            stm_dot=stm_dot,
+        )
+
+    @classmethod
+    def from_output(cls, epoch, times, states):
+        """
+        Builds an ephemeris from the output of an integration.
+
+        Parameters
+        ----------
+        epoch : datetime
+            The epoch the times are counted from.
+        times : np.ndarray
+            The output times in seconds, shape (N,).
+        states : np.ndarray
+            The state vectors at the output times, shape (6, N) or (42, N)
+            with the STM appended row major.
+
+        Returns
+        -------
+        Ephemeris
+            The ephemeris of the output.
+        """
+        stm = None
+        if states.shape[0] == 42:
+            stm = np.ascontiguousarray(states[6:].T).reshape(-1, 6, 6)
+
+        return cls(
+            epoch,
+            times,
+            np.ascontiguousarray(states[0:3].T),
+            np.ascontiguousarray(states[3:6].T),
+            stm=stm,
+        )
+
+    def __len__(self):
+        """Returns the number of samples of the ephemeris."""
+        return self.times.size
+
+    def __getitem__(self, index):
+        """
+        Returns one sample as a State or a slice as an Ephemeris.
+
+        Parameters
+        ----------
+        index : int or slice
+            The index of the sample or the slice of samples.
+
+        Returns
+        -------
+        State or Ephemeris
+            The state of the sample, or an ephemeris of views of the slice.
+        """
+        if isinstance(index, slice):
+            return Ephemeris(
+                self.epoch,
+                self.times[index],
+                self.position[index],
+                self.velocity[index],
+                acceleration=(
+                    None if self.acceleration is None else self.acceleration[index]
+                ),
+                stm=None if self.stm is None else self.stm[index],
+                stm_dot=None if self.stm_dot is None else self.stm_dot[index],
+            )
+
+        return State(
+            position=self.position[index],
+            velocity=self.velocity[index],
+            acceleration=(
+                None if self.acceleration is None else self.acceleration[index]
+            ),
+            stm=None if self.stm is None else self.stm[index],
+            stm_dot=None if self.stm_dot is None else self.stm_dot[index],
+            time=self.epoch + timedelta(seconds=float(self.times[index])),
+        )
+
+    def __iter__(self):
+        """Yields the State of every sample."""
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def datetimes(self):
+        """Returns the sample times as datetimes."""
+        return [self.epoch + timedelta(seconds=float(time)) for time in self.times]
+
+    def __repr__(self):
+        """
+        Returns a string representation of the Ephemeris object.
+
+        Returns
+        -------
+        str
+            A string representation of the Ephemeris object.
+        """
+        return (
+            f"Ephemeris(epoch={self.epoch}, n_samples={len(self)}, "
+            f"span=[{self.times[0]}, {self.times[-1]}])"
+        )
+
+    def segment(self, times):
+        """
+        Returns the segment index of times.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            The times in seconds since the epoch.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the segment starting sample of each time.
+        """
+        if np.any(times < self.times[0]) or np.any(times > self.times[-1]):
+            raise ValueError(
+                f"Times must be within the ephemeris span "
+                f"[{self.times[0]}, {self.times[-1]}]"
+            )
+
+        index = np.searchsorted(self.times, times, side="right") - 1
+        return np.clip(index, 0, self.times.size - 2)
+
+    def at(self, times):
+        """
+        Samples the ephemeris at arbitrary times.
+
+        Parameters
+        ----------
+        times : float or array-like
+            The times in seconds since the epoch.
+
+        Returns
+        -------
+        Ephemeris
+            The interpolated samples, with the STM if it was propagated.
+        """
+        if self.acceleration is None:
+            raise ValueError("Sampling an ephemeris requires stored accelerations")
+
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        start = self.segment(times)
+        end = start + 1
+
+        h = self.times[end] - self.times[start]
+        x = (times - self.times[start]) / h
+
+        position, velocity = quintic_hermite(
+            x,
+            h,
+            self.position[start],
+            self.velocity[start],
+            self.acceleration[start],
+            self.position[end],
+            self.velocity[end],
+            self.acceleration[end],
+        )
+
+        stm = None
+        if self.stm is not None:
+            stm_position, stm_velocity = quintic_hermite(
+                x,
+                h,
+                self.stm[start, 0:3],
+                self.stm[start, 3:6],
+                self.stm_dot[start, 3:6],
+                self.stm[end, 0:3],
+                self.stm[end, 3:6],
+                self.stm_dot[end, 3:6],
+            )
+            stm = np.concatenate((stm_position, stm_velocity), axis=1)
+
+        return Ephemeris(self.epoch, times, position, velocity, stm=stm)
@@ -0,0 +1,221 @@
+"""
+monte_carlo.py
+
+This module contains the MonteCarlo class.
+
+Classes:
+- MonteCarlo: A class to propagate dispersed copies of a nominal agent.
+
+Functions:
+- disperse: Draws samples of a scalar agent parameter.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from python_propagate.agents.ensemble import Ensemble
+
+MonteCarloResult = namedtuple(
+    "MonteCarloResult",
+    ["times", "states", "percentiles", "envelope", "position_deviation"],
+)
+
+
+def disperse(value, sigma, n_samples, rng):
+    """
+    Draws samples of a scalar agent parameter.
+
+    The first sample is always the nominal value. The parameters are
+    physically positive, so the normal distribution is truncated at zero
+    by drawing the non-positive samples again.
+
+    Parameters
+    ----------
+    value : float or None
+        The nominal value.
+    sigma : float or None
+        The standard deviation, no dispersion if None.
+    n_samples : int
+        The number of samples.
+    rng : np.random.Generator
+        The random number generator.
+
+    Returns
+    -------
+    np.ndarray or None
+        The samples, None if the nominal value is None.
+
+    Raises
+    ------
+    ValueError
+        If the nominal value is not positive.
+    """
+    if value is None:
+        return None
+
+    if value <= 0:
+        raise ValueError(f"The nominal value <{value}> must be positive")
+
+    samples = np.full(n_samples, float(value))
+    if sigma is not None:
+        samples[1:] += sigma * rng.standard_normal(n_samples - 1)
+
+        # At least half of the draws are positive around a positive value
+        rejected = np.flatnonzero(samples <= 0)
+        while rejected.size:
+            samples[rejected] = value + sigma * rng.standard_normal(rejected.size)
+            rejected = rejected[samples[rejected] <= 0]
+
+    return samples
+
+
+class MonteCarlo(Ensemble):
+    """
+    A class to propagate dispersed copies of a nominal agent.
+
+    The initial states are drawn from a normal distribution around the
+    nominal state and the drag parameters can be dispersed as well. All
+    samples are propagated in one vectorized Ensemble integration and the
+    output is kept as arrays, with no State object per sample per epoch.
+    Sample 0 is always the undispersed nominal agent.
+
+    Attributes
+    ----------
+    state : State or OrbitalElements
+        The nominal state of the agent.
+    covariance : np.ndarray
+        The covariance of the cartesian initial state, shape (6, 6).
+    n_samples : int
+        The number of samples, including the nominal.
+    """
+
+    def __init__(
+        self,
+        state,
+        covariance,
+        n_samples,
+        start_time,
+        duration,
+        dt,
+        coefficent_of_drag=None,
+        mass=None,
+        area=None,
+        coefficent_of_drag_sigma=None,
+        mass_sigma=None,
+        area_sigma=None,
+        seed=None,
+        name="MonteCarlo",
+        integrator="dop853",
+    ):
+        """
+        Constructs all the necessary attributes for the MonteCarlo object.
+
+        Parameters
+        ----------
+        state : State or OrbitalElements
+            The nominal state of the agent.
+        covariance : array-like
+            The covariance of the cartesian initial state in km and km/s,
+            shape (6, 6).
+        n_samples : int
+            The number of samples, including the nominal.
+        start_time : datetime, str
+            The start time of the simulation.
+        duration : timedelta, dict
+            The duration of the simulation.
+        dt : timedelta, dict
+            The time step of the simulation.
+        coefficent_of_drag : float, optional
+            The nominal coefficient of drag (default is None).
+        mass : float, optional
+            The nominal mass (default is None).
+        area : float, optional
+            The nominal area (default is None).
+        coefficent_of_drag_sigma : float, optional
+            The standard deviation of the coefficient of drag (default is None).
+        mass_sigma : float, optional
+            The standard deviation of the mass (default is None).
+        area_sigma : float, optional
+            The standard deviation of the area (default is None).
+        seed : int, optional
+            The seed of the random number generator (default is None).
+        name : str, optional
+            The name of the study (default is 'MonteCarlo').
+        integrator : str, optional
+            The integrator used to propagate the samples (default is 'dop853').
+        """
+        self._rng = np.random.default_rng(seed)
+
+        super().__init__(
+            np.zeros((n_samples, 6)),
+            start_time,
+            duration,
+            dt,
+            coefficent_of_drag=disperse(
+                coefficent_of_drag, coefficent_of_drag_sigma, n_samples, self._rng
+            ),
+            mass=disperse(mass, mass_sigma, n_samples, self._rng),
+            area=disperse(area, area_sigma, n_samples, self._rng),
+            name=name,
+            integrator=integrator,
+        )
+
+        self.state = state
+        self.covariance = np.asarray(covariance, dtype=float)
+        self.n_samples = n_samples
+
+    def set_scenario(self, scenario):
+        """
+        Sets the scenario and draws the initial states of the samples.
+
+        Parameters
+        ----------
+        scenario : Scenario
+            The scenario to be set for the study.
+        """
+        # Agent.set_scenario converts nominal orbital elements to cartesian
+        super(Ensemble, self).set_scenario(scenario)
+
+        nominal = self.state.compile()[:6]
+        self.states = self._rng.multivariate_normal(
+            nominal, self.covariance, size=self.n_samples
+        )
+        self.states[0] = nominal
+
+    def run(self, tolerance=1e-12, percentiles=(2.5, 50.0, 97.5)):
+        """
+        Propagates the samples and summarizes the dispersion.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            The tolerance for the numerical integration (default is 1e-12).
+        percentiles : tuple, optional
+            The percentiles of the envelopes (default is (2.5, 50.0, 97.5)).
+
+        Returns
+        -------
+        MonteCarloResult
+            The output times, the per sample states of shape
+            (n_samples, n_points, 6), the percentile envelope of each state
+            component of shape (n_percentiles, n_points, 6) and the
+            percentile envelope of the position deviation from the nominal
+            of shape (n_percentiles, n_points).
+        """
+        self.propagate(tolerance=tolerance)
+
+        deviation = np.linalg.norm(
+            self.state_data[:, :, 0:3] - self.state_data[0, :, 0:3], axis=-1
+        )
+
+        return MonteCarloResult(
+            times=self.time_data,
+            states=self.state_data,
+            percentiles=np.asarray(percentiles, dtype=float),
+            envelope=np.percentile(self.state_data, percentiles, axis=0),
+            position_deviation=np.percentile(deviation, percentiles, axis=0),
+        )
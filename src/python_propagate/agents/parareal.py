@@ -0,0 +1,271 @@
+"""
+parareal.py
+
+This module contains the parallel in time propagation of agents.
+
+The Parareal algorithm splits the propagation span into time slices. A cheap
+coarse propagator runs serially over the slices, the accurate dynamics of
+the agent run on all slices at once in a process pool, and the two are
+combined with the correction
+
+    U[n + 1] = G(U[n]) + F(U_old[n]) - G(U_old[n])
+
+until the states at the slice boundaries stop changing. After k iterations
+the first k slices match the serial propagation exactly, so it always
+converges within as many iterations as there are slices.
+
+Functions:
+- propagate_parareal: Propagates an agent with the Parareal algorithm.
+- fine_slice: Propagates one time slice with the accurate dynamics of an agent.
+- coarse_function: Returns the right hand side of the coarse propagator.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from python_propagate.dynamics.keplerian import keplerian_acceleration
+from python_propagate.dynamics.j2 import j2_acceleration
+from python_propagate.propagators import IntegrationResult
+from python_propagate.propagators.runge_kutta import RK4
+
+
+def fine_slice(agent, time, state, t_eval, tolerance=1e-12):
+    """
+    Propagates one time slice with the accurate dynamics of an agent.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent, a copy of it in the worker processes.
+    time : list
+        The start and end time of the slice in seconds.
+    state : np.ndarray
+        The state vector at the start of the slice.
+    t_eval : np.ndarray
+        The output times of the slice, ending at the end of the slice.
+    tolerance : float, optional
+        The tolerance for the numerical integration (default is 1e-12).
+
+    Returns
+    -------
+    np.ndarray
+        The states at the output times.
+    int
+        The number of right hand side evaluations.
+    """
+    ode_state = agent.solve(
+        agent.right_hand_side(), time, state, t_eval, tolerance=tolerance
+    )
+    return ode_state.y, ode_state.nfev
+
+
+def coarse_function(agent, coarse):
+    """
+    Returns the right hand side of the coarse propagator.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate.
+    coarse : str
+        'rk4' for the dynamics of the agent, 'j2' for two-body plus J2
+        motion, which can not propagate the STM.
+
+    Returns
+    -------
+    callable
+        The right hand side ``function(time, state)``.
+    """
+    if coarse == "rk4":
+        return agent.right_hand_side()
+
+    if coarse == "j2":
+        if agent.state.stm is not None:
+            raise NotImplementedError(
+                "The j2 coarse propagator does not propagate the STM"
+            )
+        central_body = agent.scenario.central_body
+
+        def function(time, state):
+            state_dot = np.empty(6)
+            state_dot[0:3] = state[3:6]
+            state_dot[3:6] = np.add(
+                keplerian_acceleration(*state[0:3], central_body.mu),
+                j2_acceleration(
+                    *state[0:3], central_body.mu, central_body.j2, central_body.radius
+                ),
+            )
+            return state_dot
+
+        return function
+
+    raise NotImplementedError(
+        f"Coarse propagator <{coarse}> is not an option or is spelled wrong"
+    )
+
+
+def propagate_parareal(
+    agent,
+    n_slices=None,
+    tolerance=1e-12,
+    coarse="rk4",
+    coarse_step=60.0,
+    convergence=1e-6,
+    max_iterations=None,
+    processes=None,
+):
+    """
+    Propagates an agent with the Parareal algorithm.
+
+    The slices start on the agent's output grid, the first one at the start
+    time of the agent. The states at the slice boundaries are iterated until
+    their largest change in position is below ``convergence``, the output
+    comes from the fine propagation of the last iteration. The number of iterations, slices and the right hand side
+    evaluations of all fine propagations are stored in
+    ``integration_statistics``, with ``converged`` False and a warning if
+    ``max_iterations`` ran out first. After as many iterations as slices
+    the states are those of the serial propagation, which counts as
+    converged.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate, with its scenario and dynamics set. It must
+        be picklable to reach the worker processes.
+    n_slices : int, optional
+        The number of time slices, the number of processes if None.
+    tolerance : float, optional
+        The tolerance of the fine propagation (default is 1e-12).
+    coarse : str, optional
+        The coarse propagator, 'rk4' for the agent's dynamics with the fixed
+        step RK4 integrator or 'j2' for two-body plus J2 motion with the
+        same integrator (default is 'rk4').
+    coarse_step : float, optional
+        The step size of the coarse propagator in seconds (default is 60.0).
+    convergence : float, optional
+        The largest change in km of the boundary positions between two
+        iterations to stop at (default is 1e-6).
+    max_iterations : int, optional
+        The maximum number of iterations, ``n_slices`` if None, which
+        reproduces the serial propagation.
+    processes : int, optional
+        The number of worker processes, the number of CPUs if None.
+    """
+    if agent.formulation != "cowell":
+        raise NotImplementedError(
+            f"Formulation <{agent.formulation}> is not supported for Parareal"
+        )
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if n_slices is None:
+        n_slices = processes
+    if max_iterations is None:
+        max_iterations = n_slices
+
+    time, t_eval = agent.output_times()
+
+    # Slice boundaries on the output grid, so every slice has output, the
+    # first slice starts with the agent's state at the start time
+    index = np.linspace(0, t_eval.size - 1, n_slices + 1).round().astype(int)
+    bounds = t_eval[np.unique(index)]
+    bounds[0] = time[0]
+    bounds[-1] = time[1]
+    n_slices = bounds.size - 1
+
+    slice_evals, n_outputs = [], []
+    for n in range(n_slices):
+        start, end = bounds[n], bounds[n + 1]
+        last = n == n_slices - 1
+
+        in_slice = (t_eval >= start) & ((t_eval < end) | last)
+        slice_eval = t_eval[in_slice]
+        n_outputs.append(slice_eval.size)
+        if slice_eval[-1] != end:
+            slice_eval = np.append(slice_eval, end)
+        slice_evals.append(slice_eval)
+
+    function = coarse_function(agent, coarse)
+
+    def propagate_coarse(start, end, state):
+        integrator = RK4(function, start, state, end, step_size=coarse_step)
+        return integrator.integrate([end]).y[:, -1]
+
+    states = np.empty((n_slices + 1, agent.state.compile().size))
+    states[0] = agent.state.compile()
+    coarse_states = np.empty_like(states)
+    for n in range(n_slices):
+        coarse_states[n + 1] = propagate_coarse(bounds[n], bounds[n + 1], states[n])
+        states[n + 1] = coarse_states[n + 1]
+
+    outputs = [None] * n_slices
+    nfev = 0
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for iteration in range(1, max_iterations + 1):
+            # The slices before the iteration number are already exact
+            first = iteration - 1
+            results = executor.map(
+                fine_slice,
+                [agent] * (n_slices - first),
+                [[bounds[n], bounds[n + 1]] for n in range(first, n_slices)],
+                states[first:n_slices],
+                slice_evals[first:],
+                [tolerance] * (n_slices - first),
+            )
+            for n, (y, slice_nfev) in enumerate(results, start=first):
+                outputs[n] = y
+                nfev += slice_nfev
+
+            previous = states.copy()
+            for n in range(first, n_slices):
+                coarse_state = propagate_coarse(bounds[n], bounds[n + 1], states[n])
+                states[n + 1] = coarse_state + outputs[n][:, -1] - coarse_states[n + 1]
+                coarse_states[n + 1] = coarse_state
+
+            if not np.all(np.isfinite(states)):
+                raise RuntimeError(
+                    "The coarse propagator diverged, reduce the coarse step"
+                )
+
+            change = np.max(np.linalg.norm(states[:, 0:3] - previous[:, 0:3], axis=1))
+            converged = change < convergence or iteration >= n_slices
+            if converged:
+                break
+
+    if not converged:
+        warnings.warn(
+            f"Parareal did not converge in <{iteration}> iterations, the boundary "
+            f"positions still changed by <{change:.3e}> km"
+        )
+
+    y = np.concatenate(
+        [output[:, :n_output] for output, n_output in zip(outputs, n_outputs)],
+        axis=1,
+    )
+    ode_state = IntegrationResult(t=t_eval, y=y, nfev=nfev, n_steps=None)
+
+    final_state = outputs[-1][:, -1]
+    agent.state.position = final_state[0:3]
+    agent.state.velocity = final_state[3:6]
+
+    if agent.state.stm is not None:
+        agent.state.stm = np.reshape(final_state[6:], (6, 6))
+    else:
+        agent.save_state_data(ode_state=ode_state)
+
+    agent.integration_statistics = {
+        "nfev": nfev,
+        "n_steps": None,
+        "n_rejected": None,
+        "step_size": None,
+        "n_iterations": iteration,
+        "n_slices": n_slices,
+        "converged": converged,
+    }
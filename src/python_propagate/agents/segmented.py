@@ -0,0 +1,303 @@
+"""
+segmented.py
+
+This module contains the checkpointed segmented propagation of agents.
+
+The propagation span is split into segments. Every finished segment is
+written to its own file holding the output of the segment and a checkpoint
+of the state, STM and integrator step size at its end, so a run that dies
+can resume from the last finished segment and memory stays bounded to one
+segment. Each file also holds a fingerprint of the setup of the run, and a
+run only resumes from files with its own fingerprint.
+
+Functions:
+- propagate_segmented: Propagates an agent segment by segment with checkpoints.
+- fingerprint: Returns a hash of the setup of a segmented run.
+- load_segments: Loads the output of the finished segments of a run.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+import os
+import hashlib
+from datetime import timedelta
+
+import numpy as np
+
+from python_propagate.agents.ephemeris import Ephemeris
+from python_propagate.propagators import IntegrationResult
+from python_propagate.propagators.integrators import error_tolerances
+
+SEGMENT_FILE = "segment_{:05d}.npz"
+
+
+def segment_path(directory, index):
+    """Returns the path of the file of a segment."""
+    return os.path.join(directory, SEGMENT_FILE.format(index))
+
+
+def finished_segments(directory):
+    """Returns the number of consecutive finished segments in a directory."""
+    index = 0
+    while os.path.exists(segment_path(directory, index)):
+        index += 1
+    return index
+
+
+def fingerprint(agent, segment, tolerance, atol=None, control_stm=True):
+    """
+    Returns a hash of the setup of a segmented run.
+
+    The hash covers the initial state, start time, output grid, integrator,
+    compilation, canonical units, dynamic terms, drag parameters, central
+    body and its atmosphere, segment length and error tolerances of the run.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate, at its initial state.
+    segment : float
+        The length of a segment in seconds.
+    tolerance : float
+        The tolerance for the numerical integration.
+    atol : float or array-like, optional
+        The absolute tolerance, see ``error_tolerances``
+        (default is None).
+    control_stm : bool, optional
+        Include the STM in the error control (default is True).
+
+    Returns
+    -------
+    str
+        The hexadecimal digest.
+    """
+    time, t_eval = agent.output_times()
+    rtol, atol = error_tolerances(
+        tolerance, atol, control_stm, agent.state.stm is not None
+    )
+    central_body = agent.scenario.central_body
+
+    digest = hashlib.sha256()
+    for array in (
+        agent.state.compile(),
+        np.array(time),
+        t_eval,
+        np.array([segment, rtol]),
+        np.atleast_1d(atol),
+        getattr(central_body, "atmosphere_table", np.empty(0)),
+    ):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    digest.update(
+        repr(
+            (
+                agent.start_time.isoformat(),
+                agent.integrator.lower(),
+                agent.jit,
+                agent.canonical,
+                [dynamic.terms for dynamic in agent.dynamics],
+                agent.coefficent_of_drag,
+                agent.mass,
+                getattr(agent, "area", None),
+                repr(central_body),
+                getattr(central_body, "atmosphere", None),
+            )
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+def write_segment(directory, index, **arrays):
+    """Writes the file of a segment, replacing it in one step."""
+    path = segment_path(directory, index)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(temporary, path)
+
+
+def propagate_segmented(
+    agent,
+    segment,
+    directory,
+    tolerance=1e-12,
+    ephemeris=False,
+    keep=True,
+    atol=None,
+    control_stm=True,
+):
+    """
+    Propagates an agent segment by segment with checkpoints.
+
+    Each segment starts a new integration from the checkpoint of the
+    previous one with the step size the integrator had reached, so a run
+    resumed from the files in ``directory`` gives results identical to an
+    uninterrupted one. Calling it again on a directory with finished
+    segments resumes after the last one, a ValueError is raised if they
+    were written with a different setup.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate, with its scenario and dynamics set.
+    segment : timedelta, dict
+        The length of a segment, preferably a multiple of the agent's time step.
+    directory : str
+        The directory the segment files are written to.
+    tolerance : float, optional
+        The tolerance for the numerical integration (default is 1e-12).
+    ephemeris : bool, optional
+        Also write the integrator's steps and build ``agent.ephemeris``
+        (default is False).
+    keep : bool, optional
+        Load the output of all segments into the agent at the end, set to
+        False to only leave it on disk (default is True).
+    atol : float or array-like, optional
+        The absolute tolerance of each component of the state vector,
+        ``tolerance`` if None (default is None), see ``error_tolerances``.
+    control_stm : bool, optional
+        Include the STM in the error control of the adaptive integrators
+        (default is True).
+    """
+    if agent.formulation != "cowell":
+        raise NotImplementedError(
+            f"Formulation <{agent.formulation}> is not supported for segmented "
+            "propagation"
+        )
+
+    if isinstance(segment, dict):
+        segment = timedelta(**segment)
+
+    os.makedirs(directory, exist_ok=True)
+
+    time, t_eval = agent.output_times()
+    length = segment.total_seconds()
+    bounds = np.append(np.arange(time[0], time[1], length), time[1])
+    n_segments = bounds.size - 1
+
+    setup = fingerprint(agent, length, tolerance, atol, control_stm)
+    rtol, atol = error_tolerances(
+        tolerance, atol, control_stm, agent.state.stm is not None
+    )
+
+    index = finished_segments(directory)
+    for finished in range(index):
+        with np.load(segment_path(directory, finished)) as checkpoint:
+            if str(checkpoint["fingerprint"]) != setup:
+                raise ValueError(
+                    f"Checkpoints in <{directory}> were written with a different setup"
+                )
+
+    if index > 0:
+        with np.load(segment_path(directory, index - 1)) as checkpoint:
+            state = checkpoint["state"]
+            step_size = checkpoint["step_size"][()]
+        step_size = None if np.isnan(step_size) else float(step_size)
+    else:
+        state = agent.state.compile()
+        step_size = None
+
+    function = agent.right_hand_side()
+
+    for index in range(index, n_segments):
+        start, end = bounds[index], bounds[index + 1]
+        last = index == n_segments - 1
+
+        in_segment = (t_eval >= start) & ((t_eval < end) | last)
+        n_output = np.count_nonzero(in_segment)
+        segment_eval = t_eval[in_segment]
+        if n_output == 0 or segment_eval[-1] != end:
+            segment_eval = np.append(segment_eval, end)
+
+        ode_state = agent.solve(
+            function,
+            [start, end],
+            state,
+            segment_eval,
+            tolerance=rtol,
+            record_steps=ephemeris,
+            first_step=step_size,
+            atol=atol,
+        )
+
+        state = ode_state.y[:, -1].copy()
+        step_size = agent.integration_statistics["step_size"]
+
+        arrays = {
+            "fingerprint": setup,
+            "state": state,
+            "step_size": np.nan if step_size is None else step_size,
+            "t": ode_state.t[:n_output],
+            "y": ode_state.y[:, :n_output],
+        }
+        if ephemeris:
+            step_times, step_states, step_derivatives = ode_state.steps
+            arrays.update(
+                step_times=step_times,
+                step_states=step_states,
+                step_derivatives=step_derivatives,
+            )
+        write_segment(directory, index, **arrays)
+
+    agent.state.position = state[0:3]
+    agent.state.velocity = state[3:6]
+
+    if agent.state.stm is not None:
+        agent.state.stm = np.reshape(state[6:], (6, 6))
+
+    if keep:
+        ode_state, steps = load_segments(directory, steps=ephemeris)
+        if agent.state.stm is None:
+            agent.save_state_data(ode_state=ode_state)
+        if ephemeris:
+            agent.ephemeris = Ephemeris.from_steps(agent.start_time, *steps)
+
+
+def load_segments(directory, steps=False):
+    """
+    Loads the output of the finished segments of a run.
+
+    Parameters
+    ----------
+    directory : str
+        The directory the segment files were written to.
+    steps : bool, optional
+        Also load the integrator's steps (default is False).
+
+    Returns
+    -------
+    IntegrationResult
+        The output times and states of all finished segments.
+    tuple or None
+        The times, states and derivatives of the integrator's steps, None
+        if not requested.
+    """
+    times, states = [], []
+    step_times, step_states, step_derivatives = [], [], []
+
+    for index in range(finished_segments(directory)):
+        with np.load(segment_path(directory, index)) as data:
+            times.append(data["t"])
+            states.append(data["y"])
+            if steps:
+                # The first step of a segment repeats the last of the previous
+                first = 0 if index == 0 else 1
+                step_times.append(data["step_times"][first:])
+                step_states.append(data["step_states"][:, first:])
+                step_derivatives.append(data["step_derivatives"][:, first:])
+
+    ode_state = IntegrationResult(
+        t=np.concatenate(times),
+        y=np.concatenate(states, axis=1),
+        nfev=None,
+        n_steps=None,
+    )
+
+    if not steps:
+        return ode_state, None
+
+    return ode_state, (
+        np.concatenate(step_times),
+        np.concatenate(step_states, axis=1),
+        np.concatenate(step_derivatives, axis=1),
+    )
@@ -52,6 +52,11 @@ class Spacecraft(Agent):
         mass=None,
         area=None,
         name=None,
+        integrator="RK45",
+        jit=False,
+        formulation="cowell",
+        canonical=False,
+        epochs=None,
     ):
         """
         Constructs all the necessary attributes for the Spacecraft object.
@@ -72,6 +77,18 @@ class Spacecraft(Agent):
             The mass of the spacecraft (default is None).
         area : float, optional
             The cross-sectional area of the spacecraft (default is None).
+        name : str, optional
+            The name of the spacecraft (default is None).
+        integrator : str, optional
+            The integrator used to propagate the spacecraft (default is 'RK45').
+        jit : bool, optional
+            Propagate with the compiled numba dynamics (default is False).
+        formulation : str, optional
+            The formulation of the equations of motion (default is 'cowell').
+        canonical : bool, optional
+            Integrate in the canonical units of the central body (default is False).
+        epochs : array-like or str, optional
+            The output epochs or the path of a file listing them (default is None).
         """
 
         super().__init__(
@@ -83,6 +100,11 @@ class Spacecraft(Agent):
             mass,
             area=area,
             name=name,
+            integrator=integrator,
+            jit=jit,
+            formulation=formulation,
+            canonical=canonical,
+            epochs=epochs,
         )
 
     def __repr__(self):
@@ -96,5 +118,7 @@ class Spacecraft(Agent):
         """
         return (
             f"Spacecraft(state={self.state}, start_time={self.start_time}, duration={self.duration}, "
-            f"dt={self.dt}, coefficent_of_drag={self.coefficent_of_drag}, mass={self.mass}, area={self.area}, name={self.name})"
+            f"dt={self.dt}, coefficent_of_drag={self.coefficent_of_drag}, mass={self.mass}, area={self.area}, name={self.name}, "
+            f"integrator={self.integrator}, jit={self.jit}, formulation={self.formulation}, "
+            f"canonical={self.canonical})"
         )
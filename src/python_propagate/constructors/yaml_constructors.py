@@ -75,7 +75,11 @@ def scenario_constructor(loader, node):
 
     if values["central_body"].lower() == "earth":
 
-        central_body = Earth(flattening_bool=values.pop("flattening"))
+        central_body = Earth(
+            flattening_bool=values.pop("flattening"),
+            atmosphere_table=values.pop("atmosphere_table", None),
+            atmosphere=values.pop("atmosphere", "exponential"),
+        )
         values["central_body"] = central_body
     else:
         raise ValueError(f'central_body <{values["central_body"]}> not support')
@@ -103,7 +107,11 @@ def data_generator_constructor(loader, node):
 
     if values["central_body"].lower() == "earth":
 
-        central_body = Earth(flattening_bool=values.pop("flattening"))
+        central_body = Earth(
+            flattening_bool=values.pop("flattening"),
+            atmosphere_table=values.pop("atmosphere_table", None),
+            atmosphere=values.pop("atmosphere", "exponential"),
+        )
         values["central_body"] = central_body
     else:
         raise ValueError(f'central_body <{values["central_body"]}> not support')
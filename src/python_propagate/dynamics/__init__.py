@@ -32,6 +32,11 @@ class Dynamic:
         The state transition matrix of the dynamic.
     function : function
         The function of the dynamic.
+
+    Dynamics can also implement ``accel_into``, which works on raw position
+    and velocity arrays and adds the acceleration into a caller provided
+    buffer. The agent uses it instead of ``function`` when every dynamic
+    supports it.
     """
 
     def __init__(self, scenario: Scenario, agent=None, stm=None):
@@ -69,3 +74,32 @@ class Dynamic:
         """
 
         return self.function(state, time)
+
+    def accel_into(self, position, velocity, time, out):
+        """
+        Adds the acceleration of the dynamic into a buffer.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The position vector.
+        velocity : np.ndarray
+            The velocity vector.
+        time : float
+            The time of the dynamic.
+        out : np.ndarray
+            The acceleration buffer, updated in place.
+        """
+        raise NotImplementedError(
+            f"Dynamic <{type(self).__name__}> does not implement accel_into"
+        )
+
+    @property
+    def terms(self):
+        """Returns the standalone dynamics evaluated, only fused ones have several."""
+        return (type(self),)
+
+    @property
+    def flat(self):
+        """Returns True if the dynamic implements ``accel_into``."""
+        return type(self).accel_into is not Dynamic.accel_into
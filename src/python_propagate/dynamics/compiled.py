@@ -0,0 +1,277 @@
+"""
+compiled.py
+
+This module contains the optional numba backend of the force models.
+
+The scalar kernels of the Keplerian, J2, J3 and drag accelerations, the STM
+state matrix and the exponential atmosphere lookup are compiled into one
+native right hand side. numba is an optional dependency, agents fall back to
+the Python dynamics when it is not installed.
+
+Functions:
+- jit: Compiles a function with numba when it is available.
+- atmosphere_lookup: Looks up the exponential atmosphere layer of a radius.
+- state_derivative: The compiled right hand side of the supported dynamics.
+- compiled_propagator: Returns a compiled right hand side for an agent.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import warnings
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+from python_propagate.dynamics.keplerian import Keplerian, keplerian_acceleration
+from python_propagate.dynamics.j2 import J2, j2_acceleration
+from python_propagate.dynamics.j3 import J3, j3_acceleration
+from python_propagate.dynamics.drag import Drag, drag_acceleration
+from python_propagate.dynamics.stm import STM, state_matrix
+
+NUMBA_AVAILABLE = numba is not None
+
+# Codes of the dynamics in the compiled right hand side
+KEPLERIAN = 0
+ZONAL_J2 = 1
+ZONAL_J3 = 2
+DRAG = 3
+STATE_TRANSITION = 4
+
+TERMS = {
+    Keplerian: KEPLERIAN,
+    J2: ZONAL_J2,
+    J3: ZONAL_J3,
+    Drag: DRAG,
+    STM: STATE_TRANSITION,
+}
+
+
+def jit(function):
+    """Compiles a function with numba, returns it unchanged without numba."""
+    if numba is None:
+        return function
+    return numba.njit(cache=True)(function)
+
+
+compiled_keplerian = jit(keplerian_acceleration)
+compiled_j2 = jit(j2_acceleration)
+compiled_j3 = jit(j3_acceleration)
+compiled_drag = jit(drag_acceleration)
+compiled_state_matrix = jit(state_matrix)
+
+
+@jit
+def atmosphere_lookup(radius, radius_body, table):
+    """
+    Looks up the exponential atmosphere layer of a radius.
+
+    Parameters
+    ----------
+    radius : float
+        The radius of the spacecraft.
+    radius_body : float
+        The radius of the central body.
+    table : np.ndarray
+        The atmosphere table, rows of base altitude, nominal density and
+        scale height sorted by base altitude.
+
+    Returns
+    -------
+    tuple
+        The nominal density, base altitude and scale height of the layer.
+    """
+    index = np.searchsorted(table[:, 0], radius - radius_body) - 1
+    if index < 0:
+        index = 0
+    return table[index, 1], table[index, 0], table[index, 2]
+
+
+@jit
+def state_derivative(
+    state,
+    out,
+    terms,
+    mu,
+    radius_body,
+    j2,
+    j3,
+    angular_velocity,
+    coefficent_of_drag,
+    area,
+    mass,
+    table,
+):
+    """
+    The compiled right hand side of the supported dynamics.
+
+    The accelerations are added in the order of ``terms`` so the result
+    matches the Python dynamics. A state of 42 entries also propagates the
+    STM.
+
+    Parameters
+    ----------
+    state : np.ndarray
+        The state vector, with the STM appended row major if present.
+    out : np.ndarray
+        The derivative of the state vector, overwritten.
+    terms : np.ndarray
+        The codes of the dynamics in the order they were added.
+    mu, radius_body, j2, j3, angular_velocity : float
+        The parameters of the central body.
+    coefficent_of_drag, area, mass : float
+        The drag parameters of the agent.
+    table : np.ndarray
+        The atmosphere table of the central body.
+    """
+    rx, ry, rz = state[0], state[1], state[2]
+    vx, vy, vz = state[3], state[4], state[5]
+
+    out[:] = 0.0
+    out[0] = vx
+    out[1] = vy
+    out[2] = vz
+
+    propagate_stm = False
+    for term in terms:
+        if term == KEPLERIAN:
+            ax, ay, az = compiled_keplerian(rx, ry, rz, mu)
+        elif term == ZONAL_J2:
+            ax, ay, az = compiled_j2(rx, ry, rz, mu, j2, radius_body)
+        elif term == ZONAL_J3:
+            ax, ay, az = compiled_j3(rx, ry, rz, mu, j3, radius_body)
+        elif term == DRAG:
+            rho0, h0, scale_height = atmosphere_lookup(
+                np.sqrt(rx**2 + ry**2 + rz**2), radius_body, table
+            )
+            ax, ay, az = compiled_drag(
+                rx,
+                ry,
+                rz,
+                vx,
+                vy,
+                vz,
+                rho0,
+                h0,
+                scale_height,
+                radius_body,
+                angular_velocity,
+                coefficent_of_drag,
+                area,
+                mass,
+            )
+        else:
+            propagate_stm = True
+            continue
+
+        out[3] += ax
+        out[4] += ay
+        out[5] += az
+
+    if propagate_stm and state.size == 42:
+        rho0, h0, scale_height = atmosphere_lookup(
+            np.sqrt(rx**2 + ry**2 + rz**2), radius_body, table
+        )
+        a_matrix = compiled_state_matrix(
+            rx,
+            ry,
+            rz,
+            vx,
+            vy,
+            vz,
+            radius_body,
+            mu,
+            j2,
+            j3,
+            rho0,
+            h0,
+            scale_height,
+            coefficent_of_drag,
+            area,
+            mass,
+            angular_velocity,
+        )
+        out[6:] = np.dot(a_matrix, state[6:].reshape(6, 6)).ravel()
+
+
+def compiled_propagator(agent):
+    """
+    Returns a compiled right hand side for an agent.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate.
+
+    Returns
+    -------
+    callable or None
+        The right hand side ``function(time, state)``, None with a warning
+        when numba is not installed or the agent uses a dynamic, central
+        body or parameter the compiled backend does not support.
+    """
+    if not NUMBA_AVAILABLE:
+        warnings.warn("numba is not installed, using the Python dynamics")
+        return None
+
+    # Fused dynamics are compiled as the standalone dynamics they evaluate
+    types = [term for dynamic in agent.dynamics for term in dynamic.terms]
+
+    unsupported = [term.__name__ for term in types if term not in TERMS]
+    if unsupported:
+        warnings.warn(
+            f"Dynamics <{', '.join(unsupported)}> are not compiled, "
+            "using the Python dynamics"
+        )
+        return None
+
+    terms = np.array([TERMS[term] for term in types])
+    central_body = agent.scenario.central_body
+
+    needs_drag = DRAG in terms or STATE_TRANSITION in terms
+    drag_parameters = (
+        agent.coefficent_of_drag,
+        getattr(agent, "_area", None),
+        agent.mass,
+    )
+    table = getattr(central_body, "atmosphere_table", None)
+    # Only the layers of the table are compiled
+    if getattr(central_body, "atmosphere", "exponential") != "exponential":
+        table = None
+
+    if needs_drag and (
+        table is None
+        or any(
+            parameter is None or np.ndim(parameter) != 0
+            for parameter in drag_parameters
+        )
+    ):
+        warnings.warn(
+            f"Drag of agent <{agent.name}> is not compiled, using the Python dynamics"
+        )
+        return None
+
+    if not needs_drag:
+        drag_parameters = (0.0, 0.0, 1.0)
+        table = np.zeros((1, 3))
+
+    parameters = (
+        float(central_body.mu),
+        float(central_body.radius),
+        float(central_body.j2),
+        float(central_body.j3),
+        float(central_body.angular_velocity),
+    ) + tuple(float(parameter) for parameter in drag_parameters)
+    table = np.ascontiguousarray(table, dtype=float)
+
+    def propagator(time, state):
+        state_dot = np.empty(state.size)
+        state_derivative(state, state_dot, terms, *parameters, table)
+        return state_dot
+
+    return propagator
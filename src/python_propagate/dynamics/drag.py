@@ -10,31 +10,73 @@ class Drag(Dynamic):
 
     def function(self, state: State, time: float):
 
-        rx, ry, rz = state.extract_position()
-        vx, vy, vz = state.extract_velocity()
+        acceleration = np.zeros(3)
+        self.accel_into(state.position, state.velocity, time, acceleration)
+
+        return State(acceleration=acceleration)
+
+    def accel_into(self, position, velocity, time, out):
+
+        rx, ry, rz = position[0], position[1], position[2]
 
         r = np.sqrt(rx**2 + ry**2 + rz**2)
-        alt = r - self.scenario.central_body.radius
 
+        # Scalars or arrays of radii alike
         rho0, h0, scale_height = self.scenario.central_body.atmosphere_model(r)
 
-        density = rho0 * np.exp(-(alt - h0) / scale_height) * 1000**3
+        ax, ay, az = drag_acceleration(
+            rx,
+            ry,
+            rz,
+            velocity[0],
+            velocity[1],
+            velocity[2],
+            rho0,
+            h0,
+            scale_height,
+            self.scenario.central_body.radius,
+            self.scenario.central_body.angular_velocity,
+            self.agent.coefficent_of_drag,
+            self.agent.area,
+            self.agent.mass,
+        )
+
+        out[0] += ax
+        out[1] += ay
+        out[2] += az
 
-        vax = vx + self.scenario.central_body.angular_velocity * ry
-        vay = vy - self.scenario.central_body.angular_velocity * rx
 
-        va = np.sqrt(vax**2 + vay**2 + vz**2)
+def drag_acceleration(
+    rx,
+    ry,
+    rz,
+    vx,
+    vy,
+    vz,
+    rho0,
+    h0,
+    scale_height,
+    radius,
+    angular_velocity,
+    coefficent_of_drag,
+    area,
+    mass,
+):
+    """Returns the exponential atmosphere drag acceleration components."""
+    r = np.sqrt(rx**2 + ry**2 + rz**2)
+    alt = r - radius
 
-        dynamic_pressure = (
-            -0.5
-            * self.agent.coefficent_of_drag
-            * density
-            * self.agent.area
-            / self.agent.mass
-        )
+    density = rho0 * np.exp(-(alt - h0) / scale_height) * 1000**3
+
+    vax = vx + angular_velocity * ry
+    vay = vy - angular_velocity * rx
+
+    va = np.sqrt(vax**2 + vay**2 + vz**2)
 
-        ax = dynamic_pressure * vax * va
-        ay = dynamic_pressure * vay * va
-        az = dynamic_pressure * vz * va
+    dynamic_pressure = -0.5 * coefficent_of_drag * density * area / mass
 
-        return State(acceleration=np.array([ax, ay, az]))
+    return (
+        dynamic_pressure * vax * va,
+        dynamic_pressure * vay * va,
+        dynamic_pressure * vz * va,
+    )
@@ -0,0 +1,401 @@
+"""
+gravity_grid.py
+
+This module contains the precomputed acceleration grid of a gravity field.
+
+The acceleration of a ``SphericalHarmonicGravity`` field without its point
+mass and J2 terms is sampled once on spherical shells over an altitude band in the
+body-fixed frame and interpolated with local cubic polynomials. The samples
+can be cached to disk as a memory-mapped file, so scenarios in the same
+altitude band skip the harmonic sum entirely.
+
+Classes:
+- GravityGrid: A class to represent the acceleration grid of a gravity field.
+
+Functions:
+- ring_accelerations: Returns the accelerations of a field on a ring of longitudes.
+- lagrange_weights: Returns the weights of the cubic Lagrange interpolation.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+import os
+import math
+import hashlib
+import tempfile
+
+import numpy as np
+
+from python_propagate.dynamics.zonal import zonal_acceleration
+
+GRID_FILE = "gravity_grid_{}.npy"
+
+
+class GravityGrid:
+    """
+    A class to represent the acceleration grid of a gravity field.
+
+    The nodes are evenly spaced in radius, colatitude, poles included, and
+    longitude. A position is interpolated from the 4 x 4 x 4 nodes around
+    it with cubic Lagrange polynomials, wrapping in longitude and shifting
+    the stencil inwards at the poles and the edges of the band. The point
+    mass and J2 terms, which are orders of magnitude above the rest of the
+    field, are left out of the samples and added back analytically.
+
+    The grid is checked against the direct evaluation of the field at
+    random positions in the band when it is built or loaded, and a
+    ValueError is raised if the error is above the bound.
+
+    Attributes
+    ----------
+    field : SphericalHarmonicGravity
+        The gravity field of the grid.
+    radii : np.ndarray
+        The radii of the shells.
+    shape : tuple
+        The number of radius, colatitude and longitude nodes.
+    error : float
+        The largest acceleration error of the check.
+    data : np.ndarray
+        The (radius, colatitude, longitude, 3) accelerations without the
+        point mass and J2 terms, a memory map if cached.
+    path : str
+        The path of the cache file, None if not cached.
+    """
+
+    def __init__(
+        self,
+        field,
+        altitudes,
+        resolution=8,
+        tolerance=1e-10,
+        cache_dir=None,
+        n_check=100,
+    ):
+        """
+        Constructs all the necessary attributes for the GravityGrid object.
+
+        Parameters
+        ----------
+        field : SphericalHarmonicGravity
+            The gravity field of the grid.
+        altitudes : tuple
+            The lowest and highest altitude of the band, in km above the
+            reference radius of the field.
+        resolution : float, optional
+            The nodes per wavelength of the highest degree (default is 8).
+        tolerance : float, optional
+            The bound on the acceleration error in km/s**2 (default is 1e-10).
+        cache_dir : str, optional
+            The directory of the cache file, the grid is kept in memory if None.
+        n_check : int, optional
+            The number of random positions of the check (default is 100).
+        """
+        self.field = field
+
+        # The unnormalized C20 is -J2
+        n, m = field.indices
+        self.j2 = -field.coefficients[(n == 2) & (m == 0)].real.sum()
+
+        low, high = (field.radius + altitude for altitude in altitudes)
+        step = 2 * np.pi / (max(field.degree, 2) * resolution)
+
+        # The radial decay of a degree is steeper than its waves in angle
+        n_radius = max(int(np.ceil(2 * (high - low) / (low * step))), 3) + 1
+        n_colatitude = int(np.ceil(np.pi / step)) + 1
+        n_longitude = int(np.ceil(2 * np.pi / step))
+
+        self.radii = np.linspace(low, high, n_radius)
+        self.colatitudes = np.linspace(0.0, np.pi, n_colatitude)
+        self.longitudes = np.linspace(0.0, 2 * np.pi, n_longitude, endpoint=False)
+        self.shape = (n_radius, n_colatitude, n_longitude)
+
+        self.path = None
+        if cache_dir is not None:
+            self.path = os.path.join(cache_dir, GRID_FILE.format(self.key()))
+
+        if self.path is not None and os.path.exists(self.path):
+            self.data = np.asarray(np.load(self.path, mmap_mode="r"))
+        else:
+            self.data = self.build()
+
+        self.error = self.check(n_check)
+        if self.error > tolerance:
+            raise ValueError(
+                f"The grid error <{self.error:.3e}> km/s**2 is above the tolerance "
+                f"<{tolerance:.3e}>, increase the resolution"
+            )
+
+    def __repr__(self):
+        """
+        Returns a string representation of the GravityGrid object.
+
+        Returns
+        -------
+        str
+            A string representation of the GravityGrid object.
+        """
+        return (
+            f"GravityGrid(shape={self.shape}, radii=({self.radii[0]}, "
+            f"{self.radii[-1]}), error={self.error:.3e})"
+        )
+
+    def key(self):
+        """Returns a hash of the field and the nodes naming the cache file."""
+        digest = hashlib.sha256()
+        for array in (
+            self.field.coefficients,
+            *self.field.indices,
+            np.array([self.field.mu, self.field.radius]),
+            self.radii,
+            np.array(self.shape),
+        ):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()[:16]
+
+    def build(self):
+        """
+        Samples the field without its point mass and J2 terms on the nodes.
+
+        Every ring of longitudes at a radius and colatitude is one harmonic
+        evaluation followed by sums over the orders, so building is about
+        as fast as evaluating the field once per ring. A cached grid is
+        written to a temporary file in the cache directory and only renamed
+        to its cache file once complete.
+
+        Returns
+        -------
+        np.ndarray
+            The accelerations of the nodes.
+        """
+        if self.path is None:
+            data = np.empty(self.shape + (3,))
+            self.sample(data)
+            return data
+
+        # A file of its own, grids built at the same time do not collide
+        descriptor, temporary = tempfile.mkstemp(
+            suffix=".npy", dir=os.path.dirname(self.path)
+        )
+        os.close(descriptor)
+        try:
+            data = np.lib.format.open_memmap(
+                temporary, mode="w+", dtype=float, shape=self.shape + (3,)
+            )
+            self.sample(data)
+            data.flush()
+            del data
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+        return np.asarray(np.load(self.path, mmap_mode="r"))
+
+    def sample(self, data):
+        """
+        Writes the accelerations of the nodes into an array.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            The (radius, colatitude, longitude, 3) array of the samples.
+        """
+        phases = np.exp(
+            1j * np.outer(np.arange(-1, self.field.degree + 2), self.longitudes)
+        )
+        directions = np.array(
+            [
+                np.cos(self.longitudes),
+                np.sin(self.longitudes),
+                np.zeros_like(self.longitudes),
+            ]
+        )
+
+        for i, radius in enumerate(self.radii):
+            for j, colatitude in enumerate(self.colatitudes):
+                sin, cos = np.sin(colatitude), np.cos(colatitude)
+                positions = radius * (sin * directions + [[0.0], [0.0], [cos]])
+                accelerations = ring_accelerations(
+                    self.field, radius, colatitude, phases
+                )
+                data[i, j] = (accelerations - self.reference(positions)).T
+
+    def check(self, n_check, seed=0):
+        """
+        Returns the largest acceleration error at random positions in the band.
+
+        Parameters
+        ----------
+        n_check : int
+            The number of positions.
+        seed : int, optional
+            The seed of the positions (default is 0).
+
+        Returns
+        -------
+        float
+            The largest norm of the difference to the direct evaluation.
+        """
+        rng = np.random.default_rng(seed)
+        directions = rng.normal(size=(n_check, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        radii = rng.uniform(self.radii[0], self.radii[-1], n_check)
+
+        error = 0.0
+        for position in directions * radii[:, None]:
+            difference = self.acceleration(position) - self.field.direct_acceleration(
+                position
+            )
+            error = max(error, np.linalg.norm(difference))
+        return error
+
+    def contains(self, position):
+        """Returns if a body-fixed position is inside the altitude band."""
+        radius = np.sqrt(position[0] ** 2 + position[1] ** 2 + position[2] ** 2)
+        return self.radii[0] <= radius <= self.radii[-1]
+
+    def reference(self, position):
+        """
+        Returns the point mass and J2 acceleration left out of the samples.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The body-fixed position vector, or a (3, n) array of them.
+
+        Returns
+        -------
+        np.ndarray
+            The acceleration in the body-fixed frame.
+        """
+        return np.array(
+            zonal_acceleration(
+                position[0],
+                position[1],
+                position[2],
+                self.field.mu,
+                self.field.radius,
+                self.j2,
+                0.0,
+            )
+        )
+
+    def acceleration(self, position):
+        """
+        Returns the interpolated acceleration at a body-fixed position.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The body-fixed position vector, inside the altitude band.
+
+        Returns
+        -------
+        np.ndarray
+            The acceleration vector in the body-fixed frame.
+        """
+        x, y, z = float(position[0]), float(position[1]), float(position[2])
+        radius = math.sqrt(x * x + y * y + z * z)
+        colatitude = math.acos(z / radius)
+        longitude = math.atan2(y, x) % (2 * math.pi)
+
+        n_radius, n_colatitude, n_longitude = self.shape
+        i, radius_weights = lagrange_weights(
+            (radius - self.radii[0]) / (self.radii[1] - self.radii[0]), n_radius
+        )
+        j, colatitude_weights = lagrange_weights(
+            colatitude / self.colatitudes[1], n_colatitude
+        )
+        k, longitude_weights = lagrange_weights(longitude / self.longitudes[1], None)
+
+        block = self.data[i : i + 4, j : j + 4]
+        if 0 <= k <= n_longitude - 4:
+            block = block[:, :, k : k + 4]
+        else:
+            block = block[:, :, [(k + index) % n_longitude for index in range(4)]]
+
+        # Contract one axis at a time, radius first
+        samples = (radius_weights @ block.reshape(4, 48)).reshape(4, 12)
+        samples = (colatitude_weights @ samples).reshape(4, 3)
+
+        return longitude_weights @ samples + self.reference(position)
+
+
+def lagrange_weights(coordinate, size):
+    """
+    Returns the weights of the cubic Lagrange interpolation.
+
+    Parameters
+    ----------
+    coordinate : float
+        The position in units of the node spacing from the first node.
+    size : int
+        The number of nodes, None for periodic nodes.
+
+    Returns
+    -------
+    tuple
+        The first node of the stencil and the weights of its four nodes.
+    """
+    start = math.floor(coordinate) - 1
+    if size is not None:
+        start = min(max(start, 0), size - 4)
+    t = coordinate - start
+
+    return start, np.array(
+        [
+            -(t - 1) * (t - 2) * (t - 3) / 6,
+            t * (t - 2) * (t - 3) / 2,
+            -t * (t - 1) * (t - 3) / 2,
+            t * (t - 1) * (t - 2) / 6,
+        ]
+    )
+
+
+def ring_accelerations(field, radius, colatitude, phases):
+    """
+    Returns the accelerations of a field on a ring of longitudes.
+
+    A solid harmonic of order m at longitude lambda is the one at longitude
+    zero times exp(i m lambda), so the terms of the acceleration are summed
+    by order once and the ring follows from one product with the phases.
+
+    Parameters
+    ----------
+    field : SphericalHarmonicGravity
+        The gravity field.
+    radius : float
+        The radius of the ring.
+    colatitude : float
+        The colatitude of the ring.
+    phases : np.ndarray
+        The (degree + 3, n) exp(i m lambda) of the orders -1 to the degree
+        plus one at the longitudes of the ring.
+
+    Returns
+    -------
+    np.ndarray
+        The (3, n) body-fixed accelerations, the point mass included.
+    """
+    n, m = field.indices
+    position = radius * np.array([np.sin(colatitude), 0.0, np.cos(colatitude)])
+    harmonics = field.harmonics(position, field.degree + 1)
+    size = field.degree + 3
+
+    def by_order(terms, orders):
+        # Sums of the terms of each order, the order -1 first
+        weighted = field.coefficients * terms
+        return np.bincount(orders + 1, weighted.real, size) + 1j * np.bincount(
+            orders + 1, weighted.imag, size
+        )
+
+    plus = by_order(-harmonics[n + 1, m + 3], m + 1) @ phases
+    minus = by_order(field.factors["minus"] * harmonics[n + 1, m + 1], m - 1) @ phases
+    vertical = by_order(field.factors["z"] * harmonics[n + 1, m + 2], m) @ phases
+
+    scale = field.mu / field.radius**2
+    return scale * np.array(
+        [(plus + minus).real / 2, (plus - minus).imag / 2, vertical.real]
+    )
@@ -23,25 +23,41 @@ class J2(Dynamic):
 
     def function(self, state: State, time: float):
 
-        rx, ry, rz = state.extract_position()
-
-        # Compute common terms
-        r2 = rx**2 + ry**2 + rz**2  # Square of the radial distance
-        r = np.sqrt(r2)  # Radial distance
-        r5 = r**5
-        R2 = self.scenario.central_body.radius**2  # Earth's radius squared
-
-        # Central body's parameters
-        J2 = self.scenario.central_body.j2  # J2 coefficient
-        mu = self.scenario.central_body.mu  # Gravitational parameter
-
-        alpha = -3 * J2 * mu * R2
-        beta = 1 - 5 * rz**2 / r2
-        gamma = 2 * r5
-
-        # Compute accelerations using Vallado's formulation
-        ax = alpha * rx / gamma * beta
-        ay = alpha * ry / gamma * beta
-        az = alpha * rz / gamma * (3 - 5 * rz**2 / r2)
-
-        return State(acceleration=np.array([ax, ay, az]))
+        acceleration = np.zeros(3)
+        self.accel_into(state.position, state.velocity, time, acceleration)
+
+        return State(acceleration=acceleration)
+
+    def accel_into(self, position, velocity, time, out):
+
+        ax, ay, az = j2_acceleration(
+            position[0],
+            position[1],
+            position[2],
+            self.scenario.central_body.mu,
+            self.scenario.central_body.j2,
+            self.scenario.central_body.radius,
+        )
+
+        out[0] += ax
+        out[1] += ay
+        out[2] += az
+
+
+def j2_acceleration(rx, ry, rz, mu, J2, radius):
+    """Returns the J2 acceleration components using Vallado's formulation."""
+    # Compute common terms
+    r2 = rx**2 + ry**2 + rz**2  # Square of the radial distance
+    r = np.sqrt(r2)  # Radial distance
+    r5 = r**5
+    R2 = radius**2  # Earth's radius squared
+
+    alpha = -3 * J2 * mu * R2
+    beta = 1 - 5 * rz**2 / r2
+    gamma = 2 * r5
+
+    return (
+        alpha * rx / gamma * beta,
+        alpha * ry / gamma * beta,
+        alpha * rz / gamma * (3 - 5 * rz**2 / r2),
+    )
@@ -10,25 +10,37 @@ class J3(Dynamic):
 
     def function(self, state: State, time: float):
 
-        rx, ry, rz = state.extract_position()
+        acceleration = np.zeros(3)
+        self.accel_into(state.position, state.velocity, time, acceleration)
 
-        # Compute common terms
-        r2 = rx**2 + ry**2 + rz**2  # Square of the radial distance
-        r = np.sqrt(r2)  # Radial distance
-        r7 = r**7  # r^7
-        R3 = self.scenario.central_body.radius**3  # Earth's radius cubed
+        return State(acceleration=acceleration)
 
-        # Central body's parameters
-        J3 = self.scenario.central_body.j3  # J3 coefficient
-        mu = self.scenario.central_body.mu  # Gravitational parameter
+    def accel_into(self, position, velocity, time, out):
 
-        alpha = -5 * J3 * mu * R3 / (2 * r7)
-        beta = 3 * rz - 7 * rz**3 / r2
-        gamma = 6 * rz**2 - 7 * rz**4 / r2 - 3 / 5 * r2
+        ax, ay, az = j3_acceleration(
+            position[0],
+            position[1],
+            position[2],
+            self.scenario.central_body.mu,
+            self.scenario.central_body.j3,
+            self.scenario.central_body.radius,
+        )
 
-        # Compute accelerations using Vallado's formulation
-        ax = alpha * rx * beta
-        ay = alpha * ry * beta
-        az = alpha * gamma
+        out[0] += ax
+        out[1] += ay
+        out[2] += az
 
-        return State(acceleration=np.array([ax, ay, az]))
+
+def j3_acceleration(rx, ry, rz, mu, J3, radius):
+    """Returns the J3 acceleration components using Vallado's formulation."""
+    # Compute common terms
+    r2 = rx**2 + ry**2 + rz**2  # Square of the radial distance
+    r = np.sqrt(r2)  # Radial distance
+    r7 = r**7  # r^7
+    R3 = radius**3  # Earth's radius cubed
+
+    alpha = -5 * J3 * mu * R3 / (2 * r7)
+    beta = 3 * rz - 7 * rz**3 / r2
+    gamma = 6 * rz**2 - 7 * rz**4 / r2 - 3 / 5 * r2
+
+    return alpha * rx * beta, alpha * ry * beta, alpha * gamma
@@ -53,12 +53,51 @@ class Keplerian(Dynamic):
         State
             The result of the function.
         """
-        rx, ry, rz = state.extract_position()
+        acceleration = np.zeros(3)
+        self.accel_into(state.position, state.velocity, time, acceleration)
 
-        r = np.sqrt(rx**2 + ry**2 + rz**2)
+        return State(acceleration=acceleration, time=time)
 
-        ax = -self.scenario.central_body.mu * rx / r**3
-        ay = -self.scenario.central_body.mu * ry / r**3
-        az = -self.scenario.central_body.mu * rz / r**3
+    def accel_into(self, position, velocity, time, out):
+        """
+        Adds the Keplerian acceleration into a buffer.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The position vector.
+        velocity : np.ndarray
+            The velocity vector.
+        time : float
+            The time of the dynamic.
+        out : np.ndarray
+            The acceleration buffer, updated in place.
+        """
+        ax, ay, az = keplerian_acceleration(
+            position[0], position[1], position[2], self.scenario.central_body.mu
+        )
+
+        out[0] += ax
+        out[1] += ay
+        out[2] += az
+
+
+def keplerian_acceleration(rx, ry, rz, mu):
+    """
+    Returns the Keplerian acceleration components.
+
+    Parameters
+    ----------
+    rx, ry, rz : float or np.ndarray
+        The position components.
+    mu : float
+        The gravitational parameter of the central body.
+
+    Returns
+    -------
+    tuple
+        The acceleration components.
+    """
+    r = np.sqrt(rx**2 + ry**2 + rz**2)
 
-        return State(acceleration=np.array([ax, ay, az]), time=time)
+    return -mu * rx / r**3, -mu * ry / r**3, -mu * rz / r**3
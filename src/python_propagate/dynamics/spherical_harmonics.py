@@ -0,0 +1,537 @@
+"""
+spherical_harmonics.py
+
+This module contains the spherical harmonic gravity dynamic.
+
+Classes:
+- SphericalHarmonicGravity: A class to represent the gravity field of the central body to a degree and order.
+
+Functions:
+- load_coefficients: Reads normalized gravity field coefficients from a text file.
+- solid_harmonics: Writes the complex solid harmonics of a body-fixed position into a buffer.
+- unnormalize: Returns the factors converting normalized coefficients to unnormalized ones.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+import os
+
+import numpy as np
+from scipy.special import gammaln
+
+from python_propagate.scenario import Scenario
+from python_propagate.dynamics import Dynamic
+from python_propagate.dynamics.compiled import jit
+from python_propagate.dynamics.gravity_grid import GravityGrid
+from python_propagate.agents.state import State
+from python_propagate.utilities.transforms import greenwich_sidereal_angle
+
+# The unnormalized harmonics leave double precision above this degree
+MAX_DEGREE = 120
+
+
+class SphericalHarmonicGravity(Dynamic):
+    """
+    A class to represent the gravity field of the central body to a degree and order.
+
+    The potential is the real part of sum (C_nm - i S_nm) Z_nm over the
+    complex solid harmonics Z_nm = V_nm + i W_nm of Cunningham, which are
+    built with the recursions of Montenbruck and Gill in the body-fixed
+    frame. Their derivatives are again solid harmonics, one degree higher
+    for the acceleration and two for the gravity gradient, so both are
+    weighted sums over one table of harmonics.
+
+    The body-fixed frame turns about the z axis with the angular velocity
+    of the central body from the Greenwich sidereal angle of the start
+    time of the agent. Precession, nutation and polar motion are left out.
+    The rotation of the last evaluation time is cached, so the acceleration
+    and the gradient of the same time share it.
+
+    Attributes
+    ----------
+    scenario : Scenario
+        The scenario of the dynamic.
+    agent : Agent
+        The agent of the dynamic.
+    stm : STM
+        The state transition matrix of the dynamic.
+    degree : int
+        The maximum degree of the field.
+    order : int
+        The maximum order of the field.
+    gradient : bool
+        Use the gravity gradient of the field in the STM dynamic.
+    mu : float
+        The gravitational parameter of the field.
+    radius : float
+        The reference radius of the field.
+    grid : GravityGrid
+        The acceleration grid of an altitude band, None to evaluate the
+        harmonic sum directly.
+    """
+
+    def __init__(
+        self,
+        scenario: Scenario,
+        agent=None,
+        stm=None,
+        coefficients=None,
+        degree=None,
+        order=None,
+        gradient=False,
+        grid=None,
+    ):
+        """
+        Constructs all the necessary attributes for the SphericalHarmonicGravity object.
+
+        Parameters
+        ----------
+        scenario : Scenario
+            The scenario of the dynamic.
+        agent : Agent
+            The agent of the dynamic.
+        stm : STM
+            The state transition matrix of the dynamic.
+        coefficients : str, PathLike or tuple, optional
+            The coefficient file read by ``load_coefficients`` or a tuple
+            of the normalized C and S arrays. The J2 and J3 zonal terms of
+            the central body if None.
+        degree : int, optional
+            The maximum degree, all the coefficients if None.
+        order : int, optional
+            The maximum order, the degree if None.
+        gradient : bool, optional
+            Replace the point mass, J2 and J3 partials of the STM dynamic
+            with the gravity gradient of the field (default is False).
+        grid : dict, optional
+            The keyword arguments of a ``GravityGrid`` interpolating the
+            acceleration in an altitude band, such as ``altitudes`` and
+            ``cache_dir``. The harmonic sum is evaluated directly if None.
+        """
+        super().__init__(scenario, agent, stm)
+
+        central_body = scenario.central_body
+        header = {}
+
+        if coefficients is None:
+            c = np.zeros((4, 4))
+            c[2, 0] = -central_body.j2 / np.sqrt(5)
+            c[3, 0] = -central_body.j3 / np.sqrt(7)
+            s = np.zeros((4, 4))
+        elif isinstance(coefficients, (str, os.PathLike)):
+            c, s, header = load_coefficients(coefficients, degree, order)
+        else:
+            c, s = (np.array(array, dtype=float) for array in coefficients)
+
+        self.degree = c.shape[0] - 1 if degree is None else degree
+        self.order = self.degree if order is None else min(order, self.degree)
+        if self.degree > MAX_DEGREE or self.degree >= c.shape[0]:
+            raise ValueError(
+                f"Degree <{self.degree}> is above the coefficients or {MAX_DEGREE}"
+            )
+
+        self.gradient = gradient
+        self.mu = header.get("mu", central_body.mu)
+        self.radius = header.get("radius", central_body.radius)
+
+        # The point mass is part of the field
+        c = c.copy()
+        c[0, 0] = 1.0
+
+        # The nonzero terms, as unnormalized complex coefficients C - i S
+        n, m = np.tril_indices(self.degree + 1)
+        keep = (m <= self.order) & ((c[n, m] != 0) | (s[n, m] != 0))
+        n, m = n[keep], m[keep]
+        self.coefficients = unnormalize(n, m) * (c[n, m] - 1j * s[n, m])
+        self.indices = n, m
+
+        # The factors of the derivative relations of the solid harmonics
+        self.factors = {
+            "minus": (n - m + 2.0) * (n - m + 1),
+            "z": -(n - m + 1.0),
+            "minus_minus": (n - m + 1.0) * (n - m + 2) * (n - m + 3) * (n - m + 4),
+            "z_z": (n - m + 1.0) * (n - m + 2),
+            "z_minus": -(n - m + 1.0) * (n - m + 2) * (n - m + 3),
+        }
+
+        # Z_n,-k = (-1)^k (n - k)! / (n + k)! conj(Z_n,k), two degrees above
+        # the field for the gradient
+        rows = np.arange(self.degree + 3)
+        self.negative = np.array(
+            [
+                np.where(
+                    rows >= k,
+                    (-1) ** k
+                    * np.exp(
+                        gammaln(np.maximum(rows - k, 0) + 1) - gammaln(rows + k + 1)
+                    ),
+                    0.0,
+                )
+                for k in (1, 2)
+            ]
+        )
+
+        self.grid = None if grid is None else GravityGrid(self, **grid)
+
+        self._greenwich_angle = None
+        self._rotation_time = None
+        self._rotation_matrix = None
+
+    def __repr__(self):
+        """
+        Returns a string representation of the SphericalHarmonicGravity object.
+
+        Returns
+        -------
+        str
+            A string representation of the SphericalHarmonicGravity object.
+        """
+        return (
+            f"SphericalHarmonicGravity(degree={self.degree}, order={self.order}, "
+            f"gradient={self.gradient})"
+        )
+
+    def rotation(self, time):
+        """
+        Returns the rotation from the inertial to the body-fixed frame.
+
+        Parameters
+        ----------
+        time : float
+            The seconds after the start time of the agent.
+
+        Returns
+        -------
+        np.ndarray
+            The (3, 3) rotation matrix.
+        """
+        if time != self._rotation_time or self._rotation_matrix is None:
+            if self._greenwich_angle is None:
+                self._greenwich_angle = greenwich_sidereal_angle(self.agent.start_time)
+
+            angle = (
+                self._greenwich_angle
+                + self.scenario.central_body.angular_velocity * time
+            )
+            cos, sin = np.cos(angle), np.sin(angle)
+            self._rotation_matrix = np.array(
+                [[cos, sin, 0.0], [-sin, cos, 0.0], [0.0, 0.0, 1.0]]
+            )
+            self._rotation_time = time
+
+        return self._rotation_matrix
+
+    def harmonics(self, position, degree):
+        """
+        Returns the complex solid harmonics Z_nm at a body-fixed position.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The body-fixed position vector.
+        degree : int
+            The maximum degree of the harmonics.
+
+        Returns
+        -------
+        np.ndarray
+            The (degree + 1, degree + 3) harmonics, the order m in column
+            m + 2 for the orders -2 to the degree.
+        """
+        harmonics = np.zeros((degree + 1, degree + 3), dtype=complex)
+        solid_harmonics(
+            position[0],
+            position[1],
+            position[2],
+            self.radius,
+            degree,
+            self.negative,
+            harmonics,
+        )
+        return harmonics
+
+    def body_acceleration(self, position):
+        """
+        Returns the acceleration at a body-fixed position in the body-fixed frame.
+
+        Interpolated from the grid inside its altitude band, evaluated
+        directly elsewhere.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The body-fixed position vector.
+
+        Returns
+        -------
+        np.ndarray
+            The acceleration vector.
+        """
+        if self.grid is not None and self.grid.contains(position):
+            return self.grid.acceleration(position)
+
+        return self.direct_acceleration(position)
+
+    def direct_acceleration(self, position):
+        """
+        Returns the acceleration of the harmonic sum at a body-fixed position.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The body-fixed position vector.
+
+        Returns
+        -------
+        np.ndarray
+            The acceleration vector in the body-fixed frame.
+        """
+        n, m = self.indices
+        harmonics = self.harmonics(position, self.degree + 1)
+
+        # The derivatives (d/dx + i d/dy), (d/dx - i d/dy) and d/dz of Z_nm
+        plus = -harmonics[n + 1, m + 3]
+        minus = self.factors["minus"] * harmonics[n + 1, m + 1]
+        vertical = self.factors["z"] * harmonics[n + 1, m + 2]
+
+        coefficients = self.coefficients
+        scale = self.mu / self.radius**2
+        return scale * np.array(
+            [
+                (coefficients @ (plus + minus)).real / 2,
+                (coefficients @ (plus - minus)).imag / 2,
+                (coefficients @ vertical).real,
+            ]
+        )
+
+    def body_gradient(self, position):
+        """
+        Returns the gravity gradient at a body-fixed position in the body-fixed frame.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The body-fixed position vector.
+
+        Returns
+        -------
+        np.ndarray
+            The (3, 3) partials of the acceleration with respect to the position.
+        """
+        n, m = self.indices
+        harmonics = self.harmonics(position, self.degree + 2)
+        coefficients = self.coefficients
+
+        plus_plus = coefficients @ harmonics[n + 2, m + 4]
+        minus_minus = coefficients @ (self.factors["minus_minus"] * harmonics[n + 2, m])
+        z_z = coefficients @ (self.factors["z_z"] * harmonics[n + 2, m + 2])
+        z_plus = coefficients @ (-self.factors["z"] * harmonics[n + 2, m + 3])
+        z_minus = coefficients @ (self.factors["z_minus"] * harmonics[n + 2, m + 1])
+        # Laplace's equation, (d/dx + i d/dy)(d/dx - i d/dy) = -d2/dz2
+        plus_minus = -z_z
+
+        xx = (plus_plus + 2 * plus_minus + minus_minus).real / 4
+        yy = -(plus_plus - 2 * plus_minus + minus_minus).real / 4
+        xy = (plus_plus - minus_minus).imag / 4
+        xz = (z_plus + z_minus).real / 2
+        yz = (z_plus - z_minus).imag / 2
+        zz = z_z.real
+
+        scale = self.mu / self.radius**3
+        return scale * np.array([[xx, xy, xz], [xy, yy, yz], [xz, yz, zz]])
+
+    def function(self, state: State, time: float):
+        """
+        The function of the spherical harmonic gravity dynamic.
+
+        Parameters
+        ----------
+        state : State
+            The state of the dynamic.
+        time : float
+            The time of the dynamic.
+
+        Returns
+        -------
+        State
+            The result of the function.
+        """
+        acceleration = np.zeros(3)
+        self.accel_into(state.position, state.velocity, time, acceleration)
+
+        return State(acceleration=acceleration, time=time)
+
+    def accel_into(self, position, velocity, time, out):
+        """
+        Adds the spherical harmonic gravity acceleration into a buffer.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The position vector, or a (3, n) array of them.
+        velocity : np.ndarray
+            The velocity vector, or a (3, n) array of them.
+        time : float
+            The time of the dynamic.
+        out : np.ndarray
+            The acceleration buffer, updated in place.
+        """
+        if np.ndim(position) > 1:
+            for column in range(position.shape[1]):
+                self.accel_into(
+                    position[:, column], velocity[:, column], time, out[:, column]
+                )
+            return
+
+        rotation = self.rotation(time)
+        out += rotation.T @ self.body_acceleration(rotation @ position)
+
+    def gradient_into(self, position, time, out):
+        """
+        Adds the gravity gradient in the inertial frame into a buffer.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The position vector.
+        time : float
+            The time of the dynamic.
+        out : np.ndarray
+            The (3, 3) buffer, updated in place.
+        """
+        rotation = self.rotation(time)
+        out += rotation.T @ self.body_gradient(rotation @ position) @ rotation
+
+
+@jit
+def solid_harmonics(x, y, z, radius, degree, negative, out):
+    """
+    Writes the complex solid harmonics Z_nm of a body-fixed position into a buffer.
+
+    The recursions of Montenbruck and Gill for V_nm + i W_nm, written in
+    plain scalar loops so they can also be compiled by the optional numba
+    backend.
+
+    Parameters
+    ----------
+    x, y, z : float
+        The body-fixed position components.
+    radius : float
+        The reference radius of the field.
+    degree : int
+        The maximum degree of the harmonics.
+    negative : np.ndarray
+        The factors of the orders -1 and -2 for every degree.
+    out : np.ndarray
+        The zeroed (degree + 1, degree + 3) complex buffer, the order m in
+        column m + 2.
+    """
+    r2 = x * x + y * y + z * z
+    rho = radius / r2
+    sectorial = (x + 1j * y) * rho
+    zonal = z * rho
+    previous = radius * rho
+
+    out[0, 2] = radius / np.sqrt(r2)
+    for m in range(degree + 1):
+        if m > 0:
+            out[m, m + 2] = (2 * m - 1) * sectorial * out[m - 1, m + 1]
+        if m < degree:
+            out[m + 1, m + 2] = (2 * m + 1) * zonal * out[m, m + 2]
+        for n in range(m + 2, degree + 1):
+            out[n, m + 2] = (
+                (2 * n - 1) * zonal * out[n - 1, m + 2]
+                - (n + m - 1) * previous * out[n - 2, m + 2]
+            ) / (n - m)
+
+    for n in range(degree + 1):
+        out[n, 1] = negative[0, n] * np.conj(out[n, 3])
+        out[n, 0] = negative[1, n] * np.conj(out[n, 4])
+
+
+def unnormalize(degree, order):
+    """
+    Returns the factors converting normalized coefficients to unnormalized ones.
+
+    Parameters
+    ----------
+    degree, order : np.ndarray
+        The degrees and orders of the coefficients.
+
+    Returns
+    -------
+    np.ndarray
+        The factors sqrt((2 - delta_m0) (2n + 1) (n - m)! / (n + m)!).
+    """
+    degree = np.asarray(degree, dtype=float)
+    order = np.asarray(order, dtype=float)
+    return np.sqrt(
+        np.where(order == 0, 1.0, 2.0)
+        * (2 * degree + 1)
+        * np.exp(gammaln(degree - order + 1) - gammaln(degree + order + 1))
+    )
+
+
+def load_coefficients(path, degree=None, order=None):
+    """
+    Reads normalized gravity field coefficients from a text file.
+
+    Reads the EGM text format, one ``n m C S`` line for every coefficient
+    with optional standard deviations after it, and the ICGEM ``gfc`` format.
+    Fortran D exponents are accepted and other lines are skipped. The
+    gravitational parameter and radius of an ICGEM header are converted to
+    km units.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path of the file.
+    degree : int, optional
+        The maximum degree to read, all of them if None.
+    order : int, optional
+        The maximum order to read, the degree if None.
+
+    Returns
+    -------
+    tuple
+        The (degree + 1, degree + 1) normalized C and S arrays and a dict of
+        the ``mu`` and ``radius`` of the header.
+    """
+    rows = []
+    header = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            fields = line.split()
+            if not fields:
+                continue
+            if fields[0] in ("gfc", "gfct"):
+                fields = fields[1:]
+            try:
+                if fields[0] == "earth_gravity_constant":
+                    header["mu"] = float(fields[1]) / 1e9
+                elif fields[0] == "radius":
+                    header["radius"] = float(fields[1]) / 1e3
+                else:
+                    n, m = int(fields[0]), int(fields[1])
+                    c, s = (
+                        float(field.upper().replace("D", "E")) for field in fields[2:4]
+                    )
+                    rows.append((n, m, c, s))
+            except (ValueError, IndexError):
+                continue
+
+    if not rows:
+        raise ValueError(f"No coefficients were read from <{path}>")
+
+    size = max(row[0] for row in rows) if degree is None else degree
+    order = size if order is None else order
+
+    c = np.zeros((size + 1, size + 1))
+    s = np.zeros((size + 1, size + 1))
+    for n, m, c_nm, s_nm in rows:
+        if n <= size and m <= min(n, order):
+            c[n, m] = c_nm
+            s[n, m] = s_nm
+
+    return c, s, header
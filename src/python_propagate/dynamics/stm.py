@@ -16,861 +16,928 @@ class STM(Dynamic):
     def function(self, state: State, time: float):
 
         stm = state.stm
-        A_matrix = self.a_matrix(state)
+        A_matrix = self.a_matrix(state, time)
 
         stm_dot = A_matrix @ stm
 
         return State(stm_dot=stm_dot, time=time)
 
-    def a_matrix(self, state: State):
+    def accel_into(self, position, velocity, time, out):
+        # The STM does not contribute to the acceleration
+        pass
 
-        rx, ry, rz = state.extract_position()
-        vx, vy, vz = state.extract_velocity()
+    def stm_dot_into(self, position, velocity, stm, time, out):
+        """Writes the time derivative of the STM into a (6, 6) buffer."""
+        np.matmul(self.a_matrix_from_arrays(position, velocity, time), stm, out=out)
 
-        radius = np.sqrt(rx**2 + ry**2 + rz**2)
+    def a_matrix(self, state: State, time=0.0):
+
+        return self.a_matrix_from_arrays(state.position, state.velocity, time)
+
+    def a_matrix_from_arrays(self, position, velocity, time=0.0):
+        """
+        Returns the state matrix of the agent at a position and velocity.
+
+        Gravity fields with a ``gradient`` replace the point mass, J2 and J3
+        partials, which all scale with mu, with their gravity gradient.
+        """
 
-        radius_body = self.scenario.central_body.radius
-        mu = self.scenario.central_body.mu
-        j2 = self.scenario.central_body.j2
-        j3 = self.scenario.central_body.j3
+        rx, ry, rz = position[0], position[1], position[2]
+        vx, vy, vz = velocity[0], velocity[1], velocity[2]
+
+        radius = np.sqrt(rx**2 + ry**2 + rz**2)
 
         rho0, h0, scale_height = self.scenario.central_body.atmosphere_model(radius)
-        cd = self.agent.coefficet_of_drag
-        area = self.agent.area
-        mass = self.agent.mass
-        angular_velocity = self.scenario.central_body.angular_velocity
 
-        # automatically generated by sympy
-        a_matrix_total = np.array(
+        fields = [
+            dynamic
+            for dynamic in self.agent.dynamics
+            if getattr(dynamic, "gradient", False)
+        ]
+
+        a_matrix = state_matrix(
+            rx,
+            ry,
+            rz,
+            vx,
+            vy,
+            vz,
+            self.scenario.central_body.radius,
+            0.0 if fields else self.scenario.central_body.mu,
+            self.scenario.central_body.j2,
+            self.scenario.central_body.j3,
+            rho0,
+            h0,
+            scale_height,
+            self.agent.coefficent_of_drag,
+            self.agent.area,
+            self.agent.mass,
+            self.scenario.central_body.angular_velocity,
+        )
+
+        for field in fields:
+            field.gradient_into(position, time, a_matrix[3:6, 0:3])
+
+        return a_matrix
+
+
+def state_matrix(
+    rx,
+    ry,
+    rz,
+    vx,
+    vy,
+    vz,
+    radius_body,
+    mu,
+    j2,
+    j3,
+    rho0,
+    h0,
+    scale_height,
+    cd,
+    area,
+    mass,
+    angular_velocity,
+):
+    """
+    Returns the state matrix of the two body, J2, J3 and drag dynamics.
+
+    Plain scalar arithmetic so it can also be compiled by the optional
+    numba backend.
+    """
+
+    # automatically generated by sympy
+    a_matrix_total = np.array(
+        [
+            [0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0, 0.0, 1.0, 0.0],
+            [0.0, 0.0, 0.0, 0.0, 0.0, 1.0],
             [
-                [0, 0, 0, 1, 0, 0],
-                [0, 0, 0, 0, 1, 0],
-                [0, 0, 0, 0, 0, 1],
-                [
-                    500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * angular_velocity
-                    * (-rx * angular_velocity + vy)
-                    * (ry * angular_velocity + vx)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    + 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * rx
-                    * (ry * angular_velocity + vx)
+                500000000.0
+                * area
+                * cd
+                * rho0
+                * angular_velocity
+                * (-rx * angular_velocity + vy)
+                * (ry * angular_velocity + vx)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx**2
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    - 3
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx**2
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    + (3 / 2)
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx**2
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    - 15
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx**2
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + (5 / 2)
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * rx**2 / (rx**2 + ry**2 + rz**2) ** (5 / 2)
-                    - mu / (rx**2 + ry**2 + rz**2) ** (3 / 2),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * angular_velocity
-                    * (ry * angular_velocity + vx) ** 2
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    - 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * angular_velocity
+                )
+                + 500000000.0
+                * area
+                * cd
+                * rho0
+                * rx
+                * (ry * angular_velocity + vx)
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * rx**2
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                - 3
+                * j2
+                * radius_body**2
+                * mu
+                * rx**2
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                + (3 / 2)
+                * j2
+                * radius_body**2
+                * mu
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * rx**2
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                - 15
+                * j3
+                * radius_body**3
+                * mu
+                * rx**2
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + (5 / 2)
+                * j3
+                * radius_body**3
+                * mu
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * rx**2 / (rx**2 + ry**2 + rz**2) ** (5 / 2)
+                - mu / (rx**2 + ry**2 + rz**2) ** (3 / 2),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * angular_velocity
+                * (ry * angular_velocity + vx) ** 2
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / mass
-                    + 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * ry
-                    * (ry * angular_velocity + vx)
+                )
+                - 500000000.0
+                * area
+                * cd
+                * rho0
+                * angular_velocity
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / mass
+                + 500000000.0
+                * area
+                * cd
+                * rho0
+                * ry
+                * (ry * angular_velocity + vx)
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * ry
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                - 3
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * ry
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * ry
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                - 15
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * ry
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * rx * ry / (rx**2 + ry**2 + rz**2) ** (5 / 2),
+                500000000.0
+                * area
+                * cd
+                * rho0
+                * rz
+                * (ry * angular_velocity + vx)
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * rz
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 12
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * rz**2
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                + 20
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * rz**2
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + (5 / 2)
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * rx * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * (ry * angular_velocity + vx) ** 2
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * ry
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    - 3
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * ry
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * ry
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    - 15
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * ry
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * rx * ry / (rx**2 + ry**2 + rz**2) ** (5 / 2),
-                    500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * rz
-                    * (ry * angular_velocity + vx)
+                )
+                - 500000000.0
+                * area
+                * cd
+                * rho0
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / mass,
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * (-rx * angular_velocity + vy)
+                * (ry * angular_velocity + vx)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * rz
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 12
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * rz**2
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    + 20
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * rz**2
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + (5 / 2)
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * rx * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * (ry * angular_velocity + vx) ** 2
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    - 500000000.0
-                    * area
-                    * cd
-                    * rho0
+                ),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * vz
+                * (ry * angular_velocity + vx)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / mass,
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * (-rx * angular_velocity + vy)
-                    * (ry * angular_velocity + vx)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    ),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * vz
-                    * (ry * angular_velocity + vx)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    ),
-                ],
-                [
-                    500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * angular_velocity
-                    * (-rx * angular_velocity + vy) ** 2
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    + 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * angular_velocity
+                ),
+            ],
+            [
+                500000000.0
+                * area
+                * cd
+                * rho0
+                * angular_velocity
+                * (-rx * angular_velocity + vy) ** 2
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / mass
-                    + 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * rx
-                    * (-rx * angular_velocity + vy)
+                )
+                + 500000000.0
+                * area
+                * cd
+                * rho0
+                * angular_velocity
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / mass
+                + 500000000.0
+                * area
+                * cd
+                * rho0
+                * rx
+                * (-rx * angular_velocity + vy)
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * ry
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                - 3
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * ry
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * ry
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                - 15
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * ry
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * rx * ry / (rx**2 + ry**2 + rz**2) ** (5 / 2),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * angular_velocity
+                * (-rx * angular_velocity + vy)
+                * (ry * angular_velocity + vx)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * ry
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    - 3
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * ry
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * ry
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    - 15
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * ry
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * rx * ry / (rx**2 + ry**2 + rz**2) ** (5 / 2),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * angular_velocity
-                    * (-rx * angular_velocity + vy)
-                    * (ry * angular_velocity + vx)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    + 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * ry
-                    * (-rx * angular_velocity + vy)
+                )
+                + 500000000.0
+                * area
+                * cd
+                * rho0
+                * ry
+                * (-rx * angular_velocity + vy)
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * ry**2
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                - 3
+                * j2
+                * radius_body**2
+                * mu
+                * ry**2
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                + (3 / 2)
+                * j2
+                * radius_body**2
+                * mu
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * ry**2
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                - 15
+                * j3
+                * radius_body**3
+                * mu
+                * ry**2
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + (5 / 2)
+                * j3
+                * radius_body**3
+                * mu
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * ry**2 / (rx**2 + ry**2 + rz**2) ** (5 / 2)
+                - mu / (rx**2 + ry**2 + rz**2) ** (3 / 2),
+                500000000.0
+                * area
+                * cd
+                * rho0
+                * rz
+                * (-rx * angular_velocity + vy)
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * ry
+                * rz
+                * (-(rx**2) - ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 12
+                * j2
+                * radius_body**2
+                * mu
+                * ry
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * ry
+                * rz**2
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                + 20
+                * j3
+                * radius_body**3
+                * mu
+                * ry
+                * rz**2
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + (5 / 2)
+                * j3
+                * radius_body**3
+                * mu
+                * ry
+                * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * ry * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * (-rx * angular_velocity + vy)
+                * (ry * angular_velocity + vx)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * ry**2
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    - 3
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * ry**2
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    + (3 / 2)
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * ry**2
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    - 15
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * ry**2
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + (5 / 2)
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * ry**2 / (rx**2 + ry**2 + rz**2) ** (5 / 2)
-                    - mu / (rx**2 + ry**2 + rz**2) ** (3 / 2),
-                    500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * rz
-                    * (-rx * angular_velocity + vy)
+                ),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * (-rx * angular_velocity + vy) ** 2
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * ry
-                    * rz
-                    * (-(rx**2) - ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 12
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * ry
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * ry
-                    * rz**2
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    + 20
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * ry
-                    * rz**2
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + (5 / 2)
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * ry
-                    * (-3 * rx**2 - 3 * ry**2 + 4 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * ry * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * (-rx * angular_velocity + vy)
-                    * (ry * angular_velocity + vx)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    ),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * (-rx * angular_velocity + vy) ** 2
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    - 500000000.0
-                    * area
-                    * cd
-                    * rho0
+                )
+                - 500000000.0
+                * area
+                * cd
+                * rho0
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / mass,
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * vz
+                * (-rx * angular_velocity + vy)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / mass,
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * vz
-                    * (-rx * angular_velocity + vy)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    ),
-                ],
-                [
-                    500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * vz
-                    * angular_velocity
-                    * (-rx * angular_velocity + vy)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    + 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * rx
-                    * vz
+                ),
+            ],
+            [
+                500000000.0
+                * area
+                * cd
+                * rho0
+                * vz
+                * angular_velocity
+                * (-rx * angular_velocity + vy)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    - 9
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rx
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rx
-                    * (
-                        7 * rz**4
-                        + (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
-                        * (rx**2 + ry**2 + rz**2)
-                    )
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    + (5 / 2)
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * (
-                        2 * rx * (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
-                        + 1.2 * rx * (rx**2 + ry**2 + rz**2)
-                    )
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * rx * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * vz
-                    * angular_velocity
-                    * (ry * angular_velocity + vx)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    + 500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * ry
-                    * vz
+                )
+                + 500000000.0
+                * area
+                * cd
+                * rho0
+                * rx
+                * vz
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                - 9
+                * j2
+                * radius_body**2
+                * mu
+                * rx
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * rx
+                * (
+                    7 * rz**4
+                    + (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
+                    * (rx**2 + ry**2 + rz**2)
+                )
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                + (5 / 2)
+                * j3
+                * radius_body**3
+                * mu
+                * (
+                    2 * rx * (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
+                    + 1.2 * rx * (rx**2 + ry**2 + rz**2)
+                )
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * rx * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * vz
+                * angular_velocity
+                * (ry * angular_velocity + vx)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * ry
-                    * rz
-                    * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    - 9
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * ry
-                    * rz
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * ry
-                    * (
-                        7 * rz**4
-                        + (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
-                        * (rx**2 + ry**2 + rz**2)
-                    )
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    + (5 / 2)
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * (
-                        2 * ry * (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
-                        + 1.2 * ry * (rx**2 + ry**2 + rz**2)
-                    )
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * ry * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
-                    500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * rz
-                    * vz
+                )
+                + 500000000.0
+                * area
+                * cd
+                * rho0
+                * ry
+                * vz
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * ry
+                * rz
+                * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                - 9
+                * j2
+                * radius_body**2
+                * mu
+                * ry
+                * rz
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * ry
+                * (
+                    7 * rz**4
+                    + (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
+                    * (rx**2 + ry**2 + rz**2)
+                )
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                + (5 / 2)
+                * j3
+                * radius_body**3
+                * mu
+                * (
+                    2 * ry * (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
+                    + 1.2 * ry * (rx**2 + ry**2 + rz**2)
+                )
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * ry * rz / (rx**2 + ry**2 + rz**2) ** (5 / 2),
+                500000000.0
+                * area
+                * cd
+                * rho0
+                * rz
+                * vz
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
+                - 21
+                / 2
+                * j2
+                * radius_body**2
+                * mu
+                * rz**2
+                * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 6
+                * j2
+                * radius_body**2
+                * mu
+                * rz**2
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                + (3 / 2)
+                * j2
+                * radius_body**2
+                * mu
+                * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
+                / (rx**2 + ry**2 + rz**2) ** (7 / 2)
+                - 45
+                / 2
+                * j3
+                * radius_body**3
+                * mu
+                * rz
+                * (
+                    7 * rz**4
+                    + (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
+                    * (rx**2 + ry**2 + rz**2)
+                )
+                / (rx**2 + ry**2 + rz**2) ** (11 / 2)
+                + (5 / 2)
+                * j3
+                * radius_body**3
+                * mu
+                * (
+                    28 * rz**3
+                    + 2 * rz * (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
+                    - 10.8 * rz * (rx**2 + ry**2 + rz**2)
+                )
+                / (rx**2 + ry**2 + rz**2) ** (9 / 2)
+                + 3 * mu * rz**2 / (rx**2 + ry**2 + rz**2) ** (5 / 2)
+                - mu / (rx**2 + ry**2 + rz**2) ** (3 / 2),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * vz
+                * (ry * angular_velocity + vx)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (scale_height * mass * sqrt(rx**2 + ry**2 + rz**2))
-                    - 21
-                    / 2
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rz**2
-                    * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 6
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * rz**2
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    + (3 / 2)
-                    * j2
-                    * radius_body**2
-                    * mu
-                    * (-3 * rx**2 - 3 * ry**2 + 2 * rz**2)
-                    / (rx**2 + ry**2 + rz**2) ** (7 / 2)
-                    - 45
-                    / 2
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * rz
-                    * (
-                        7 * rz**4
-                        + (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
-                        * (rx**2 + ry**2 + rz**2)
-                    )
-                    / (rx**2 + ry**2 + rz**2) ** (11 / 2)
-                    + (5 / 2)
-                    * j3
-                    * radius_body**3
-                    * mu
-                    * (
-                        28 * rz**3
-                        + 2 * rz * (0.6 * rx**2 + 0.6 * ry**2 - 5.4 * rz**2)
-                        - 10.8 * rz * (rx**2 + ry**2 + rz**2)
-                    )
-                    / (rx**2 + ry**2 + rz**2) ** (9 / 2)
-                    + 3 * mu * rz**2 / (rx**2 + ry**2 + rz**2) ** (5 / 2)
-                    - mu / (rx**2 + ry**2 + rz**2) ** (3 / 2),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * vz
-                    * (ry * angular_velocity + vx)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    ),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * vz
-                    * (-rx * angular_velocity + vy)
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    ),
-                    -500000000.0
-                    * area
-                    * cd
-                    * rho0
-                    * vz**2
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
-                    )
-                    / (
-                        mass
-                        * sqrt(
-                            vz**2
-                            + (-rx * angular_velocity + vy) ** 2
-                            + (ry * angular_velocity + vx) ** 2
-                        )
-                    )
-                    - 500000000.0
-                    * area
-                    * cd
-                    * rho0
+                ),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * vz
+                * (-rx * angular_velocity + vy)
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
                     * sqrt(
                         vz**2
                         + (-rx * angular_velocity + vy) ** 2
                         + (ry * angular_velocity + vx) ** 2
                     )
-                    * np.exp(
-                        (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                ),
+                -500000000.0
+                * area
+                * cd
+                * rho0
+                * vz**2
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / (
+                    mass
+                    * sqrt(
+                        vz**2
+                        + (-rx * angular_velocity + vy) ** 2
+                        + (ry * angular_velocity + vx) ** 2
                     )
-                    / mass,
-                ],
-            ]
-        )
+                )
+                - 500000000.0
+                * area
+                * cd
+                * rho0
+                * sqrt(
+                    vz**2
+                    + (-rx * angular_velocity + vy) ** 2
+                    + (ry * angular_velocity + vx) ** 2
+                )
+                * np.exp(
+                    (radius_body + h0 - sqrt(rx**2 + ry**2 + rz**2)) / scale_height
+                )
+                / mass,
+            ],
+        ]
+    )
 
-        return a_matrix_total
+    return a_matrix_total
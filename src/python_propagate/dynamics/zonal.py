@@ -0,0 +1,239 @@
+"""
+zonal.py
+
+This module contains the fused zonal gravity dynamic.
+
+Classes:
+- ZonalGravity: A class to represent the point mass and zonal gravity in one pass.
+
+Functions:
+- zonal_acceleration: Returns the point mass, J2 and J3 acceleration components.
+- fuse_zonal_gravity: Replaces several Keplerian, J2 and J3 dynamics of an agent by one ZonalGravity.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+import numpy as np
+
+from python_propagate.scenario import Scenario
+from python_propagate.dynamics import Dynamic
+from python_propagate.dynamics.keplerian import Keplerian
+from python_propagate.dynamics.j2 import J2
+from python_propagate.dynamics.j3 import J3
+from python_propagate.agents.state import State
+
+# The standalone dynamics of each zonal degree
+DEGREES = {2: J2, 3: J3}
+
+
+class ZonalGravity(Dynamic):
+    """
+    A class to represent the point mass and zonal gravity in one pass.
+
+    Replaces the Keplerian, J2 and J3 dynamics, which each compute the
+    radius and its powers on their own, with one evaluation sharing them.
+    ``Agent.add_dynamics`` substitutes it when several of them are added.
+
+    Attributes
+    ----------
+    scenario : Scenario
+        The scenario of the dynamic.
+    agent : Agent
+        The agent of the dynamic.
+    stm : STM
+        The state transition matrix of the dynamic.
+    point_mass : bool
+        Include the Keplerian point mass acceleration.
+    degrees : tuple
+        The degrees of the zonal terms, 2 and or 3.
+    """
+
+    def __init__(
+        self, scenario: Scenario, agent=None, stm=None, point_mass=True, degrees=(2, 3)
+    ):
+        """
+        Constructs all the necessary attributes for the ZonalGravity object.
+
+        Parameters
+        ----------
+        scenario : Scenario
+            The scenario of the dynamic.
+        agent : Agent
+            The agent of the dynamic.
+        stm : STM
+            The state transition matrix of the dynamic.
+        point_mass : bool, optional
+            Include the Keplerian point mass acceleration (default is True).
+        degrees : tuple, optional
+            The degrees of the zonal terms (default is (2, 3)).
+        """
+        super().__init__(scenario, agent, stm)
+
+        unsupported = [degree for degree in degrees if degree not in DEGREES]
+        if unsupported:
+            raise NotImplementedError(
+                f"Zonal degrees <{unsupported}> are not supported, only 2 and 3"
+            )
+
+        self.point_mass = point_mass
+        self.degrees = tuple(sorted(set(degrees)))
+
+    def __repr__(self):
+        """
+        Returns a string representation of the ZonalGravity object.
+
+        Returns
+        -------
+        str
+            A string representation of the ZonalGravity object.
+        """
+        return f"ZonalGravity(point_mass={self.point_mass}, degrees={self.degrees})"
+
+    @property
+    def terms(self):
+        """Returns the standalone dynamics the zonal gravity evaluates."""
+        keplerian = (Keplerian,) if self.point_mass else ()
+        return keplerian + tuple(DEGREES[degree] for degree in self.degrees)
+
+    def function(self, state: State, time: float):
+        """
+        The function of the zonal gravity dynamic.
+
+        Parameters
+        ----------
+        state : State
+            The state of the dynamic.
+        time : float
+            The time of the dynamic.
+
+        Returns
+        -------
+        State
+            The result of the function.
+        """
+        acceleration = np.zeros(3)
+        self.accel_into(state.position, state.velocity, time, acceleration)
+
+        return State(acceleration=acceleration, time=time)
+
+    def accel_into(self, position, velocity, time, out, point_mass=None):
+        """
+        Adds the zonal gravity acceleration into a buffer.
+
+        Parameters
+        ----------
+        position : np.ndarray
+            The position vector.
+        velocity : np.ndarray
+            The velocity vector.
+        time : float
+            The time of the dynamic.
+        out : np.ndarray
+            The acceleration buffer, updated in place.
+        point_mass : bool, optional
+            Include the point mass acceleration, ``point_mass`` of the
+            dynamic if None. Set to False for the perturbing part alone.
+        """
+        central_body = self.scenario.central_body
+
+        ax, ay, az = zonal_acceleration(
+            position[0],
+            position[1],
+            position[2],
+            central_body.mu,
+            central_body.radius,
+            central_body.j2 if 2 in self.degrees else 0.0,
+            central_body.j3 if 3 in self.degrees else 0.0,
+            self.point_mass if point_mass is None else point_mass,
+        )
+
+        out[0] += ax
+        out[1] += ay
+        out[2] += az
+
+
+def zonal_acceleration(rx, ry, rz, mu, radius, J2, J3, point_mass=True):
+    """
+    Returns the point mass, J2 and J3 acceleration components.
+
+    The terms are those of ``keplerian_acceleration``, ``j2_acceleration``
+    and ``j3_acceleration`` written in the squared sine of the latitude,
+    rz**2 / r**2, and the powers of the radius they share.
+
+    Parameters
+    ----------
+    rx, ry, rz : float or np.ndarray
+        The position components.
+    mu : float
+        The gravitational parameter of the central body.
+    radius : float
+        The radius of the central body.
+    J2, J3 : float
+        The zonal harmonic coefficients, 0 to leave a term out.
+    point_mass : bool, optional
+        Include the point mass acceleration (default is True).
+
+    Returns
+    -------
+    tuple
+        The acceleration components.
+    """
+    r2 = rx**2 + ry**2 + rz**2
+    r = np.sqrt(r2)
+    mu_r3 = mu / (r2 * r)
+    sin2 = rz**2 / r2
+
+    ax = ay = az = 0.0
+
+    if point_mass:
+        ax = -mu_r3 * rx
+        ay = -mu_r3 * ry
+        az = -mu_r3 * rz
+
+    if J2:
+        alpha = -1.5 * J2 * mu_r3 * (radius**2 / r2)
+        beta = alpha * (1 - 5 * sin2)
+        ax = ax + beta * rx
+        ay = ay + beta * ry
+        az = az + alpha * rz * (3 - 5 * sin2)
+
+    if J3:
+        alpha = -2.5 * J3 * mu_r3 * (radius**3 / (r2 * r2))
+        beta = alpha * rz * (3 - 7 * sin2)
+        ax = ax + beta * rx
+        ay = ay + beta * ry
+        az = az + alpha * r2 * (6 * sin2 - 7 * sin2**2 - 3 / 5)
+
+    return ax, ay, az
+
+
+def fuse_zonal_gravity(agent):
+    """
+    Replaces several Keplerian, J2 and J3 dynamics of an agent by one ZonalGravity.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent whose ``dynamics`` are fused in place.
+    """
+    zonal = [
+        index
+        for index, dynamic in enumerate(agent.dynamics)
+        if type(dynamic) in (Keplerian, J2, J3, ZonalGravity)
+    ]
+    terms = [term for index in zonal for term in agent.dynamics[index].terms]
+
+    # A repeated term is added twice, which the fused dynamic can not do
+    if len(zonal) < 2 or len(set(terms)) < len(terms):
+        return
+
+    fused = ZonalGravity(
+        scenario=agent.scenario,
+        agent=agent,
+        point_mass=Keplerian in terms,
+        degrees=[degree for degree, term in DEGREES.items() if term in terms],
+    )
+    agent.dynamics[zonal[0]] = fused
+    for index in reversed(zonal[1:]):
+        del agent.dynamics[index]
@@ -0,0 +1,207 @@
+"""
+atmosphere.py
+
+This module contains the smooth atmosphere density model.
+
+Classes:
+- LogDensitySpline: A class to represent a smooth log-density fit of an exponential atmosphere table.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+import math
+from bisect import bisect_right
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+
+class LogDensitySpline:
+    """
+    A class to represent a smooth log-density fit of an exponential atmosphere table.
+
+    The logarithm of the density is a cubic spline through the nominal
+    densities of the table at their base altitudes, with the end slopes of
+    the first and last scale heights. Below and above the table it
+    continues as the exponential of the end layers. Unlike the layers of
+    the table, the density and its gradient are continuous at every base
+    altitude.
+
+    ``layer`` returns the density and the local scale height
+    -1 / (d log(density) / d altitude) in the form of the layer constants
+    of the table, so the exponential of the drag dynamic and the drag
+    partials of the STM are exact for it.
+
+    Attributes
+    ----------
+    table : np.ndarray
+        The exponential atmosphere table of the fit.
+    breakpoints : np.ndarray
+        The base altitudes of the table.
+    coefficients : np.ndarray
+        The (4, n - 1) polynomial coefficients of the spline intervals,
+        highest power first.
+    """
+
+    def __init__(self, table):
+        """
+        Constructs all the necessary attributes for the LogDensitySpline object.
+
+        Parameters
+        ----------
+        table : np.ndarray
+            Rows of base altitude [km], nominal density [kg/m^3] and scale
+            height [km], sorted by base altitude, at least two rows.
+        """
+        self.table = np.asarray(table, dtype=float)
+        altitudes, densities, scale_heights = self.table.T
+
+        spline = CubicSpline(
+            altitudes,
+            np.log(densities),
+            bc_type=((1, -1 / scale_heights[0]), (1, -1 / scale_heights[-1])),
+        )
+        self.breakpoints = spline.x
+        self.coefficients = spline.c
+
+        # The density has to fall everywhere for the scale height to exist
+        samples = np.linspace(altitudes[0], altitudes[-1], 50 * len(altitudes))
+        if np.any(spline(samples, 1) >= 0):
+            raise ValueError("The log-density fit of the table is not decreasing")
+
+        # Plain lists for the scalar evaluation
+        self._breakpoints = self.breakpoints.tolist()
+        self._intervals = self.coefficients.T.tolist()
+        self._ends = (
+            (altitudes[0], math.log(densities[0]), -1 / scale_heights[0]),
+            (altitudes[-1], math.log(densities[-1]), -1 / scale_heights[-1]),
+        )
+
+    def __repr__(self):
+        """
+        Returns a string representation of the LogDensitySpline object.
+
+        Returns
+        -------
+        str
+            A string representation of the LogDensitySpline object.
+        """
+        return (
+            f"LogDensitySpline(layers={len(self.table)}, "
+            f"altitudes=({self._breakpoints[0]}, {self._breakpoints[-1]}))"
+        )
+
+    def log_density(self, altitude):
+        """
+        Returns the logarithm of the density and its altitude derivative.
+
+        Parameters
+        ----------
+        altitude : float or np.ndarray
+            The altitude above the central body [km].
+
+        Returns
+        -------
+        tuple
+            The log-density and its derivative with respect to altitude.
+        """
+        if isinstance(altitude, np.ndarray):
+            return self._log_density_array(altitude)
+
+        breakpoints = self._breakpoints
+        if altitude <= breakpoints[0] or altitude >= breakpoints[-1]:
+            base, log_density, slope = self._ends[
+                0 if altitude <= breakpoints[0] else 1
+            ]
+            return log_density + slope * (altitude - base), slope
+
+        index = bisect_right(breakpoints, altitude) - 1
+        c3, c2, c1, c0 = self._intervals[index]
+        dx = altitude - breakpoints[index]
+
+        return ((c3 * dx + c2) * dx + c1) * dx + c0, (3 * c3 * dx + 2 * c2) * dx + c1
+
+    def _log_density_array(self, altitude):
+        """Returns the log-density and its derivative of an array of altitudes."""
+        breakpoints = self.breakpoints
+        clipped = np.clip(altitude, breakpoints[0], breakpoints[-1])
+        index = np.clip(
+            np.searchsorted(breakpoints, clipped, side="right") - 1,
+            0,
+            len(breakpoints) - 2,
+        )
+        c3, c2, c1, c0 = self.coefficients[:, index]
+        dx = clipped - breakpoints[index]
+
+        log_density = ((c3 * dx + c2) * dx + c1) * dx + c0
+        slope = (3 * c3 * dx + 2 * c2) * dx + c1
+
+        # Exponential continuation of the end layers
+        for end, outside in zip(
+            self._ends, (altitude < breakpoints[0], altitude > breakpoints[-1])
+        ):
+            base, end_log_density, end_slope = end
+            log_density = np.where(
+                outside, end_log_density + end_slope * (altitude - base), log_density
+            )
+            slope = np.where(outside, end_slope, slope)
+
+        return log_density, slope
+
+    def density(self, altitude):
+        """
+        Returns the density at an altitude.
+
+        Parameters
+        ----------
+        altitude : float or np.ndarray
+            The altitude above the central body [km].
+
+        Returns
+        -------
+        float or np.ndarray
+            The density [kg/m^3].
+        """
+        log_density, _ = self.log_density(altitude)
+        return np.exp(log_density)
+
+    def gradient(self, altitude):
+        """
+        Returns the derivative of the density with respect to altitude.
+
+        Parameters
+        ----------
+        altitude : float or np.ndarray
+            The altitude above the central body [km].
+
+        Returns
+        -------
+        float or np.ndarray
+            The density gradient [kg/m^3/km].
+        """
+        log_density, slope = self.log_density(altitude)
+        return np.exp(log_density) * slope
+
+    def layer(self, altitude):
+        """
+        Returns the layer constants of the tangent exponential at an altitude.
+
+        Parameters
+        ----------
+        altitude : float or np.ndarray
+            The altitude above the central body [km].
+
+        Returns
+        -------
+        rho0 : float or np.ndarray
+            The density at the altitude.
+        h0 : float or np.ndarray
+            The altitude.
+        scale_height : float or np.ndarray
+            The local scale height.
+        """
+        log_density, slope = self.log_density(altitude)
+        if isinstance(altitude, np.ndarray):
+            return np.exp(log_density), altitude, -1 / slope
+        return math.exp(log_density), altitude, -1 / slope
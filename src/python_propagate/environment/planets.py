@@ -7,11 +7,56 @@ Classes:
 - Planet: A class to represent a planet.
 - Earth: A class to represent the Earth.
 
+Functions:
+- load_atmosphere_table: Reads an exponential atmosphere table from a text file.
+
 Author: Aaron Berkhoff
 Date: 2025-01-30
 
 """
 
+import os
+from bisect import bisect_left
+
+import numpy as np
+
+from python_propagate.environment.atmosphere import LogDensitySpline
+
+# Exponential atmosphere of Vallado, rows of base altitude [km], nominal
+# density [kg/m^3] and scale height [km], sorted by base altitude
+EXPONENTIAL_ATMOSPHERE = np.array(
+    [
+        (0, 1.225, 7.249),
+        (25, 3.899e-2, 6.349),
+        (30, 1.774e-2, 6.682),
+        (40, 3.972e-3, 7.554),
+        (50, 1.057e-3, 8.382),
+        (60, 3.206e-4, 7.714),
+        (70, 8.770e-5, 6.549),
+        (80, 1.905e-5, 5.799),
+        (90, 3.396e-6, 5.382),
+        (100, 5.297e-7, 5.877),
+        (110, 9.661e-8, 7.263),
+        (120, 2.438e-8, 9.473),
+        (130, 8.484e-9, 12.636),
+        (140, 3.845e-9, 16.149),
+        (150, 2.070e-9, 22.523),
+        (180, 5.464e-10, 29.740),
+        (200, 2.789e-10, 37.105),
+        (250, 7.248e-11, 45.546),
+        (300, 2.418e-11, 53.628),
+        (350, 9.518e-12, 53.298),
+        (400, 3.725e-12, 58.515),
+        (450, 1.585e-12, 60.828),
+        (500, 6.967e-13, 63.822),
+        (600, 1.454e-13, 71.835),
+        (700, 3.614e-14, 88.667),
+        (800, 1.170e-14, 124.64),
+        (900, 5.245e-15, 181.05),
+        (1000, 3.019e-15, 268),
+    ]
+)
+
 
 class Planet:
     """
@@ -264,6 +309,11 @@ class Earth(Planet):
         The angular velocity of the planet.
     flattening : float
         The flattening factor of the planet.
+    atmosphere_table : np.ndarray
+        The exponential atmosphere table, rows of base altitude, nominal
+        density and scale height sorted by base altitude.
+    atmosphere : str
+        The atmosphere model, "exponential" or "spline".
     """
 
     def __init__(
@@ -276,6 +326,8 @@ class Earth(Planet):
         mu=398600.4415,
         angular_velocity=7.29211585530066e-5,
         flattening_bool=False,
+        atmosphere_table=None,
+        atmosphere="exponential",
     ):
         """
         Initializes the Earth with the given parameters.
@@ -298,6 +350,13 @@ class Earth(Planet):
             The angular velocity of the planet (default is 7.29211585530066e-5).
         flattening_bool : float, optional
             The flattening boolean of the planet (default is 1 / 298.257223563).
+        atmosphere_table : array-like, str or PathLike, optional
+            The exponential atmosphere table or the path of its file, the
+            table of Vallado if None.
+        atmosphere : str, optional
+            The atmosphere model, "exponential" for the layers of the table
+            or "spline" for the smooth log-density fit of the table
+            (default is "exponential").
         """
         if flattening_bool:
             flattening = 1 / 298.257223563
@@ -308,6 +367,11 @@ class Earth(Planet):
             name, radius, j2, j3, spice_id, mu, angular_velocity, flattening=flattening
         )
 
+        self.atmosphere_table = (
+            EXPONENTIAL_ATMOSPHERE if atmosphere_table is None else atmosphere_table
+        )
+        self.atmosphere = atmosphere
+
     def __repr__(self):
         """
         Returns a string representation of the Planet object.
@@ -323,138 +387,157 @@ class Earth(Planet):
             f"angular_velocity={self._angular_velocity}, flattening_bool={self._flattening_bool})"
         )
 
+    @property
+    def atmosphere_table(self):
+        """Returns the exponential atmosphere table of the Earth."""
+        return self._atmosphere_table
+
+    @atmosphere_table.setter
+    def atmosphere_table(self, table):
+        """
+        Sets the exponential atmosphere table of the Earth.
+
+        Parameters
+        ----------
+        table : array-like, str or PathLike
+            Rows of base altitude [km], nominal density [kg/m^3] and scale
+            height [km], or the path of a file of them read by
+            ``load_atmosphere_table``.
+        """
+        if isinstance(table, (str, os.PathLike)):
+            table = load_atmosphere_table(table)
+
+        table = np.array(table, dtype=float)
+        if table.ndim != 2 or table.shape[1] != 3 or len(table) == 0:
+            raise ValueError(
+                "The atmosphere table needs rows of base altitude, nominal density "
+                "and scale height"
+            )
+        if np.any(table[:, 1:] <= 0):
+            raise ValueError("Atmosphere densities and scale heights must be positive")
+
+        table = table[np.argsort(table[:, 0], kind="stable")]
+        table.flags.writeable = False
+        self._atmosphere_table = table
+        self._log_density_spline = None
+
+        # The base altitudes and layer constants for the scalar lookup
+        self._base_altitudes = table[:, 0].tolist()
+        self._layers = [
+            (density, altitude, scale_height)
+            for altitude, density, scale_height in table.tolist()
+        ]
+
+    @property
+    def atmosphere(self):
+        """Returns the atmosphere model of the Earth."""
+        return self._atmosphere
+
+    @atmosphere.setter
+    def atmosphere(self, atmosphere):
+        """
+        Sets the atmosphere model of the Earth.
+
+        Parameters
+        ----------
+        atmosphere : str
+            "exponential" or "spline".
+        """
+        if atmosphere not in ("exponential", "spline"):
+            raise NotImplementedError(
+                f"Atmosphere <{atmosphere}> is not an option or is spelled wrong"
+            )
+        self._atmosphere = atmosphere
+
+    @property
+    def log_density_spline(self):
+        """Returns the log-density spline of the atmosphere table, fitted once."""
+        if self._log_density_spline is None:
+            self._log_density_spline = LogDensitySpline(self._atmosphere_table)
+        return self._log_density_spline
+
     def atmosphere_model(self, radius_spacecraft):
         """
         Returns the atmospheric density at the given altitude.
 
+        The layer of an altitude is the last one whose base altitude is
+        below it, the lowest layer below the table. With the "spline"
+        atmosphere it is the tangent exponential of the smooth fit at the
+        altitude itself, see ``LogDensitySpline.layer``.
+
         Parameters
         ----------
-        radius_spacecraft : float
-            The radius of the spacecraft.
+        radius_spacecraft : float or np.ndarray
+            The radius of the spacecraft, or an array of them.
 
         Returns
         -------
-        rho0 : float
+        rho0 : float or np.ndarray
             The atmospheric density at the given altitude.
-        h0 : float
+        h0 : float or np.ndarray
             The altitude of the atmospheric density.
-        base_height : float
+        base_height : float or np.ndarray
             The base height of the atmospheric density.
         """
-
         altitude = radius_spacecraft - self.radius
 
-        if altitude > 1000:
-            rho0 = 3.019e-15
-            h0 = 1000
-            base_height = 268
-        elif altitude > 900:
-            rho0 = 5.245e-15
-            h0 = 900
-            base_height = 181.05
-        elif altitude > 800:
-            rho0 = 1.170e-14
-            h0 = 800
-            base_height = 124.64
-        elif altitude > 700:
-            rho0 = 3.614e-14
-            h0 = 700
-            base_height = 88.667
-        elif altitude > 600:
-            rho0 = 1.454e-13
-            h0 = 600
-            base_height = 71.835
-        elif altitude > 500:
-            rho0 = 6.967e-13
-            h0 = 500
-            base_height = 63.822
-        elif altitude > 450:
-            rho0 = 1.585e-12
-            h0 = 450
-            base_height = 60.828
-        elif altitude > 400:
-            rho0 = 3.725e-12
-            h0 = 400
-            base_height = 58.515
-        elif altitude > 350:
-            rho0 = 9.518e-12
-            h0 = 350
-            base_height = 53.298
-        elif altitude > 300:
-            rho0 = 2.418e-11
-            h0 = 300
-            base_height = 53.628
-        elif altitude > 250:
-            rho0 = 7.248e-11
-            h0 = 250
-            base_height = 45.546
-        elif altitude > 200:
-            rho0 = 2.789e-10
-            h0 = 200
-            base_height = 37.105
-        elif altitude > 180:
-            rho0 = 5.464e-10
-            h0 = 180
-            base_height = 29.740
-        elif altitude > 150:
-            rho0 = 2.070e-9
-            h0 = 150
-            base_height = 22.523
-        elif altitude > 140:
-            rho0 = 3.845e-9
-            h0 = 140
-            base_height = 16.149
-        elif altitude > 130:
-            rho0 = 8.484e-9
-            h0 = 130
-            base_height = 12.636
-        elif altitude > 120:
-            rho0 = 2.438e-8
-            h0 = 120
-            base_height = 9.473
-        elif altitude > 110:
-            rho0 = 9.661e-8
-            h0 = 110
-            base_height = 7.263
-        elif altitude > 100:
-            rho0 = 5.297e-7
-            h0 = 100
-            base_height = 5.877
-        elif altitude > 90:
-            rho0 = 3.396e-6
-            h0 = 90
-            base_height = 5.382
-        elif altitude > 80:
-            rho0 = 1.905e-5
-            h0 = 80
-            base_height = 5.799
-        elif altitude > 70:
-            rho0 = 8.770e-5
-            h0 = 70
-            base_height = 6.549
-        elif altitude > 60:
-            rho0 = 3.206e-4
-            h0 = 60
-            base_height = 7.714
-        elif altitude > 50:
-            rho0 = 1.057e-3
-            h0 = 50
-            base_height = 8.382
-        elif altitude > 40:
-            rho0 = 3.972e-3
-            h0 = 40
-            base_height = 7.554
-        elif altitude > 30:
-            rho0 = 1.774e-2
-            h0 = 30
-            base_height = 6.682
-        elif altitude > 25:
-            rho0 = 3.899e-2
-            h0 = 25
-            base_height = 6.349
-        else:
-            rho0 = 1.225
-            h0 = 0
-            base_height = 7.249
+        if self._atmosphere == "spline":
+            return self.log_density_spline.layer(altitude)
+
+        if not isinstance(altitude, np.ndarray):
+            index = bisect_left(self._base_altitudes, altitude) - 1
+            return self._layers[index if index > 0 else 0]
+
+        table = self._atmosphere_table
+        index = np.searchsorted(table[:, 0], altitude) - 1
+        np.maximum(index, 0, out=index)
+        return table[index, 1], table[index, 0], table[index, 2]
 
-        return rho0, h0, base_height
+
+def load_atmosphere_table(path):
+    """
+    Reads an exponential atmosphere table from a text file.
+
+    Every line holds the base altitude [km], nominal density [kg/m^3] and
+    scale height [km] of a layer, separated by spaces or commas, as in the
+    tables of Vallado. Blank lines and lines starting with '#' are skipped,
+    as are header lines that are not numbers before the first layer.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path of the file.
+
+    Returns
+    -------
+    np.ndarray
+        The table, one row per layer.
+
+    Raises
+    ------
+    ValueError
+        If a line after the first layer is not numeric, or a layer does
+        not have three values.
+    """
+    rows = []
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            fields = line.replace(",", " ").split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            try:
+                row = [float(field) for field in fields]
+            except ValueError as exc:
+                if not rows:
+                    continue
+                raise ValueError(
+                    f"Line <{number}> of <{path}> is not a layer of numbers"
+                ) from exc
+            if len(row) != 3:
+                raise ValueError(
+                    f"Line <{number}> of <{path}> has <{len(row)}> values, expected "
+                    "the base altitude, nominal density and scale height"
+                )
+            rows.append(row)
+
+    return np.array(rows)
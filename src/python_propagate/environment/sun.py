@@ -0,0 +1,75 @@
+"""
+sun.py
+
+This module contains an analytic model of the position of the Sun.
+
+Functions:
+- julian_date: Returns the Julian date of a datetime.
+- sun_position: Returns the position of the Sun relative to the Earth.
+
+Constants:
+- ASTRONOMICAL_UNIT: The astronomical unit in km.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from python_propagate.utilities.units import DEG2RAD
+
+ASTRONOMICAL_UNIT = 149597870.7
+
+J2000 = datetime(2000, 1, 1, 12, 0, 0)
+
+
+def julian_date(time: datetime):
+    """Returns the Julian date of a datetime."""
+    return 2451545.0 + (time - J2000).total_seconds() / 86400
+
+
+def sun_position(time: datetime):
+    """
+    Returns the position of the Sun relative to the Earth.
+
+    Uses the low precision analytic series of Vallado (Algorithm 29), good to
+    about 0.01 degrees, in the mean equator and equinox of date, which is
+    treated as the inertial frame.
+
+    Parameters
+    ----------
+    time : datetime
+        The time of the position.
+
+    Returns
+    -------
+    np.ndarray
+        The position of the Sun in km.
+    """
+    centuries = (julian_date(time) - 2451545.0) / 36525
+
+    mean_longitude = 280.460 + 36000.771 * centuries
+    mean_anomaly = (357.5291092 + 35999.05034 * centuries) * DEG2RAD
+
+    ecliptic_longitude = (
+        mean_longitude
+        + 1.914666471 * np.sin(mean_anomaly)
+        + 0.019994643 * np.sin(2 * mean_anomaly)
+    ) * DEG2RAD
+    obliquity = (23.439291 - 0.0130042 * centuries) * DEG2RAD
+
+    distance = (
+        1.000140612
+        - 0.016708617 * np.cos(mean_anomaly)
+        - 0.000139589 * np.cos(2 * mean_anomaly)
+    ) * ASTRONOMICAL_UNIT
+
+    return distance * np.array(
+        [
+            np.cos(ecliptic_longitude),
+            np.cos(obliquity) * np.sin(ecliptic_longitude),
+            np.sin(obliquity) * np.sin(ecliptic_longitude),
+        ]
+    )
@@ -0,0 +1,125 @@
+"""
+Events module.
+
+This module contains the Event class.
+
+Event functions are called as ``event(time, state)`` with the time in
+seconds since the start of the propagation and the state vector, and the
+integrator locates the zero crossings of the returned value. They follow the
+event interface of scipy's solve_ivp, so they work with every integrator.
+
+Classes:
+- Event: A base class for event functions.
+- EventOccurrence: The time and state of a located event.
+
+Functions:
+- event_occurrences: Returns the located events of an integration sorted by time.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+EventOccurrence = namedtuple("EventOccurrence", ["event", "seconds", "time", "state"])
+
+
+class Event:
+    """
+    A base class for event functions.
+
+    Attributes
+    ----------
+    terminal : bool
+        Stop the propagation at the first occurrence of the event.
+    direction : int
+        Only locate crossings from negative to positive if 1, from positive
+        to negative if -1 and both if 0.
+    """
+
+    def __init__(self, terminal: bool = False, direction: int = 0):
+        """
+        Constructs all the necessary attributes for the Event object.
+
+        Parameters
+        ----------
+        terminal : bool, optional
+            Stop the propagation at the first occurrence (default is False).
+        direction : int, optional
+            The direction of the crossings to locate (default is 0).
+        """
+        self.terminal = terminal
+        self.direction = direction
+
+    def __call__(self, time, state):
+        """
+        Calls the function of the event.
+
+        Parameters
+        ----------
+        time : float
+            The time in seconds since the start of the propagation.
+        state : np.ndarray
+            The state vector.
+
+        Returns
+        -------
+        float
+            The value of the event function, the event occurs at its zeros.
+        """
+        return self.function(time, state)
+
+    def __repr__(self):
+        """
+        Returns a string representation of the Event object.
+
+        Returns
+        -------
+        str
+            A string representation of the Event object.
+        """
+        return (
+            f"{type(self).__name__}(terminal={self.terminal}, "
+            f"direction={self.direction})"
+        )
+
+    def function(self, time, state):
+        """The function of the event."""
+        raise NotImplementedError
+
+
+def event_occurrences(events, ode_state, start_time):
+    """
+    Returns the located events of an integration sorted by time.
+
+    Parameters
+    ----------
+    events : tuple
+        The event functions of the integration.
+    ode_state : IntegrationResult or OdeResult
+        The result object holding the times and states of each event.
+    start_time : datetime
+        The start time of the propagation.
+
+    Returns
+    -------
+    list
+        The ``EventOccurrence`` of every located event.
+    """
+    return sorted(
+        (
+            EventOccurrence(
+                event=event,
+                seconds=seconds,
+                time=start_time + timedelta(seconds=seconds),
+                state=state,
+            )
+            for event, times, states in zip(
+                events, ode_state.t_events, ode_state.y_events
+            )
+            for seconds, state in zip(times, states)
+        ),
+        key=lambda occurrence: occurrence.seconds,
+    )
@@ -0,0 +1,57 @@
+"""
+altitude.py
+
+This module contains the AltitudeEvent class.
+
+Classes:
+- AltitudeEvent: An event when the altitude crosses a threshold.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+
+from python_propagate.events import Event
+
+
+class AltitudeEvent(Event):
+    """
+    An event when the altitude crosses a threshold.
+
+    With the defaults the event is a terminal reentry: the propagation stops
+    when the altitude falls below the threshold.
+
+    Attributes
+    ----------
+    altitude : float
+        The threshold altitude in km.
+    radius : float
+        The radius of the central body in km.
+    """
+
+    def __init__(self, altitude, radius, terminal=True, direction=-1):
+        """
+        Constructs all the necessary attributes for the AltitudeEvent object.
+
+        Parameters
+        ----------
+        altitude : float
+            The threshold altitude in km.
+        radius : float
+            The radius of the central body in km.
+        terminal : bool, optional
+            Stop the propagation at the first occurrence (default is True).
+        direction : int, optional
+            The direction of the crossings to locate (default is -1, descending).
+        """
+        super().__init__(terminal, direction)
+        self.altitude = altitude
+        self.radius = radius
+
+    def function(self, time, state):
+        """Returns the altitude above the threshold."""
+        return np.sqrt(state[0] ** 2 + state[1] ** 2 + state[2] ** 2) - (
+            self.radius + self.altitude
+        )
@@ -0,0 +1,54 @@
+"""
+apsis.py
+
+This module contains the ApsisEvent class.
+
+Classes:
+- ApsisEvent: An event at the periapsis or apoapsis passages.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+from python_propagate.events import Event
+
+DIRECTIONS = {"periapsis": 1, "apoapsis": -1, "both": 0}
+
+
+class ApsisEvent(Event):
+    """
+    An event at the periapsis or apoapsis passages.
+
+    The event function is the radial velocity times the radius, which
+    crosses zero from negative to positive at periapsis and from positive
+    to negative at apoapsis.
+
+    Attributes
+    ----------
+    apsis : str
+        'periapsis', 'apoapsis' or 'both'.
+    """
+
+    def __init__(self, apsis="both", terminal=False):
+        """
+        Constructs all the necessary attributes for the ApsisEvent object.
+
+        Parameters
+        ----------
+        apsis : str, optional
+            'periapsis', 'apoapsis' or 'both' (default is 'both').
+        terminal : bool, optional
+            Stop the propagation at the first occurrence (default is False).
+        """
+        if apsis not in DIRECTIONS:
+            raise NotImplementedError(
+                f"Apsis <{apsis}> is not an option or is spelled wrong"
+            )
+
+        super().__init__(terminal, DIRECTIONS[apsis])
+        self.apsis = apsis
+
+    def function(self, time, state):
+        """Returns the dot product of the position and velocity."""
+        return state[0] * state[3] + state[1] * state[4] + state[2] * state[5]
@@ -0,0 +1,65 @@
+"""
+elevation.py
+
+This module contains the ElevationEvent class.
+
+Classes:
+- ElevationEvent: An event when an agent rises or sets for a station.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+from datetime import timedelta
+
+from python_propagate.events import Event
+from python_propagate.agents.state import State
+from python_propagate.utilities.units import RAD2DEG
+
+
+class ElevationEvent(Event):
+    """
+    An event when an agent rises or sets for a station.
+
+    The event function is the elevation of the agent seen from the station
+    minus the station's minimum elevation angle, in degrees. Rises are
+    crossings with direction 1 and sets with direction -1.
+
+    Attributes
+    ----------
+    station : Station
+        The observing station, with its scenario set.
+    epoch : datetime
+        The start time of the propagation.
+    """
+
+    def __init__(self, station, epoch, terminal=False, direction=0):
+        """
+        Constructs all the necessary attributes for the ElevationEvent object.
+
+        Parameters
+        ----------
+        station : Station
+            The observing station, with its scenario set.
+        epoch : datetime
+            The start time of the propagation.
+        terminal : bool, optional
+            Stop the propagation at the first occurrence (default is False).
+        direction : int, optional
+            The direction of the crossings to locate (default is 0).
+        """
+        super().__init__(terminal, direction)
+        self.station = station
+        self.epoch = epoch
+
+    def function(self, time, state):
+        """Returns the elevation above the station's minimum elevation angle."""
+        target = State(
+            position=state[0:3],
+            velocity=state[3:6],
+            time=self.epoch + timedelta(seconds=time),
+        )
+        _, elevation = self.station.calculate_azimuth_and_elevation(target)
+
+        return elevation * RAD2DEG - self.station.minimum_elevation_angle
@@ -0,0 +1,70 @@
+"""
+shadow.py
+
+This module contains the ShadowEvent class.
+
+Classes:
+- ShadowEvent: An event when the agent enters or exits the shadow of the central body.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from python_propagate.events import Event
+from python_propagate.environment.sun import sun_position
+
+
+class ShadowEvent(Event):
+    """
+    An event when the agent enters or exits the shadow of the central body.
+
+    Uses a cylindrical shadow: the event function is the distance of the
+    agent from the shadow axis minus the radius of the central body on the
+    night side and the altitude on the day side, so it is negative in shadow.
+    Entries are crossings with direction -1 and exits with direction 1.
+
+    Attributes
+    ----------
+    radius : float
+        The radius of the central body in km.
+    epoch : datetime
+        The start time of the propagation.
+    """
+
+    def __init__(self, radius, epoch, terminal=False, direction=0):
+        """
+        Constructs all the necessary attributes for the ShadowEvent object.
+
+        Parameters
+        ----------
+        radius : float
+            The radius of the central body in km.
+        epoch : datetime
+            The start time of the propagation.
+        terminal : bool, optional
+            Stop the propagation at the first occurrence (default is False).
+        direction : int, optional
+            The direction of the crossings to locate (default is 0).
+        """
+        super().__init__(terminal, direction)
+        self.radius = radius
+        self.epoch = epoch
+
+    def function(self, time, state):
+        """Returns the distance outside of the shadow cylinder."""
+        sun = sun_position(self.epoch + timedelta(seconds=time))
+        sun_direction = sun / np.linalg.norm(sun)
+
+        position = state[0:3]
+        along = np.dot(position, sun_direction)
+        radius = np.linalg.norm(position)
+
+        if along >= 0:
+            return radius - self.radius
+
+        return np.sqrt(max(radius**2 - along**2, 0.0)) - self.radius
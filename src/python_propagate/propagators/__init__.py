@@ -0,0 +1,504 @@
+"""
+Propagators module.
+
+This module contains the Integrator base class for the in-house integrators.
+
+Classes:
+- Integrator: A base class for stepping integrators.
+- IntegrationResult: A class to hold the output of an integration.
+- EventLocator: A class to locate the zero crossings of event functions.
+
+Functions:
+- fill_output: Advances an integrator and fills an output array.
+- iterate_output: Advances an integrator and yields the output in chunks.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+from scipy.optimize import brentq
+
+EPS = np.finfo(float).eps
+
+
+class IntegrationResult:
+    """
+    A class to hold the output of an integration.
+
+    Mirrors the attributes of the scipy ``OdeResult`` that the rest of the
+    package relies on so the result can be used interchangeably.
+
+    Attributes
+    ----------
+    t : np.ndarray
+        The output times in seconds, shape (n_points,).
+    y : np.ndarray
+        The output states, shape (n, n_points).
+    nfev : int
+        The number of right hand side evaluations.
+    n_steps : int
+        The number of accepted steps.
+    n_rejected : int
+        The number of rejected steps.
+    steps : tuple or None
+        The times, states and derivatives at the accepted steps, shapes
+        (n_steps + 1,), (n, n_steps + 1) and (n, n_steps + 1).
+    t_events : list or None
+        The times of each event, one array per event.
+    y_events : list or None
+        The states at each event, one array of shape (n_occurrences, n) per
+        event.
+    status : int
+        0 if the end of the span was reached, 1 if a terminal event occurred.
+    """
+
+    def __init__(
+        self,
+        t,
+        y,
+        nfev,
+        n_steps,
+        n_rejected=0,
+        steps=None,
+        t_events=None,
+        y_events=None,
+        status=0,
+    ):
+        """
+        Constructs all the necessary attributes for the IntegrationResult object.
+
+        Parameters
+        ----------
+        t : np.ndarray
+            The output times in seconds.
+        y : np.ndarray
+            The output states.
+        nfev : int
+            The number of right hand side evaluations.
+        n_steps : int
+            The number of accepted steps.
+        n_rejected : int, optional
+            The number of rejected steps (default is 0).
+        steps : tuple, optional
+            The times, states and derivatives at the accepted steps
+            (default is None).
+        t_events : list, optional
+            The times of each event (default is None).
+        y_events : list, optional
+            The states at each event (default is None).
+        status : int, optional
+            1 if a terminal event occurred (default is 0).
+        """
+        self.t = t
+        self.y = y
+        self.nfev = nfev
+        self.n_steps = n_steps
+        self.n_rejected = n_rejected
+        self.steps = steps
+        self.t_events = t_events
+        self.y_events = y_events
+        self.status = status
+        self.success = True
+
+    def __repr__(self):
+        """
+        Returns a string representation of the IntegrationResult object.
+
+        Returns
+        -------
+        str
+            A string representation of the IntegrationResult object.
+        """
+        return (
+            f"IntegrationResult(n_points={self.t.size}, nfev={self.nfev}, "
+            f"n_steps={self.n_steps}, n_rejected={self.n_rejected})"
+        )
+
+
+class Integrator:
+    """
+    A base class for stepping integrators.
+
+    The interface follows scipy's ``OdeSolver``: the integrator holds the
+    current time ``t`` and state ``y`` and is advanced with ``step``.
+
+    Attributes
+    ----------
+    function : callable
+        The right hand side ``function(time, state)`` of the system.
+    t : float
+        The current time in seconds.
+    y : np.ndarray
+        The current state vector.
+    t_bound : float
+        The final time of the integration.
+    nfev : int
+        The number of right hand side evaluations.
+    n_steps : int
+        The number of accepted steps.
+    n_rejected : int
+        The number of rejected steps.
+    status : str
+        'running' or 'finished'.
+    """
+
+    order = NotImplemented
+
+    def __init__(self, function, t0, y0, t_bound):
+        """
+        Constructs all the necessary attributes for the Integrator object.
+
+        Parameters
+        ----------
+        function : callable
+            The right hand side ``function(time, state)`` of the system.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial state vector.
+        t_bound : float
+            The final time of the integration.
+        """
+        self.function = function
+        self.t0 = float(t0)
+        self.t = float(t0)
+        self.y = np.array(y0, dtype=float)
+        self.n = self.y.size
+        self.t_bound = float(t_bound)
+        self.nfev = 0
+        self.n_steps = 0
+        self.n_rejected = 0
+        self.status = "running" if self.t < self.t_bound else "finished"
+
+        self.t_old = None
+        self.y_old = None
+        self.f_old = None
+        self.f = self.fun(self.t, self.y)
+
+    def fun(self, time, state):
+        """
+        Evaluates the right hand side and counts the evaluation.
+
+        Parameters
+        ----------
+        time : float
+            The time in seconds.
+        state : np.ndarray
+            The state vector.
+
+        Returns
+        -------
+        np.ndarray
+            The derivative of the state vector.
+        """
+        self.nfev += 1
+        return self.function(time, state)
+
+    def step(self):
+        """Advances the integrator by one step."""
+        if self.status == "finished":
+            raise RuntimeError("Attempt to step on a finished integrator")
+
+        t_old, y_old, f_old = self.t, self.y, self.f
+        self._step_impl()
+        self.t_old, self.y_old, self.f_old = t_old, y_old, f_old
+        self.n_steps += 1
+
+        if self.t >= self.t_bound:
+            self.status = "finished"
+
+    def _step_impl(self):
+        """Sets ``t``, ``y`` and ``f`` at the end of the next step."""
+        raise NotImplementedError
+
+    def dense_output(self):
+        """
+        Returns an interpolant over the last step.
+
+        The base class uses a cubic Hermite polynomial through the states and
+        derivatives at both ends of the step.
+
+        Returns
+        -------
+        callable
+            A function of time returning states of shape (n, len(time)).
+        """
+        t_old, h = self.t_old, self.t - self.t_old
+        y_old, y_new = self.y_old, self.y
+        f_old, f_new = self.f_old, self.f
+
+        def interpolant(time):
+            x = (np.asarray(time, dtype=float) - t_old) / h
+            h00 = (1 + 2 * x) * (1 - x) ** 2
+            h10 = x * (1 - x) ** 2
+            h01 = x**2 * (3 - 2 * x)
+            h11 = x**2 * (x - 1)
+            return (
+                np.multiply.outer(y_old, h00)
+                + np.multiply.outer(h * f_old, h10)
+                + np.multiply.outer(y_new, h01)
+                + np.multiply.outer(h * f_new, h11)
+            )
+
+        return interpolant
+
+    def integrate(self, t_eval, record_steps=False, events=()):
+        """
+        Integrates to the end of the output grid.
+
+        Output points that fall on a step boundary are copied straight into
+        the preallocated output array, the rest use ``dense_output``. A
+        terminal event ends the integration and the output grid at the event.
+
+        Parameters
+        ----------
+        t_eval : array-like
+            The sorted output times in seconds.
+        record_steps : bool, optional
+            Keep the time, state and derivative of every accepted step in
+            ``steps`` of the result (default is False).
+        events : tuple, optional
+            Event functions ``event(time, state)`` with the optional
+            ``terminal`` and ``direction`` attributes of scipy's solve_ivp
+            (default is ()).
+
+        Returns
+        -------
+        IntegrationResult
+            The output times and states.
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+        y_eval = np.empty((self.n, t_eval.size))
+
+        locator = EventLocator(events, self.t, self.y) if events else None
+
+        steps = [(self.t, self.y, self.f)] if record_steps else None
+        n_output = fill_output(self, t_eval, y_eval, steps=steps, locator=locator)
+
+        if record_steps:
+            times, states, derivatives = zip(*steps)
+            steps = (np.array(times), np.array(states).T, np.array(derivatives).T)
+
+        return IntegrationResult(
+            t=t_eval[:n_output],
+            y=y_eval[:, :n_output],
+            nfev=self.nfev,
+            n_steps=self.n_steps,
+            n_rejected=self.n_rejected,
+            steps=steps,
+            t_events=None if locator is None else locator.t_events,
+            y_events=None if locator is None else locator.y_events,
+            status=0 if locator is None or locator.terminal is None else 1,
+        )
+
+
+class EventLocator:
+    """
+    A class to locate the zero crossings of event functions.
+
+    After every accepted step the event functions are evaluated at the new
+    state. A sign change within the step, in the direction of the event, is
+    refined to the root with Brent's method on the integrator's dense output,
+    so no extra right hand side evaluations are needed.
+
+    Attributes
+    ----------
+    events : list
+        The event functions.
+    terminal : tuple or None
+        The time and state of the first terminal event, None while none
+        occurred.
+    t_events : list
+        The times of each event, one array per event.
+    y_events : list
+        The states at each event, one array of shape (n_occurrences, n) per
+        event.
+    """
+
+    def __init__(self, events, t, y):
+        """
+        Constructs all the necessary attributes for the EventLocator object.
+
+        Parameters
+        ----------
+        events : list
+            Event functions ``event(time, state)`` with the optional
+            ``terminal`` and ``direction`` attributes of scipy's solve_ivp.
+        t : float
+            The initial time in seconds.
+        y : np.ndarray
+            The initial state vector.
+        """
+        self.events = list(events)
+        self.directions = np.array(
+            [getattr(event, "direction", 0) for event in self.events], dtype=float
+        )
+        self.terminals = np.array(
+            [bool(getattr(event, "terminal", False)) for event in self.events]
+        )
+        self.values = np.array([event(t, y) for event in self.events])
+        self.terminal = None
+        self._t_events = [[] for _ in self.events]
+        self._y_events = [[] for _ in self.events]
+
+    @property
+    def t_events(self):
+        """Returns the times of each event."""
+        return [np.array(times) for times in self._t_events]
+
+    @property
+    def y_events(self):
+        """Returns the states at each event."""
+        return [np.array(states).reshape(len(states), -1) for states in self._y_events]
+
+    def update(self, solver):
+        """
+        Locates the events within the last step of an integrator.
+
+        Parameters
+        ----------
+        solver : Integrator or OdeSolver
+            The integrator, just after an accepted step.
+
+        Returns
+        -------
+        bool
+            True if a terminal event occurred within the step.
+        """
+        values = np.array([event(solver.t, solver.y) for event in self.events])
+
+        up = (self.values <= 0) & (values >= 0)
+        down = (self.values >= 0) & (values <= 0)
+        active = np.flatnonzero(
+            (up & (self.directions > 0))
+            | (down & (self.directions < 0))
+            | ((up | down) & (self.directions == 0))
+        )
+        self.values = values
+
+        if active.size == 0:
+            return False
+
+        interpolant = solver.dense_output()
+        t_old, t_new = solver.t_old, solver.t
+
+        roots = []
+        for index in active:
+            event = self.events[index]
+            root = brentq(
+                lambda time: event(time, interpolant(time)),
+                t_old,
+                t_new,
+                xtol=4 * EPS,
+                rtol=4 * EPS,
+            )
+            roots.append(root)
+
+        order = np.argsort(roots)
+        active = active[order]
+        roots = np.asarray(roots)[order]
+
+        stop = np.flatnonzero(self.terminals[active])
+        if stop.size > 0:
+            active = active[: stop[0] + 1]
+            roots = roots[: stop[0] + 1]
+
+        for index, root in zip(active, roots):
+            state = interpolant(root)
+            self._t_events[index].append(root)
+            self._y_events[index].append(state)
+
+        if stop.size > 0:
+            self.terminal = (roots[-1], interpolant(roots[-1]))
+            return True
+
+        return False
+
+
+def fill_output(solver, t_eval, y_eval, steps=None, locator=None):
+    """
+    Advances an integrator and fills an output array.
+
+    Output points that fall on a step boundary are copied straight into the
+    output array, the rest use ``dense_output``. Works with the in-house
+    integrators and scipy's ``OdeSolver`` classes, and can be called again
+    with later output times to continue the integration. With an event
+    locator the output stops at the first terminal event.
+
+    Parameters
+    ----------
+    solver : Integrator or OdeSolver
+        The integrator, positioned at or before the first output time.
+    t_eval : np.ndarray
+        The sorted output times in seconds.
+    y_eval : np.ndarray
+        The output array, shape (n, len(t_eval)), filled in place.
+    steps : list, optional
+        Appended with the time, state and derivative of every accepted step
+        (default is None).
+    locator : EventLocator, optional
+        Locates the events after every accepted step (default is None).
+
+    Returns
+    -------
+    int
+        The number of filled output points, less than ``len(t_eval)`` after
+        a terminal event.
+    """
+    index = 0
+    while index < t_eval.size:
+        if t_eval[index] == solver.t:
+            y_eval[:, index] = solver.y
+            index += 1
+        elif solver.t_old is not None and t_eval[index] < solver.t:
+            stop = np.searchsorted(t_eval, solver.t, side="left")
+            y_eval[:, index:stop] = solver.dense_output()(t_eval[index:stop])
+            index = stop
+        elif solver.status == "finished":
+            raise ValueError(
+                f"Output time <{t_eval[index]}> is outside the integration span"
+            )
+        else:
+            message = solver.step()
+            if solver.status == "failed":
+                raise RuntimeError(message)
+            if steps is not None:
+                steps.append((solver.t, solver.y, solver.f))
+            if locator is not None and locator.update(solver):
+                stop = np.searchsorted(t_eval, locator.terminal[0], side="right")
+                if stop > index:
+                    y_eval[:, index:stop] = solver.dense_output()(t_eval[index:stop])
+                return stop
+
+    return index
+
+
+def iterate_output(solver, t_eval, chunk):
+    """
+    Advances an integrator and yields the output in chunks.
+
+    Parameters
+    ----------
+    solver : Integrator or OdeSolver
+        The integrator, positioned at or before the first output time.
+    t_eval : array-like
+        The sorted output times in seconds.
+    chunk : int
+        The number of output times per chunk.
+
+    Yields
+    ------
+    np.ndarray
+        The output times of the chunk, shape (chunk,).
+    np.ndarray
+        The output states of the chunk, shape (n, chunk).
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+
+    for start in range(0, t_eval.size, chunk):
+        times = t_eval[start : start + chunk]
+        states = np.empty((solver.n, times.size))
+        fill_output(solver, times, states)
+        yield times, states
@@ -0,0 +1,136 @@
+"""
+adams.py
+
+This module contains the Adams-Bashforth-Moulton multistep integrator.
+
+Classes:
+- AdamsBashforthMoulton: A fixed step Adams predictor-corrector integrator.
+
+Functions:
+- adams_coefficients: Integrates the Lagrange basis over one step.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+
+from python_propagate.propagators import Integrator
+from python_propagate.propagators.runge_kutta import RK8
+
+
+def adams_coefficients(nodes):
+    """
+    Integrates the Lagrange basis polynomials over one step.
+
+    Parameters
+    ----------
+    nodes : array-like
+        The interpolation nodes in units of the step size, relative to the
+        start of the step.
+
+    Returns
+    -------
+    np.ndarray
+        The integral over [0, 1] of the Lagrange basis polynomial of each node.
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    coefficients = np.empty(nodes.size)
+
+    for index, node in enumerate(nodes):
+        others = np.delete(nodes, index)
+        basis = np.polynomial.Polynomial.fromroots(others) / np.prod(node - others)
+        integral = basis.integ()
+        coefficients[index] = integral(1.0) - integral(0.0)
+
+    return coefficients
+
+
+class AdamsBashforthMoulton(Integrator):
+    """
+    A fixed step Adams-Bashforth-Moulton predictor-corrector integrator.
+
+    Each step predicts with the Adams-Bashforth formula, evaluates, corrects
+    with the Adams-Moulton formula and evaluates again (PECE), so a step
+    costs two right hand side evaluations regardless of the order. The
+    derivative history is started with the RK8 integrator on the same step
+    grid, which also takes a final step that is shorter than the others.
+
+    Attributes
+    ----------
+    step_size : float
+        The step size in seconds.
+    predictor : np.ndarray
+        The Adams-Bashforth weights, newest derivative first.
+    corrector : np.ndarray
+        The Adams-Moulton weights, newest derivative first.
+    history : np.ndarray
+        The past derivatives, newest first, shape (order, n).
+    """
+
+    def __init__(self, function, t0, y0, t_bound, step_size, order=8):
+        """
+        Constructs all the necessary attributes for the AdamsBashforthMoulton object.
+
+        Parameters
+        ----------
+        function : callable
+            The right hand side ``function(time, state)`` of the system.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial state vector.
+        t_bound : float
+            The final time of the integration.
+        step_size : float
+            The step size in seconds.
+        order : int, optional
+            The order of the predictor and corrector (default is 8).
+        """
+        if step_size <= 0:
+            raise ValueError(f"Step size <{step_size}> must be positive")
+
+        super().__init__(function, t0, y0, t_bound)
+        self.step_size = float(step_size)
+        self.order = order
+
+        self.predictor = adams_coefficients(-np.arange(order))
+        self.corrector = adams_coefficients(1 - np.arange(order))
+
+        self.history = np.zeros((order, self.n))
+        self.history[0] = self.f
+
+        self.starter = RK8(self.fun, t0, y0, t_bound, step_size)
+
+    def _step_impl(self):
+        t, y = self.t, self.y
+        t_full = self.t0 + (self.n_steps + 1) * self.step_size
+
+        if self.n_steps < self.order - 1 or t_full > self.t_bound:
+            starter = self.starter
+            starter.t, starter.y, starter.f = t, y, self.f
+            starter.n_steps = self.n_steps
+            starter.status = "running"
+            starter.step()
+            t_new, y_new, f_new = starter.t, starter.y, starter.f
+        else:
+            h = t_full - t
+            t_new = t_full
+
+            y_predicted = y + h * np.dot(self.predictor, self.history)
+            f_predicted = self.fun(t_new, y_predicted)
+
+            y_new = (
+                y
+                + h * self.corrector[0] * f_predicted
+                + h * np.dot(self.corrector[1:], self.history[:-1])
+            )
+            f_new = self.fun(t_new, y_new)
+
+        self.history[1:] = self.history[:-1]
+        self.history[0] = f_new
+
+        self.t = t_new
+        self.y = y_new
+        self.f = f_new
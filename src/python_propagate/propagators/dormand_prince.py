@@ -0,0 +1,274 @@
+"""
+dormand_prince.py
+
+This module contains the adaptive Dormand-Prince integrator.
+
+Classes:
+- DOP853: The Dormand-Prince 8(5,3) adaptive integrator with dense output.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+
+from python_propagate.propagators import Integrator
+from python_propagate.propagators import dop853_coefficients as coefficients
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+
+def rms_norm(vector):
+    """Returns the root mean square norm of a vector."""
+    return np.linalg.norm(vector) / np.sqrt(vector.size)
+
+
+class DOP853(Integrator):
+    """
+    The Dormand-Prince 8(5,3) adaptive integrator with dense output.
+
+    The step size is controlled with the combined 5th and 3rd order error
+    estimators of Hairer's DOP853. Output between steps comes from the 7th
+    order dense output polynomial, so output times never force the
+    integrator to stop. The polynomial needs three extra stages and they are
+    only evaluated for steps that contain an output time.
+
+    Attributes
+    ----------
+    rtol : float
+        The relative tolerance.
+    atol : float or np.ndarray
+        The absolute tolerance.
+    n_systems : int
+        The number of independent systems stacked in the state vector.
+    step_size : float
+        The size of the next step in seconds.
+    """
+
+    order = 8
+    error_estimator_order = 7
+    n_stages = coefficients.N_STAGES
+
+    def __init__(
+        self,
+        function,
+        t0,
+        y0,
+        t_bound,
+        rtol=1e-12,
+        atol=1e-12,
+        first_step=None,
+        max_step=np.inf,
+        n_systems=1,
+    ):
+        """
+        Constructs all the necessary attributes for the DOP853 object.
+
+        Parameters
+        ----------
+        function : callable
+            The right hand side ``function(time, state)`` of the system.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial state vector.
+        t_bound : float
+            The final time of the integration.
+        rtol : float, optional
+            The relative tolerance (default is 1e-12).
+        atol : float or array-like, optional
+            The absolute tolerance (default is 1e-12).
+        first_step : float, optional
+            The initial step size, selected automatically if None.
+        max_step : float, optional
+            The maximum step size (default is np.inf).
+        n_systems : int, optional
+            The number of independent systems stacked in the state vector,
+            ordered as a (n / n_systems, n_systems) array (default is 1).
+            The error norm is the largest of the norms of the systems, so
+            every system is held to the tolerances on its own.
+        """
+        super().__init__(function, t0, y0, t_bound)
+        self.rtol = rtol
+        self.atol = np.asarray(atol, dtype=float)
+        self.max_step = max_step
+        self.n_systems = n_systems
+        self.error_exponent = -1 / (self.error_estimator_order + 1)
+
+        self.K_extended = np.empty((coefficients.N_STAGES_EXTENDED, self.n))
+        self.K = self.K_extended[: self.n_stages + 1]
+        self._dense_coefficients = None
+
+        if first_step is None:
+            self.step_size = self.select_initial_step()
+        else:
+            self.step_size = float(first_step)
+
+    def select_initial_step(self):
+        """
+        Selects the initial step size following Hairer's algorithm.
+
+        Returns
+        -------
+        float
+            The initial step size in seconds.
+        """
+        scale = self.atol + np.abs(self.y) * self.rtol
+        d0 = self.norm(self.y / scale)
+        d1 = self.norm(self.f / scale)
+
+        if d0 < 1e-5 or d1 < 1e-5:
+            h0 = 1e-6
+        else:
+            h0 = 0.01 * d0 / d1
+        h0 = min(h0, self.t_bound - self.t)
+
+        f1 = self.fun(self.t + h0, self.y + h0 * self.f)
+        d2 = self.norm((f1 - self.f) / scale) / h0
+
+        if d1 <= 1e-15 and d2 <= 1e-15:
+            h1 = max(1e-6, h0 * 1e-3)
+        else:
+            h1 = (0.01 / max(d1, d2)) ** (1 / (self.error_estimator_order + 1))
+
+        return min(100 * h0, h1, self.max_step)
+
+    def norm(self, vector):
+        """Returns the largest root mean square norm of the systems of a vector."""
+        if self.n_systems == 1:
+            return rms_norm(vector)
+        systems = vector.reshape(-1, self.n_systems)
+        return np.sqrt(np.max(np.mean(systems**2, axis=0)))
+
+    def estimate_error_norm(self, h, scale):
+        """
+        Returns the norm of the local error estimate of the last trial step.
+
+        Parameters
+        ----------
+        h : float
+            The trial step size.
+        scale : np.ndarray
+            The error scale of each component.
+
+        Returns
+        -------
+        float
+            The scaled error norm, a step is accepted when it is below one,
+            the largest of the systems if there are several.
+        """
+        err5 = np.dot(coefficients.E5, self.K) / scale
+        err3 = np.dot(coefficients.E3, self.K) / scale
+
+        if self.n_systems > 1:
+            err5 = err5.reshape(-1, self.n_systems)
+            err3 = err3.reshape(-1, self.n_systems)
+            err5_norm_2 = np.sum(err5**2, axis=0)
+            denominator = err5_norm_2 + 0.01 * np.sum(err3**2, axis=0)
+            denominator[denominator == 0] = 1.0
+            return abs(h) * np.max(err5_norm_2 / np.sqrt(denominator * err5.shape[0]))
+
+        err5_norm_2 = np.dot(err5, err5)
+        err3_norm_2 = np.dot(err3, err3)
+        if err5_norm_2 == 0 and err3_norm_2 == 0:
+            return 0.0
+        denominator = err5_norm_2 + 0.01 * err3_norm_2
+        return abs(h) * err5_norm_2 / np.sqrt(denominator * scale.size)
+
+    def _step_impl(self):
+        t, y = self.t, self.y
+        K = self.K
+        h_abs = min(self.step_size, self.max_step)
+        min_step = 10 * abs(np.nextafter(t, np.inf) - t)
+        step_rejected = False
+
+        while True:
+            if h_abs < min_step:
+                raise RuntimeError(
+                    f"Required step size is less than spacing between numbers at t={t}"
+                )
+
+            t_new = min(t + h_abs, self.t_bound)
+            h = t_new - t
+
+            K[0] = self.f
+            for stage in range(1, self.n_stages):
+                dy = np.dot(coefficients.A[stage, :stage], K[:stage]) * h
+                K[stage] = self.fun(t + coefficients.C[stage] * h, y + dy)
+
+            y_new = y + h * np.dot(coefficients.B, K[: self.n_stages])
+            K[-1] = self.fun(t_new, y_new)
+
+            scale = self.atol + np.maximum(np.abs(y), np.abs(y_new)) * self.rtol
+            error_norm = self.estimate_error_norm(h, scale)
+
+            if error_norm < 1:
+                if error_norm == 0:
+                    factor = MAX_FACTOR
+                else:
+                    factor = min(MAX_FACTOR, SAFETY * error_norm**self.error_exponent)
+                if step_rejected:
+                    factor = min(1.0, factor)
+                break
+
+            h_abs *= max(MIN_FACTOR, SAFETY * error_norm**self.error_exponent)
+            step_rejected = True
+            self.n_rejected += 1
+
+        # A step shortened to end on t_bound keeps the step size it had
+        if t + h_abs > self.t_bound:
+            self.step_size = h_abs
+        else:
+            self.step_size = h_abs * factor
+        self.t = t_new
+        self.y = y_new
+        self.f = K[-1].copy()
+        self._dense_coefficients = None
+
+    def dense_output(self):
+        """
+        Returns the 7th order interpolant over the last step.
+
+        Returns
+        -------
+        callable
+            A function of time returning states of shape (n, len(time)).
+        """
+        if self._dense_coefficients is None:
+            K = self.K_extended
+            h = self.t - self.t_old
+            for index, (a, c) in enumerate(
+                zip(coefficients.A_EXTRA, coefficients.C_EXTRA)
+            ):
+                stage = self.n_stages + 1 + index
+                dy = np.dot(a[:stage], K[:stage]) * h
+                K[stage] = self.fun(self.t_old + c * h, self.y_old + dy)
+
+            F = np.empty((coefficients.INTERPOLATOR_POWER, self.n))
+            delta_y = self.y - self.y_old
+            F[0] = delta_y
+            F[1] = h * self.f_old - delta_y
+            F[2] = 2 * delta_y - h * (self.f + self.f_old)
+            F[3:] = h * np.dot(coefficients.D, K)
+            self._dense_coefficients = F
+
+        t_old, h, y_old = self.t_old, self.t - self.t_old, self.y_old
+        F = self._dense_coefficients
+
+        def interpolant(time):
+            x = (np.asarray(time, dtype=float) - t_old) / h
+            column = (slice(None),) + (np.newaxis,) * x.ndim
+            y = np.zeros((self.n,) + x.shape)
+            for index, f in enumerate(reversed(F)):
+                y += f[column]
+                if index % 2 == 0:
+                    y *= x
+                else:
+                    y *= 1 - x
+            y += y_old[column]
+            return y
+
+        return interpolant
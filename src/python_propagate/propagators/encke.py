@@ -0,0 +1,530 @@
+"""
+encke.py
+
+This module contains the Encke propagator.
+
+Only the deviation of the state from an analytic Keplerian reference orbit
+is integrated, so the step size is set by the perturbations instead of the
+two-body motion. When the deviation grows too large compared to the
+reference the reference is rectified, restarted from the current state with
+a zero deviation.
+
+Classes:
+- KeplerReference: An elliptic Keplerian reference orbit.
+- Rectifier: A class to stop the integration when the reference needs rectifying.
+- Encke: A propagator of the deviation from a Keplerian reference.
+
+Functions:
+- encke_f: Battin's f(q) of the difference of the inverse cubed radii.
+- check_perturbations: Checks the dynamics of an agent split into Keplerian and perturbing parts.
+- perturbing_acceleration: Returns the acceleration of the dynamics other than the Keplerian one.
+- propagate_encke: Propagates an agent's state with Encke's method.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+from functools import partial
+
+import numpy as np
+
+from python_propagate.dynamics.keplerian import Keplerian
+from python_propagate.dynamics.zonal import ZonalGravity
+from python_propagate.propagators import IntegrationResult, fill_output
+from python_propagate.propagators.integrators import build_integrator
+
+# Rectify when the position deviation exceeds this fraction of the radius
+RECTIFY_RATIO = 0.01
+
+
+def encke_f(q):
+    """
+    Battin's f(q) of the difference of the inverse cubed radii.
+
+    Equals (1 + q)**1.5 - 1 without the cancellation for small q.
+
+    Parameters
+    ----------
+    q : float
+        The ratio dot(deviation, deviation - 2 * position) / |position|**2.
+
+    Returns
+    -------
+    float
+        The value of f(q).
+    """
+    return q * (3 + 3 * q + q**2) / (1 + (1 + q) ** 1.5)
+
+
+class KeplerReference:
+    """
+    An elliptic Keplerian reference orbit.
+
+    The state is found with the f and g functions of the change of eccentric
+    anomaly from the epoch, for scalar or array times.
+
+    Attributes
+    ----------
+    mu : float
+        The gravitational parameter of the central body.
+    t0 : float
+        The epoch of the reference in seconds.
+    position : np.ndarray
+        The position at the epoch.
+    velocity : np.ndarray
+        The velocity at the epoch.
+    """
+
+    def __init__(self, mu, t0, state, tolerance=1e-14, max_iter=50):
+        """
+        Constructs all the necessary attributes for the KeplerReference object.
+
+        Parameters
+        ----------
+        mu : float
+            The gravitational parameter of the central body.
+        t0 : float
+            The epoch of the reference in seconds.
+        state : array-like
+            The position and velocity at the epoch.
+        tolerance : float, optional
+            The tolerance on the eccentric anomaly (default is 1e-14).
+        max_iter : int, optional
+            The maximum number of Newton iterations (default is 50).
+        """
+        self.mu = mu
+        self.t0 = float(t0)
+        self.position = np.array(state[0:3], dtype=float)
+        self.velocity = np.array(state[3:6], dtype=float)
+        self.tolerance = tolerance
+        self.max_iter = max_iter
+
+        self.r0 = np.linalg.norm(self.position)
+        alpha = 2 / self.r0 - np.dot(self.velocity, self.velocity) / mu
+        if alpha <= 0:
+            raise ValueError("The Encke reference orbit must be elliptic")
+
+        self.sma = 1 / alpha
+        self.mean_motion = np.sqrt(mu * alpha**3)
+        self.sigma0 = np.dot(self.position, self.velocity) / np.sqrt(mu)
+
+        e_cos = 1 - self.r0 / self.sma
+        e_sin = self.sigma0 / np.sqrt(self.sma)
+        self.ecc = np.hypot(e_cos, e_sin)
+        self.eccentric_anomaly = np.arctan2(e_sin, e_cos)
+        self.mean_anomaly = self.eccentric_anomaly - e_sin
+
+    def __call__(self, time):
+        """
+        Returns the position and velocity of the reference.
+
+        Parameters
+        ----------
+        time : float or np.ndarray
+            The time in seconds.
+
+        Returns
+        -------
+        np.ndarray
+            The position, shape (3,) or (3, N).
+        np.ndarray
+            The velocity, shape (3,) or (3, N).
+        """
+        dt = time - self.t0
+        ecc = self.ecc
+
+        # Solve Kepler's equation in [-pi, pi) and add the whole revolutions
+        mean_anomaly = self.mean_anomaly + self.mean_motion * dt
+        revolutions = np.round(mean_anomaly / (2 * np.pi))
+        mean_anomaly = mean_anomaly - 2 * np.pi * revolutions
+
+        eccentric_anomaly = mean_anomaly + ecc * np.sin(mean_anomaly)
+        for _ in range(self.max_iter):
+            delta = (
+                eccentric_anomaly - ecc * np.sin(eccentric_anomaly) - mean_anomaly
+            ) / (1 - ecc * np.cos(eccentric_anomaly))
+            eccentric_anomaly = eccentric_anomaly - delta
+            if np.all(np.abs(delta) < self.tolerance):
+                break
+        else:
+            raise RuntimeError("Kepler's equation did not converge")
+
+        change = eccentric_anomaly + 2 * np.pi * revolutions - self.eccentric_anomaly
+        sin_change, one_minus_cos = np.sin(change), 1 - np.cos(change)
+
+        sma = self.sma
+        r = (
+            sma
+            - (sma - self.r0) * (1 - one_minus_cos)
+            + self.sigma0 * np.sqrt(sma) * sin_change
+        )
+
+        f = 1 - sma / self.r0 * one_minus_cos
+        g = dt - (change - sin_change) / self.mean_motion
+        f_dot = -np.sqrt(self.mu * sma) * sin_change / (r * self.r0)
+        g_dot = 1 - sma / r * one_minus_cos
+
+        position = np.multiply.outer(self.position, f) + np.multiply.outer(
+            self.velocity, g
+        )
+        velocity = np.multiply.outer(self.position, f_dot) + np.multiply.outer(
+            self.velocity, g_dot
+        )
+
+        return position, velocity
+
+
+class Rectifier:
+    """
+    A class to stop the integration when the reference needs rectifying.
+
+    Used in place of an ``EventLocator`` by ``fill_output``, which ends the
+    output at the step where ``update`` returns True.
+
+    Attributes
+    ----------
+    reference : KeplerReference
+        The reference orbit of the deviation.
+    ratio : float
+        The largest ratio of the position deviation to the reference radius.
+    terminal : tuple or None
+        The time and deviation at the step where the ratio was exceeded.
+    """
+
+    def __init__(self, reference, ratio=RECTIFY_RATIO):
+        """
+        Constructs all the necessary attributes for the Rectifier object.
+
+        Parameters
+        ----------
+        reference : KeplerReference
+            The reference orbit of the deviation.
+        ratio : float, optional
+            The largest ratio of the position deviation to the reference
+            radius (default is RECTIFY_RATIO).
+        """
+        self.reference = reference
+        self.ratio = ratio
+        self.terminal = None
+
+    def update(self, solver):
+        """
+        Checks the deviation after an accepted step.
+
+        Parameters
+        ----------
+        solver : Integrator or OdeSolver
+            The integrator of the deviation, just after an accepted step.
+
+        Returns
+        -------
+        bool
+            True if the reference needs rectifying.
+        """
+        position, _ = self.reference(solver.t)
+        if np.linalg.norm(solver.y[0:3]) > self.ratio * np.linalg.norm(position):
+            self.terminal = (solver.t, solver.y)
+            return True
+        return False
+
+
+class Encke:
+    """
+    A propagator of the deviation from a Keplerian reference.
+
+    The deviation follows Battin's form of Encke's equation,
+
+        d2(deviation)/dt2 = -mu / rho**3 * (deviation + f(q) * r) + a_p,
+
+    with rho the reference and r the perturbed position, which avoids the
+    cancellation of the difference of the two central accelerations.
+
+    Attributes
+    ----------
+    mu : float
+        The gravitational parameter of the central body.
+    perturbation : callable
+        The perturbing acceleration ``perturbation(time, position, velocity)``.
+    build : callable
+        Builds the integrator of the deviation, with the signature of
+        ``build_integrator``.
+    t0 : float
+        The initial time in seconds.
+    y0 : np.ndarray
+        The initial position and velocity.
+    t_bound : float
+        The final time of the integration.
+    tolerance : float
+        The tolerance of the integration.
+    ratio : float
+        The largest ratio of the position deviation to the reference radius
+        before the reference is rectified.
+    n_rectifications : int
+        The number of rectifications of the last integration.
+    """
+
+    def __init__(
+        self,
+        mu,
+        perturbation,
+        build,
+        t0,
+        y0,
+        t_bound,
+        tolerance=1e-12,
+        ratio=RECTIFY_RATIO,
+    ):
+        """
+        Constructs all the necessary attributes for the Encke object.
+
+        Parameters
+        ----------
+        mu : float
+            The gravitational parameter of the central body.
+        perturbation : callable
+            The perturbing acceleration ``perturbation(time, position, velocity)``.
+        build : callable
+            Builds the integrator of the deviation, called as
+            ``build(function, time, initial_state, tolerance=, first_step=, atol=)``.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial position and velocity.
+        t_bound : float
+            The final time of the integration.
+        tolerance : float, optional
+            The tolerance of the integration (default is 1e-12).
+        ratio : float, optional
+            The largest ratio of the position deviation to the reference
+            radius before the reference is rectified (default is
+            RECTIFY_RATIO).
+        """
+        self.mu = mu
+        self.perturbation = perturbation
+        self.build = build
+        self.t0 = float(t0)
+        self.y0 = np.array(y0[0:6], dtype=float)
+        self.t_bound = float(t_bound)
+        self.tolerance = tolerance
+        self.ratio = ratio
+        self.n_rectifications = 0
+        self.reference = None
+
+    def deviation_derivative(self, time, deviation):
+        """
+        Returns the derivative of the deviation from the reference.
+
+        Parameters
+        ----------
+        time : float
+            The time in seconds.
+        deviation : np.ndarray
+            The position and velocity deviation.
+
+        Returns
+        -------
+        np.ndarray
+            The derivative of the deviation.
+        """
+        reference_position, reference_velocity = self.reference(time)
+        position = reference_position + deviation[0:3]
+        velocity = reference_velocity + deviation[3:6]
+
+        q = np.dot(deviation[0:3], deviation[0:3] - 2 * position) / np.dot(
+            position, position
+        )
+        rho = np.linalg.norm(reference_position)
+
+        deviation_dot = np.empty(6)
+        deviation_dot[0:3] = deviation[3:6]
+        deviation_dot[3:6] = -self.mu / rho**3 * (
+            deviation[0:3] + encke_f(q) * position
+        ) + self.perturbation(time, position, velocity)
+
+        return deviation_dot
+
+    def integrate(self, t_eval):
+        """
+        Integrates to the end of the output grid.
+
+        The absolute tolerance of the deviation is scaled by the magnitude of
+        the initial position and velocity, so a tolerance gives about the
+        same error in the state as the Cowell formulation.
+
+        Parameters
+        ----------
+        t_eval : array-like
+            The sorted output times in seconds.
+
+        Returns
+        -------
+        IntegrationResult
+            The output times and states, with the statistics of all
+            integrations between rectifications.
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+        y_eval = np.empty((6, t_eval.size))
+
+        atol = self.tolerance * np.repeat(
+            [np.linalg.norm(self.y0[0:3]), np.linalg.norm(self.y0[3:6])], 3
+        )
+
+        t, state = self.t0, self.y0
+        first_step = None
+        nfev = n_steps = n_rejected = 0
+        self.n_rectifications = -1
+
+        index = 0
+        while index < t_eval.size:
+            self.reference = KeplerReference(self.mu, t, state)
+            self.n_rectifications += 1
+
+            solver = self.build(
+                self.deviation_derivative,
+                [t, self.t_bound],
+                np.zeros(6),
+                tolerance=self.tolerance,
+                first_step=first_step,
+                atol=atol,
+            )
+            rectifier = Rectifier(self.reference, self.ratio)
+
+            stop = index + fill_output(
+                solver, t_eval[index:], y_eval[:, index:], locator=rectifier
+            )
+
+            position, velocity = self.reference(t_eval[index:stop])
+            y_eval[0:3, index:stop] += position
+            y_eval[3:6, index:stop] += velocity
+            index = stop
+
+            nfev += solver.nfev
+            n_steps += getattr(solver, "n_steps", 0)
+            n_rejected += getattr(solver, "n_rejected", 0)
+            first_step = getattr(solver, "step_size", None)
+
+            if rectifier.terminal is not None:
+                t, deviation = rectifier.terminal
+                position, velocity = self.reference(t)
+                state = np.concatenate((position, velocity)) + deviation
+
+        return IntegrationResult(
+            t=t_eval,
+            y=y_eval,
+            nfev=nfev,
+            n_steps=n_steps,
+            n_rejected=n_rejected,
+        )
+
+
+def check_perturbations(agent):
+    """
+    Checks the dynamics of an agent split into Keplerian and perturbing parts.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate.
+
+    Raises
+    ------
+    NotImplementedError
+        If the agent has no Keplerian dynamics or a dynamic does not
+        implement ``accel_into``.
+    """
+    if not any(Keplerian in dynamic.terms for dynamic in agent.dynamics):
+        raise NotImplementedError(
+            f"Formulation <{agent.formulation}> needs the Keplerian dynamics"
+        )
+
+    unsupported = [
+        type(dynamic).__name__ for dynamic in agent.dynamics if not dynamic.flat
+    ]
+    if unsupported:
+        raise NotImplementedError(
+            f"Dynamics <{', '.join(unsupported)}> do not implement accel_into "
+            f"and are not supported for formulation <{agent.formulation}>"
+        )
+
+
+def perturbing_acceleration(dynamics, time, position, velocity):
+    """
+    Returns the acceleration of the dynamics other than the Keplerian one.
+
+    The point mass part of a ``ZonalGravity`` dynamic is left out as well.
+
+    Parameters
+    ----------
+    dynamics : list
+        The dynamics of the agent.
+    time : float
+        The current time in seconds.
+    position : np.ndarray
+        The position vector.
+    velocity : np.ndarray
+        The velocity vector.
+
+    Returns
+    -------
+    np.ndarray
+        The perturbing acceleration.
+    """
+    acceleration = np.zeros(3)
+
+    for dynamic in dynamics:
+        if isinstance(dynamic, ZonalGravity):
+            dynamic.accel_into(position, velocity, time, acceleration, point_mass=False)
+        elif not isinstance(dynamic, Keplerian):
+            dynamic.accel_into(position, velocity, time, acceleration)
+
+    return acceleration
+
+
+def propagate_encke(agent, time, t_eval, tolerance=1e-12):
+    """
+    Propagates an agent's state with Encke's method.
+
+    The dynamics other than the Keplerian one perturb an analytic
+    Keplerian reference orbit, which is rectified when the deviation
+    grows. The number of rectifications is stored in the agent's
+    ``integration_statistics``.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate.
+    time : list
+        The start and end time of the integration in seconds.
+    t_eval : np.ndarray
+        The output times in seconds.
+    tolerance : float, optional
+        The tolerance for the numerical integration (default is 1e-12).
+
+    Returns
+    -------
+    IntegrationResult
+        The output times and states.
+    """
+    check_perturbations(agent)
+
+    propagator = Encke(
+        agent.scenario.central_body.mu,
+        partial(perturbing_acceleration, agent.dynamics),
+        partial(build_integrator, agent.integrator, step_size=agent.dt.total_seconds()),
+        time[0],
+        agent.state.compile(),
+        time[1],
+        tolerance=tolerance,
+    )
+    ode_state = propagator.integrate(t_eval)
+
+    agent.integration_statistics = {
+        "nfev": ode_state.nfev,
+        "n_steps": ode_state.n_steps,
+        "n_rejected": ode_state.n_rejected,
+        "step_size": None,
+        "n_rectifications": propagator.n_rectifications,
+    }
+
+    return ode_state
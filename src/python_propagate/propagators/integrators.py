@@ -0,0 +1,165 @@
+"""
+integrators.py
+
+This module contains the selection of the integrators by name.
+
+Functions:
+- build_integrator: Builds an integrator from its name.
+- error_tolerances: Returns the relative and absolute tolerances of an integration.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+import scipy.integrate as sci_int
+
+from python_propagate.propagators.runge_kutta import RK4, RK8
+from python_propagate.propagators.dormand_prince import DOP853
+from python_propagate.propagators.adams import AdamsBashforthMoulton
+
+# The in-house integrators, any other name is passed to scipy
+INTEGRATORS = ("rk4", "rk8", "dop853", "abm")
+
+
+def build_integrator(
+    name,
+    function,
+    time,
+    initial_state,
+    tolerance=1e-12,
+    first_step=None,
+    atol=None,
+    step_size=None,
+    n_systems=1,
+):
+    """
+    Builds an integrator from its name.
+
+    Parameters
+    ----------
+    name : str
+        The name of the integrator, one of ``INTEGRATORS`` or a scipy
+        ``OdeSolver``.
+    function : callable
+        The right hand side ``function(time, state)`` to integrate.
+    time : list
+        The start and end time of the integration in seconds.
+    initial_state : array-like
+        The initial state vector.
+    tolerance : float, optional
+        The tolerance of the adaptive integrators (default is 1e-12).
+    first_step : float, optional
+        The initial step size of the adaptive integrators, selected
+        automatically if None.
+    atol : float or np.ndarray, optional
+        The absolute tolerance of the adaptive integrators, ``tolerance``
+        if None.
+    step_size : float, optional
+        The step size of the fixed step integrators.
+    n_systems : int, optional
+        The number of independent systems stacked in the state vector, each
+        held to the tolerances on its own by ``DOP853`` (default is 1).
+
+    Returns
+    -------
+    Integrator
+        The integrator, positioned at the start time.
+    """
+    if atol is None:
+        atol = tolerance
+
+    method = name.lower()
+    if method == "rk4":
+        integrator = RK4(function, time[0], initial_state, time[1], step_size=step_size)
+    elif method == "rk8":
+        integrator = RK8(function, time[0], initial_state, time[1], step_size=step_size)
+    elif method == "abm":
+        integrator = AdamsBashforthMoulton(
+            function, time[0], initial_state, time[1], step_size=step_size
+        )
+    elif method == "dop853":
+        integrator = DOP853(
+            function,
+            time[0],
+            initial_state,
+            time[1],
+            rtol=tolerance,
+            atol=atol,
+            first_step=first_step,
+            n_systems=n_systems,
+        )
+    elif isinstance(getattr(sci_int, name, None), type) and issubclass(
+        getattr(sci_int, name), sci_int.OdeSolver
+    ):
+        integrator = getattr(sci_int, name)(
+            function,
+            time[0],
+            initial_state,
+            time[1],
+            rtol=tolerance,
+            atol=atol,
+            first_step=first_step,
+        )
+    else:
+        raise NotImplementedError(
+            f"Integrator <{name}> is not an option or is spelled wrong"
+        )
+
+    return integrator
+
+
+def error_tolerances(tolerance, atol=None, control_stm=True, stm=False):
+    """
+    Returns the relative and absolute tolerances of an integration.
+
+    The STM entries that are left out of the error control get an
+    infinite absolute tolerance, which removes them from the error norm.
+    The integrators take the root mean square of the scaled errors over
+    all components, so the tolerances are divided by sqrt(42 / 6) to
+    keep the error norm, and the steps, of the state alone.
+
+    Parameters
+    ----------
+    tolerance : float
+        The relative tolerance, also the absolute tolerance if ``atol``
+        is None.
+    atol : float or array-like, optional
+        The absolute tolerance, a scalar, 6 entries for the position and
+        velocity or one entry per component of the state vector
+        (default is None). The STM entries take ``tolerance`` when only
+        6 entries are given.
+    control_stm : bool, optional
+        Include the STM in the error control (default is True).
+    stm : bool, optional
+        The state vector has the STM appended (default is False).
+
+    Returns
+    -------
+    float
+        The relative tolerance.
+    float or np.ndarray
+        The absolute tolerance, one entry per component of the state
+        vector unless it is a scalar.
+    """
+    if atol is None:
+        atol = tolerance
+
+    if not stm:
+        return tolerance, atol
+
+    atol = np.asarray(atol, dtype=float)
+    if atol.size == 6:
+        atol = np.concatenate((atol, np.full(36, tolerance)))
+    elif atol.size == 42 or not control_stm:
+        atol = np.broadcast_to(atol, (42,)).copy()
+
+    if control_stm:
+        return tolerance, atol
+
+    atol[6:] = np.inf
+    factor = np.sqrt(6 / 42)
+    atol[0:6] *= factor
+
+    return tolerance * factor, atol
@@ -0,0 +1,319 @@
+"""
+kepler.py
+
+This module contains the analytic two-body propagator.
+
+The universal Kepler equation is solved for every output time at once, so a
+pure two-body propagation costs a handful of array operations instead of a
+numerical integration. Elliptic, parabolic and hyperbolic orbits are handled
+by the same equations.
+
+Classes:
+- UniversalKepler: An analytic two-body propagator with the interface of the integrators.
+
+Functions:
+- stumpff: Evaluates the Stumpff functions c2 to c5.
+- universal_anomaly: Solves the universal Kepler equation.
+- kepler_propagate: Propagates a two-body state and its STM analytically.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+
+from python_propagate.propagators import IntegrationResult
+
+# Below this magnitude of z the Stumpff functions use their series
+SERIES_LIMIT = 1.0
+SERIES_TERMS = 12
+
+
+def stumpff(z):
+    """
+    Evaluates the Stumpff functions c2 to c5.
+
+    Parameters
+    ----------
+    z : np.ndarray
+        The argument, alpha * chi**2.
+
+    Returns
+    -------
+    tuple
+        The values of c2, c3, c4 and c5, each shaped like ``z``.
+    """
+    z = np.asarray(z, dtype=float)
+    series = np.abs(z) < SERIES_LIMIT
+
+    c2, c3, c4, c5 = (np.zeros_like(z) for _ in range(4))
+
+    # Series, converging quickly for small |z|
+    zs = z[series]
+    for k, c in zip(range(2, 6), (c2, c3, c4, c5)):
+        term = np.full_like(zs, 1.0 / np.prod(np.arange(1, k + 1)))
+        total = term.copy()
+        for j in range(1, SERIES_TERMS):
+            term = -term * zs / ((k + 2 * j - 1) * (k + 2 * j))
+            total += term
+        c[series] = total
+
+    elliptic = ~series & (z > 0)
+    root = np.sqrt(z[elliptic])
+    c2[elliptic] = (1 - np.cos(root)) / z[elliptic]
+    c3[elliptic] = (root - np.sin(root)) / root**3
+
+    hyperbolic = ~series & (z < 0)
+    root = np.sqrt(-z[hyperbolic])
+    c2[hyperbolic] = (1 - np.cosh(root)) / z[hyperbolic]
+    c3[hyperbolic] = (np.sinh(root) - root) / root**3
+
+    closed = ~series
+    c4[closed] = (0.5 - c2[closed]) / z[closed]
+    c5[closed] = (1.0 / 6.0 - c3[closed]) / z[closed]
+
+    return c2, c3, c4, c5
+
+
+def universal_functions(chi, alpha):
+    """Returns the universal functions U0 to U5 of chi."""
+    z = alpha * chi**2
+    c2, c3, c4, c5 = stumpff(z)
+
+    u2 = chi**2 * c2
+    u3 = chi**3 * c3
+    u0 = 1 - alpha * u2
+    u1 = chi - alpha * u3
+
+    return u0, u1, u2, u3, chi**4 * c4, chi**5 * c5
+
+
+def universal_anomaly(r0, sigma0, alpha, times, mu, tolerance=1e-13, max_iter=50):
+    """
+    Solves the universal Kepler equation.
+
+    Uses the Laguerre-Conway iteration, which converges for any time of
+    flight on elliptic orbits, on all output times at once.
+
+    Parameters
+    ----------
+    r0 : float
+        The initial radius.
+    sigma0 : float
+        The initial radial velocity term, dot(r0, v0) / sqrt(mu).
+    alpha : float
+        The reciprocal of the semi-major axis.
+    times : np.ndarray
+        The times of flight in seconds.
+    mu : float
+        The gravitational parameter of the central body.
+    tolerance : float, optional
+        The relative tolerance on the time of flight (default is 1e-13).
+    max_iter : int, optional
+        The maximum number of iterations (default is 50).
+
+    Returns
+    -------
+    np.ndarray
+        The universal anomaly of each time.
+    """
+    sqrt_mu = np.sqrt(mu)
+    times = np.asarray(times, dtype=float)
+    target = sqrt_mu * times
+
+    if alpha > 0:
+        chi = sqrt_mu * alpha * times
+    else:
+        chi = np.sign(times) * np.sqrt(np.abs(times) * sqrt_mu / max(r0, 1.0))
+
+    n = 5.0
+    for _ in range(max_iter):
+        u0, u1, u2, u3, _, _ = universal_functions(chi, alpha)
+
+        function = r0 * u1 + sigma0 * u2 + u3 - target
+        derivative = r0 * u0 + sigma0 * u1 + u2
+        second = sigma0 * u0 + (1 - alpha * r0) * u1
+
+        root = np.sqrt(
+            np.abs((n - 1) ** 2 * derivative**2 - n * (n - 1) * function * second)
+        )
+        delta = n * function / (derivative + np.sign(derivative) * root)
+        chi = chi - delta
+
+        if np.all(np.abs(function) <= tolerance * np.maximum(np.abs(target), r0)):
+            break
+    else:
+        raise RuntimeError("The universal Kepler equation did not converge")
+
+    return chi
+
+
+def kepler_propagate(state, times, mu, stm=False):
+    """
+    Propagates a two-body state and its STM analytically.
+
+    The STM follows the closed form of Battin (An Introduction to the
+    Mathematics and Methods of Astrodynamics, section 9.7) in terms of the
+    universal functions.
+
+    Parameters
+    ----------
+    state : array-like
+        The initial position and velocity, shape (6,).
+    times : array-like
+        The times of flight in seconds, shape (N,).
+    mu : float
+        The gravitational parameter of the central body.
+    stm : bool, optional
+        Also return the state transition matrices (default is False).
+
+    Returns
+    -------
+    np.ndarray
+        The positions and velocities, shape (6, N).
+    np.ndarray
+        The state transition matrices, shape (N, 6, 6), only if ``stm``.
+    """
+    state = np.asarray(state, dtype=float)
+    times = np.asarray(times, dtype=float)
+    sqrt_mu = np.sqrt(mu)
+
+    r0_vec, v0_vec = state[0:3], state[3:6]
+    r0 = np.linalg.norm(r0_vec)
+    sigma0 = np.dot(r0_vec, v0_vec) / sqrt_mu
+    alpha = 2 / r0 - np.dot(v0_vec, v0_vec) / mu
+
+    chi = universal_anomaly(r0, sigma0, alpha, times, mu)
+    u0, u1, u2, u3, u4, u5 = universal_functions(chi, alpha)
+
+    r = r0 * u0 + sigma0 * u1 + u2
+
+    f = 1 - u2 / r0
+    g = times - u3 / sqrt_mu
+    f_dot = -sqrt_mu * u1 / (r * r0)
+    g_dot = 1 - u2 / r
+
+    position = np.outer(f, r0_vec) + np.outer(g, v0_vec)
+    velocity = np.outer(f_dot, r0_vec) + np.outer(g_dot, v0_vec)
+    states = np.concatenate((position, velocity), axis=1).T
+
+    if not stm:
+        return states
+
+    # Battin's C, the secular part of the STM
+    c = (3 * u5 - chi * u4 - sqrt_mu * times * u2) / sqrt_mu
+
+    dr = position - r0_vec
+    dv = velocity - v0_vec
+    eye = np.eye(3)
+
+    def outer(a, b):
+        return np.einsum("ni,nj->nij", a, b)
+
+    def scale(values):
+        return values[:, np.newaxis, np.newaxis]
+
+    r0_n = np.broadcast_to(r0_vec, position.shape)
+    v0_n = np.broadcast_to(v0_vec, position.shape)
+
+    rr = (
+        scale(r / mu) * outer(dv, dv)
+        + scale(r0 * (1 - f) / r0**3) * outer(position, r0_n)
+        + scale(c / r0**3) * outer(velocity, r0_n)
+        + scale(f) * eye
+    )
+    rv = (
+        scale(r0 * (1 - f) / mu) * (outer(dr, v0_n) - outer(dv, r0_n))
+        + scale(c / mu) * outer(velocity, v0_n)
+        + scale(g) * eye
+    )
+    vr = (
+        -outer(dv, r0_n) / r0**2
+        - scale(1 / r**2) * outer(position, dv)
+        - scale(mu * c / (r**3 * r0**3)) * outer(position, r0_n)
+        + scale(f_dot)
+        * (
+            eye
+            - scale(1 / r**2) * outer(position, position)
+            + scale(1 / (mu * r))
+            * np.einsum(
+                "nij,njk->nik",
+                outer(position, velocity) - outer(velocity, position),
+                outer(position, dv),
+            )
+        )
+    )
+    vv = (
+        r0 / mu * outer(dv, dv)
+        + scale(r0 * (1 - f) / r**3) * outer(position, r0_n)
+        - scale(c / r**3) * outer(position, v0_n)
+        + scale(g_dot) * eye
+    )
+
+    stms = np.concatenate(
+        (np.concatenate((rr, rv), axis=2), np.concatenate((vr, vv), axis=2)), axis=1
+    )
+
+    return states, stms
+
+
+class UniversalKepler:
+    """
+    An analytic two-body propagator with the interface of the integrators.
+
+    Attributes
+    ----------
+    mu : float
+        The gravitational parameter of the central body.
+    t0 : float
+        The initial time in seconds.
+    y0 : np.ndarray
+        The initial state vector, 6 entries or 42 with the STM appended row
+        major.
+    """
+
+    def __init__(self, mu, t0, y0):
+        """
+        Constructs all the necessary attributes for the UniversalKepler object.
+
+        Parameters
+        ----------
+        mu : float
+            The gravitational parameter of the central body.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial state vector, with the STM appended row major if it
+            should be propagated.
+        """
+        self.mu = mu
+        self.t0 = float(t0)
+        self.y0 = np.array(y0, dtype=float)
+
+    def integrate(self, t_eval):
+        """
+        Evaluates the two-body solution on the output grid.
+
+        Parameters
+        ----------
+        t_eval : array-like
+            The output times in seconds.
+
+        Returns
+        -------
+        IntegrationResult
+            The output times and states, with the STM rows chained onto the
+            initial STM if one was given.
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+        times = t_eval - self.t0
+
+        if self.y0.size == 6:
+            y = kepler_propagate(self.y0, times, self.mu)
+        else:
+            states, stms = kepler_propagate(self.y0[0:6], times, self.mu, stm=True)
+            stms = stms @ self.y0[6:].reshape(6, 6)
+            y = np.concatenate((states, stms.reshape(-1, 36).T))
+
+        return IntegrationResult(t=t_eval, y=y, nfev=0, n_steps=0)
@@ -0,0 +1,460 @@
+"""
+mean_elements.py
+
+This module contains the semi-analytic mean element propagator.
+
+The J2, J3 and drag models are averaged over one orbit into rates of the
+mean elements, which vary slowly and are integrated with steps of hours
+instead of seconds. The osculating states on the output grid are recovered
+by adding the J2 short periodic terms to the mean elements.
+
+The mean elements are held in a form that is regular for circular orbits,
+semi-major axis, e cos(arg), e sin(arg), inclination, right ascension of the
+ascending node and mean argument of latitude (mean anomaly plus argument of
+periapsis).
+
+Classes:
+- MeanElementPropagator: A semi-analytic propagator of the mean elements.
+
+Functions:
+- zonal_rates: Returns the averaged J2 and J3 rates of the mean elements.
+- drag_rates: Returns the orbit averaged drag rates of the mean elements.
+- j3_short_period_sma: Returns the J3 short periodic term of the semi-major axis.
+- propagate_mean_elements: Propagates an agent's mean elements semi-analytically.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+
+from python_propagate.dynamics.keplerian import Keplerian
+from python_propagate.dynamics.j2 import J2
+from python_propagate.dynamics.j3 import J3
+from python_propagate.dynamics.drag import Drag
+from python_propagate.propagators import IntegrationResult
+from python_propagate.propagators.dormand_prince import DOP853
+from python_propagate.utilities.transforms import (
+    cart2elements,
+    elements2cart,
+    mean2osculating,
+    osculating2mean,
+)
+
+# Number of eccentric anomaly nodes of the drag average
+DRAG_NODES = 32
+
+
+def to_classical(elements):
+    """Converts regular mean elements to classical elements."""
+    sma, ex, ey, inc, raan, latitude = elements
+    arg = np.arctan2(ey, ex)
+    return sma, np.hypot(ex, ey), inc, arg, raan, latitude - arg
+
+
+def zonal_rates(elements, mu, radius, j2, j3):
+    """
+    Returns the averaged J2 and J3 rates of the mean elements.
+
+    J2 gives the first order secular rates, J3 the long periodic rates of
+    Lagrange's planetary equations with the orbit averaged J3 potential.
+    The J3 rates of the inclination and node are singular for equatorial
+    orbits.
+
+    Parameters
+    ----------
+    elements : np.ndarray
+        The regular mean elements.
+    mu : float
+        The gravitational parameter of the central body.
+    radius : float
+        The radius of the central body.
+    j2 : float
+        The second zonal harmonic coefficient, 0 to leave J2 out.
+    j3 : float
+        The third zonal harmonic coefficient, 0 to leave J3 out.
+
+    Returns
+    -------
+    np.ndarray
+        The rates of the regular mean elements, with the Keplerian mean motion.
+    """
+    sma, ex, ey, inc, _, _ = elements
+    ecc2 = ex**2 + ey**2
+    eta = np.sqrt(1 - ecc2)
+    n = np.sqrt(mu / sma**3)
+    sin_i, cos_i = np.sin(inc), np.cos(inc)
+
+    rates = np.zeros(6)
+    rates[5] = n
+
+    if j2:
+        k = j2 * (radius / (sma * eta**2)) ** 2
+        arg_dot = 0.75 * n * k * (5 * cos_i**2 - 1)
+        rates[1] -= ey * arg_dot
+        rates[2] += ex * arg_dot
+        rates[4] -= 1.5 * n * k * cos_i
+        rates[5] += 0.75 * n * k * eta * (3 * cos_i**2 - 1) + arg_dot
+
+    if j3:
+        # The averaged potential is K e sin(arg)
+        na2 = n * sma**2
+        k0 = 1.5 * mu * j3 * radius**3 / sma**4 / eta**5
+        k_over_sin = k0 * (1 - 1.25 * sin_i**2)
+        k = k_over_sin * sin_i
+        dk_di = k0 * cos_i * (1 - 3.75 * sin_i**2)
+
+        a = eta * k / na2
+        c = cos_i * dk_di / (na2 * eta * sin_i)
+
+        rates[1] += -a - (5 * a / eta**2 - c) * ey**2
+        rates[2] += (5 * a / eta**2 - c) * ex * ey
+        rates[3] += cos_i * k_over_sin * ex / (na2 * eta)
+        rates[4] += ey * dk_di / (na2 * eta * sin_i)
+        rates[5] += k * ey / na2 * (8 + (1 + 4 * ecc2) / (eta * (1 + eta))) - c * ey
+
+    return rates
+
+
+def drag_rates(elements, time, mu, drag, radius=None, j2=0.0):
+    """
+    Returns the orbit averaged drag rates of the mean elements.
+
+    The drag acceleration of the dynamic is evaluated at equally spaced
+    eccentric anomalies of the mean orbit, with the J2 short periodic terms
+    added so the altitude the density is taken at is osculating, and the
+    Gauss equations of the semi-major axis and eccentricity vector are
+    averaged over the mean anomaly. The small out of plane effect of the
+    rotating atmosphere is left out.
+
+    Parameters
+    ----------
+    elements : np.ndarray
+        The regular mean elements.
+    time : float
+        The time in seconds.
+    mu : float
+        The gravitational parameter of the central body.
+    drag : Drag
+        The drag dynamic of the agent.
+    radius : float, optional
+        The radius of the central body, needed with ``j2`` (default is None).
+    j2 : float, optional
+        The second zonal harmonic coefficient of the short periodic terms,
+        0 to evaluate the drag on the mean orbit (default is 0.0).
+
+    Returns
+    -------
+    np.ndarray
+        The rates of the regular mean elements.
+    """
+    sma, ecc, inc, arg, raan, _ = to_classical(elements)
+
+    eccentric_anomaly = 2 * np.pi * np.arange(DRAG_NODES) / DRAG_NODES
+    weights = (1 - ecc * np.cos(eccentric_anomaly)) / DRAG_NODES
+    mean_anomaly = eccentric_anomaly - ecc * np.sin(eccentric_anomaly)
+
+    nodes = np.broadcast_arrays(sma, ecc, inc, arg, raan, mean_anomaly)
+    if j2:
+        nodes = mean2osculating(*nodes, radius, j2)
+
+    state = elements2cart(*nodes, mu)
+    position, velocity = state[0:3], state[3:6]
+
+    acceleration = np.zeros_like(position)
+    drag.accel_into(position, velocity, time, acceleration)
+
+    power = np.sum(velocity * acceleration, axis=0)
+    momentum = np.cross(position, velocity, axis=0)
+    ecc_dot = (
+        np.cross(acceleration, momentum, axis=0)
+        + np.cross(velocity, np.cross(position, acceleration, axis=0), axis=0)
+    ) / mu
+    ecc_dot = ecc_dot @ weights
+
+    node = np.array([np.cos(raan), np.sin(raan), 0.0])
+    ahead = np.array(
+        [-np.cos(inc) * np.sin(raan), np.cos(inc) * np.cos(raan), np.sin(inc)]
+    )
+
+    rates = np.zeros(6)
+    rates[0] = 2 * sma**2 / mu * (power @ weights)
+    rates[1] = ecc_dot @ node
+    rates[2] = ecc_dot @ ahead
+
+    return rates
+
+
+def j3_short_period_sma(elements, mu, radius, j3):
+    """
+    Returns the J3 short periodic term of the semi-major axis.
+
+    The first order term 2 a**2 / mu (R - <R>) of the J3 disturbing
+    potential R. Left uncorrected, it biases the mean semi-major axis and
+    with it the mean motion.
+
+    Parameters
+    ----------
+    elements : tuple
+        The classical orbital elements, angles in radians.
+    mu : float
+        The gravitational parameter of the central body.
+    radius : float
+        The radius of the central body.
+    j3 : float
+        The third zonal harmonic coefficient.
+
+    Returns
+    -------
+    np.ndarray
+        The osculating minus the mean semi-major axis.
+    """
+    sma, ecc, inc, arg, _, _ = elements
+    state = elements2cart(*elements, mu)
+
+    r = np.sqrt(np.sum(state[0:3] ** 2, axis=0))
+    sin_latitude = state[2] / r
+
+    potential = (
+        -mu * j3 * radius**3 / r**4 * (5 * sin_latitude**3 - 3 * sin_latitude) / 2
+    )
+    average = (
+        1.5
+        * mu
+        * j3
+        * radius**3
+        / sma**4
+        * ecc
+        * np.sin(inc)
+        * (1 - 1.25 * np.sin(inc) ** 2)
+        * np.sin(arg)
+        / (1 - ecc**2) ** 2.5
+    )
+
+    return 2 * sma**2 / mu * (potential - average)
+
+
+class MeanElementPropagator:
+    """
+    A semi-analytic propagator of the mean elements.
+
+    Attributes
+    ----------
+    central_body : Planet
+        The central body.
+    j2 : bool
+        Include the J2 secular rates and short periodic terms.
+    j3 : bool
+        Include the J3 long periodic rates.
+    drag : Drag or None
+        The drag dynamic averaged into the rates.
+    tolerance : float
+        The tolerance of the integration of the mean elements.
+    mean_elements : np.ndarray or None
+        The classical mean elements on the output grid after ``integrate``,
+        shape (6, n_points), angles in radians.
+    """
+
+    def __init__(
+        self, central_body, t0, y0, j2=True, j3=False, drag=None, tolerance=1e-10
+    ):
+        """
+        Constructs all the necessary attributes for the MeanElementPropagator object.
+
+        Parameters
+        ----------
+        central_body : Planet
+            The central body.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial osculating cartesian state.
+        j2 : bool, optional
+            Include the J2 secular rates and short periodic terms (default is True).
+        j3 : bool, optional
+            Include the J3 long periodic rates (default is False).
+        drag : Drag, optional
+            The drag dynamic averaged into the rates (default is None).
+        tolerance : float, optional
+            The tolerance of the integration of the mean elements (default
+            is 1e-10).
+        """
+        self.central_body = central_body
+        self.t0 = float(t0)
+        self.j2 = j2
+        self.j3 = j3
+        self.drag = drag
+        self.tolerance = tolerance
+        self.mean_elements = None
+
+        osculating = cart2elements(np.asarray(y0, dtype=float)[0:6], central_body.mu)
+
+        elements = osculating
+        if j2:
+            elements = osculating2mean(
+                *osculating, central_body.radius, central_body.j2
+            )
+        sma, ecc, inc, arg, raan, mean_anomaly = elements
+
+        if j3:
+            sma = sma - j3_short_period_sma(
+                osculating, central_body.mu, central_body.radius, central_body.j3
+            )
+
+        self.y0 = np.array(
+            [
+                sma,
+                ecc * np.cos(arg),
+                ecc * np.sin(arg),
+                inc,
+                raan,
+                mean_anomaly + arg,
+            ]
+        )
+
+    def rates(self, time, elements):
+        """
+        Returns the rates of the regular mean elements.
+
+        Parameters
+        ----------
+        time : float
+            The time in seconds.
+        elements : np.ndarray
+            The regular mean elements.
+
+        Returns
+        -------
+        np.ndarray
+            The rates of the regular mean elements.
+        """
+        rates = zonal_rates(
+            elements,
+            self.central_body.mu,
+            self.central_body.radius,
+            self.central_body.j2 if self.j2 else 0.0,
+            self.central_body.j3 if self.j3 else 0.0,
+        )
+
+        if self.drag is not None:
+            rates += drag_rates(
+                elements,
+                time,
+                self.central_body.mu,
+                self.drag,
+                self.central_body.radius,
+                self.central_body.j2 if self.j2 else 0.0,
+            )
+
+        return rates
+
+    def integrate(self, t_eval):
+        """
+        Integrates the mean elements and returns the osculating states.
+
+        Parameters
+        ----------
+        t_eval : array-like
+            The sorted output times in seconds.
+
+        Returns
+        -------
+        IntegrationResult
+            The output times and osculating cartesian states.
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+
+        integrator = DOP853(
+            self.rates,
+            self.t0,
+            self.y0,
+            t_eval[-1],
+            rtol=self.tolerance,
+            atol=self.tolerance,
+        )
+        result = integrator.integrate(t_eval)
+
+        elements = to_classical(result.y)
+        self.mean_elements = np.array(elements)
+        self.mean_elements[3:] %= 2 * np.pi
+
+        mean_elements = elements
+        if self.j2:
+            elements = mean2osculating(
+                *mean_elements, self.central_body.radius, self.central_body.j2
+            )
+        if self.j3:
+            sma = elements[0] + j3_short_period_sma(
+                mean_elements,
+                self.central_body.mu,
+                self.central_body.radius,
+                self.central_body.j3,
+            )
+            elements = (sma,) + tuple(elements[1:])
+
+        return IntegrationResult(
+            t=t_eval,
+            y=elements2cart(*elements, self.central_body.mu),
+            nfev=result.nfev,
+            n_steps=result.n_steps,
+            n_rejected=result.n_rejected,
+        )
+
+
+def propagate_mean_elements(agent, time, t_eval, tolerance=1e-12):
+    """
+    Propagates an agent's mean elements semi-analytically.
+
+    The J2, J3 and drag dynamics of the agent are averaged into rates of
+    the mean elements, the classical mean elements on the output grid
+    are stored in the agent's ``mean_elements``.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate.
+    time : list
+        The start and end time of the integration in seconds.
+    t_eval : np.ndarray
+        The output times in seconds.
+    tolerance : float, optional
+        The tolerance of the integration of the mean elements (default
+        is 1e-12).
+
+    Returns
+    -------
+    IntegrationResult
+        The output times and osculating states.
+    """
+    types = [term for dynamic in agent.dynamics for term in dynamic.terms]
+
+    unsupported = [
+        dynamic.__name__ for dynamic in types if dynamic not in (Keplerian, J2, J3, Drag)
+    ]
+    if unsupported or Keplerian not in types:
+        raise NotImplementedError(
+            f"Dynamics <{', '.join(unsupported)}> are not supported for mean "
+            "elements, which also need the Keplerian dynamics"
+        )
+
+    propagator = MeanElementPropagator(
+        agent.scenario.central_body,
+        time[0],
+        agent.state.compile(),
+        j2=J2 in types,
+        j3=J3 in types,
+        drag=next((d for d in agent.dynamics if isinstance(d, Drag)), None),
+        tolerance=tolerance,
+    )
+    ode_state = propagator.integrate(t_eval)
+
+    agent.mean_elements = propagator.mean_elements
+    agent.integration_statistics = {
+        "nfev": ode_state.nfev,
+        "n_steps": ode_state.n_steps,
+        "n_rejected": ode_state.n_rejected,
+        "step_size": None,
+    }
+
+    return ode_state
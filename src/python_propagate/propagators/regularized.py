@@ -0,0 +1,371 @@
+"""
+regularized.py
+
+This module contains the Kustaanheimo-Stiefel regularized propagator.
+
+The position is replaced by the KS coordinates u, four numbers with
+x = L(u) u, and time by the fictitious time s of the Sundman transformation
+dt = |r| ds. Unperturbed Keplerian motion becomes a harmonic oscillator in
+s, so the step size no longer collapses at the periapsis of eccentric
+orbits. The Keplerian energy and a time element are integrated alongside
+the KS coordinates and their derivatives.
+
+Classes:
+- KustaanheimoStiefel: A propagator of the KS regularized equations of motion.
+
+Functions:
+- ks_matrix: Returns the KS matrix L(u).
+- cart2ks: Converts a cartesian state to KS coordinates.
+- ks2cart: Converts KS coordinates to a cartesian state.
+- physical_time: Returns the physical time of KS states.
+- propagate_regularized: Propagates an agent's state in Kustaanheimo-Stiefel coordinates.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+from functools import partial
+
+import numpy as np
+from scipy.optimize import brentq
+
+from python_propagate.propagators import EPS, IntegrationResult
+from python_propagate.propagators.encke import (
+    check_perturbations,
+    perturbing_acceleration,
+)
+from python_propagate.propagators.integrators import build_integrator
+
+
+def ks_matrix(u):
+    """
+    Returns the KS matrix L(u).
+
+    Parameters
+    ----------
+    u : np.ndarray
+        The KS coordinates, shape (4,).
+
+    Returns
+    -------
+    np.ndarray
+        The KS matrix, shape (4, 4).
+    """
+    u1, u2, u3, u4 = u
+    return np.array(
+        [
+            [u1, -u2, -u3, u4],
+            [u2, u1, -u4, -u3],
+            [u3, u4, u1, u2],
+            [u4, -u3, u2, -u1],
+        ]
+    )
+
+
+def cart2ks(state, mu):
+    """
+    Converts a cartesian state to KS coordinates.
+
+    Parameters
+    ----------
+    state : array-like
+        The position and velocity.
+    mu : float
+        The gravitational parameter of the central body.
+
+    Returns
+    -------
+    np.ndarray
+        The KS coordinates u, their derivatives with respect to the
+        fictitious time and the Keplerian energy, shape (9,).
+    """
+    x1, x2, x3 = state[0:3]
+    r = np.linalg.norm(state[0:3])
+
+    # Pick the branch away from the singularity of the division
+    if x1 >= 0:
+        u1 = np.sqrt((r + x1) / 2)
+        u = np.array([u1, x2 / (2 * u1), x3 / (2 * u1), 0.0])
+    else:
+        u2 = np.sqrt((r - x1) / 2)
+        u = np.array([x2 / (2 * u2), u2, 0.0, x3 / (2 * u2)])
+
+    velocity = np.append(state[3:6], 0.0)
+    u_prime = ks_matrix(u).T @ velocity / 2
+    energy = np.dot(state[3:6], state[3:6]) / 2 - mu / r
+
+    return np.concatenate((u, u_prime, [energy]))
+
+
+def ks2cart(u, u_prime):
+    """
+    Converts KS coordinates to a cartesian state.
+
+    Parameters
+    ----------
+    u : np.ndarray
+        The KS coordinates, shape (4,) or (4, N).
+    u_prime : np.ndarray
+        The derivatives of the KS coordinates with respect to the
+        fictitious time, shape (4,) or (4, N).
+
+    Returns
+    -------
+    np.ndarray
+        The position and velocity, shape (6,) or (6, N).
+    """
+    u1, u2, u3, u4 = u
+    p1, p2, p3, p4 = u_prime
+    r = u1**2 + u2**2 + u3**2 + u4**2
+
+    return np.array(
+        [
+            u1**2 - u2**2 - u3**2 + u4**2,
+            2 * (u1 * u2 - u3 * u4),
+            2 * (u1 * u3 + u2 * u4),
+            2 / r * (u1 * p1 - u2 * p2 - u3 * p3 + u4 * p4),
+            2 / r * (u2 * p1 + u1 * p2 - u4 * p3 - u3 * p4),
+            2 / r * (u3 * p1 + u4 * p2 + u1 * p3 + u2 * p4),
+        ]
+    )
+
+
+def physical_time(state):
+    """
+    Returns the physical time of KS states.
+
+    Parameters
+    ----------
+    state : np.ndarray
+        The KS states, u, u', E and the time element, shape (10,) or (10, N).
+
+    Returns
+    -------
+    float or np.ndarray
+        The time in seconds.
+    """
+    return state[9] + np.sum(state[0:4] * state[4:8], axis=0) / state[8]
+
+
+class KustaanheimoStiefel:
+    """
+    A propagator of the KS regularized equations of motion.
+
+    With the Keplerian energy E and the perturbing acceleration P,
+
+        u'' = E / 2 * u + |r| / 2 * L(u)^T P,
+        E' = 2 u' . L(u)^T P,
+
+    where the primes are derivatives with respect to the fictitious time.
+    The physical time is carried by the Stiefel-Scheifele time element
+    tau = t - u . u' / E, which grows linearly in unperturbed motion and is
+    integrated without truncation error there.
+    The output on the physical time grid is found by solving t(s) = t_eval
+    on the dense output of the integrator.
+
+    Attributes
+    ----------
+    mu : float
+        The gravitational parameter of the central body.
+    perturbation : callable
+        The perturbing acceleration ``perturbation(time, position, velocity)``.
+    build : callable
+        Builds the integrator in the fictitious time, with the signature of
+        ``build_integrator``.
+    t0 : float
+        The initial time in seconds.
+    y0 : np.ndarray
+        The initial KS state, u, u', E and tau.
+    tolerance : float
+        The tolerance of the integration.
+    step_size : float or None
+        The step in fictitious time of the fixed step integrators.
+    """
+
+    def __init__(
+        self, mu, perturbation, build, t0, y0, tolerance=1e-12, time_step=None
+    ):
+        """
+        Constructs all the necessary attributes for the KustaanheimoStiefel object.
+
+        Parameters
+        ----------
+        mu : float
+            The gravitational parameter of the central body.
+        perturbation : callable
+            The perturbing acceleration ``perturbation(time, position, velocity)``.
+        build : callable
+            Builds the integrator in the fictitious time, called as
+            ``build(function, time, initial_state, tolerance=, step_size=)``.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial position and velocity.
+        tolerance : float, optional
+            The tolerance of the integration (default is 1e-12).
+        time_step : float, optional
+            The mean time step in seconds of the fixed step integrators,
+            converted to a step in fictitious time with the initial
+            semi-major axis (default is None).
+        """
+        self.mu = mu
+        self.perturbation = perturbation
+        self.build = build
+        self.t0 = float(t0)
+        self.y0 = np.append(cart2ks(np.asarray(y0, dtype=float), mu), 0.0)
+        self.y0[9] = self.t0 - physical_time(self.y0)
+        self.tolerance = tolerance
+
+        # dt / ds averages to the semi-major axis over an orbit
+        self.step_size = None
+        if time_step is not None:
+            sma = -mu / (2 * self.y0[8])
+            self.step_size = time_step / sma
+
+    def derivative(self, s, state):
+        """
+        Returns the derivative of the KS state with respect to the fictitious time.
+
+        Parameters
+        ----------
+        s : float
+            The fictitious time.
+        state : np.ndarray
+            The KS state, u, u', E and tau.
+
+        Returns
+        -------
+        np.ndarray
+            The derivative of the KS state.
+        """
+        u, u_prime, energy = state[0:4], state[4:8], state[8]
+        r = np.dot(u, u)
+        time = physical_time(state)
+
+        state_dot = np.empty(10)
+        state_dot[0:4] = u_prime
+        state_dot[4:8] = energy / 2 * u
+        state_dot[8] = 0.0
+        state_dot[9] = -self.mu / (2 * energy)
+
+        cartesian = ks2cart(u, u_prime)
+        acceleration = self.perturbation(time, cartesian[0:3], cartesian[3:6])
+        if np.any(acceleration):
+            projected = ks_matrix(u).T @ np.append(acceleration, 0.0)
+            state_dot[4:8] += r / 2 * projected
+            state_dot[8] = 2 * np.dot(u_prime, projected)
+            state_dot[9] += (
+                np.dot(u, u_prime) * state_dot[8] / energy
+                - r / 2 * np.dot(u, projected)
+            ) / energy
+
+        return state_dot
+
+    def integrate(self, t_eval):
+        """
+        Integrates to the end of the output grid.
+
+        Parameters
+        ----------
+        t_eval : array-like
+            The sorted output times in seconds.
+
+        Returns
+        -------
+        IntegrationResult
+            The output times and cartesian states.
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+        y_eval = np.empty((10, t_eval.size))
+
+        solver = self.build(
+            self.derivative,
+            [0.0, np.inf],
+            self.y0,
+            tolerance=self.tolerance,
+            step_size=self.step_size,
+        )
+
+        index = np.searchsorted(t_eval, self.t0, side="right")
+        y_eval[:, :index] = self.y0[:, np.newaxis]
+
+        while index < t_eval.size:
+            message = solver.step()
+            if solver.status == "failed":
+                raise RuntimeError(message)
+
+            time = physical_time(solver.y)
+            stop = np.searchsorted(t_eval, time, side="right")
+            if stop == index:
+                continue
+
+            interpolant = solver.dense_output()
+            for output in range(index, stop):
+                if t_eval[output] == time:
+                    y_eval[:, output] = solver.y
+                    continue
+
+                s = brentq(
+                    lambda s: physical_time(interpolant(s)) - t_eval[output],
+                    solver.t_old,
+                    solver.t,
+                    xtol=4 * EPS * abs(solver.t),
+                    rtol=4 * EPS,
+                )
+                y_eval[:, output] = interpolant(s)
+            index = stop
+
+        return IntegrationResult(
+            t=t_eval,
+            y=ks2cart(y_eval[0:4], y_eval[4:8]),
+            nfev=solver.nfev,
+            n_steps=getattr(solver, "n_steps", None),
+            n_rejected=getattr(solver, "n_rejected", None),
+        )
+
+
+def propagate_regularized(agent, time, t_eval, tolerance=1e-12):
+    """
+    Propagates an agent's state in Kustaanheimo-Stiefel coordinates.
+
+    The integration runs in the fictitious time of the Sundman
+    transformation, the output is on the physical output times.
+
+    Parameters
+    ----------
+    agent : Agent
+        The agent to propagate.
+    time : list
+        The start and end time of the integration in seconds.
+    t_eval : np.ndarray
+        The output times in seconds.
+    tolerance : float, optional
+        The tolerance for the numerical integration (default is 1e-12).
+
+    Returns
+    -------
+    IntegrationResult
+        The output times and states.
+    """
+    check_perturbations(agent)
+
+    propagator = KustaanheimoStiefel(
+        agent.scenario.central_body.mu,
+        partial(perturbing_acceleration, agent.dynamics),
+        partial(build_integrator, agent.integrator),
+        time[0],
+        agent.state.compile(),
+        tolerance=tolerance,
+        time_step=agent.dt.total_seconds(),
+    )
+    ode_state = propagator.integrate(t_eval)
+
+    agent.integration_statistics = {
+        "nfev": ode_state.nfev,
+        "n_steps": ode_state.n_steps,
+        "n_rejected": ode_state.n_rejected,
+        "step_size": None,
+    }
+
+    return ode_state
@@ -0,0 +1,114 @@
+"""
+runge_kutta.py
+
+This module contains the fixed step Runge-Kutta integrators.
+
+Classes:
+- RungeKutta: A base class for explicit fixed step Runge-Kutta integrators.
+- RK4: The classical 4th order Runge-Kutta integrator.
+- RK8: An 8th order Runge-Kutta integrator.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+
+"""
+
+import numpy as np
+
+from python_propagate.propagators import Integrator
+from python_propagate.propagators import dop853_coefficients
+
+
+class RungeKutta(Integrator):
+    """
+    A base class for explicit fixed step Runge-Kutta integrators.
+
+    Steps are taken on the grid ``t0 + k * step`` so the output of a scenario
+    lands exactly on its ``dt`` grid. The last step is shortened to end on
+    ``t_bound``.
+
+    Attributes
+    ----------
+    A : np.ndarray
+        The stage coefficients, shape (n_stages, n_stages).
+    B : np.ndarray
+        The solution weights, shape (n_stages,).
+    C : np.ndarray
+        The stage times, shape (n_stages,).
+    step_size : float
+        The step size in seconds.
+    """
+
+    # The tableau of a method, set by the subclasses
+    A: np.ndarray
+    B: np.ndarray
+    C: np.ndarray
+
+    def __init__(self, function, t0, y0, t_bound, step_size):
+        """
+        Constructs all the necessary attributes for the RungeKutta object.
+
+        Parameters
+        ----------
+        function : callable
+            The right hand side ``function(time, state)`` of the system.
+        t0 : float
+            The initial time in seconds.
+        y0 : array-like
+            The initial state vector.
+        t_bound : float
+            The final time of the integration.
+        step_size : float
+            The step size in seconds.
+        """
+        if step_size <= 0:
+            raise ValueError(f"Step size <{step_size}> must be positive")
+
+        super().__init__(function, t0, y0, t_bound)
+        self.step_size = float(step_size)
+        self.K = np.empty((self.B.size, self.n))
+
+    def _step_impl(self):
+        t, y = self.t, self.y
+        t_new = min(self.t0 + (self.n_steps + 1) * self.step_size, self.t_bound)
+        h = t_new - t
+
+        K = self.K
+        K[0] = self.f
+        for stage in range(1, self.B.size):
+            dy = np.dot(self.A[stage, :stage], K[:stage]) * h
+            K[stage] = self.fun(t + self.C[stage] * h, y + dy)
+
+        self.t = t_new
+        self.y = y + h * np.dot(self.B, K)
+        self.f = self.fun(self.t, self.y)
+
+
+class RK4(RungeKutta):
+    """The classical 4th order Runge-Kutta integrator."""
+
+    order = 4
+    A = np.array(
+        [
+            [0.0, 0.0, 0.0, 0.0],
+            [0.5, 0.0, 0.0, 0.0],
+            [0.0, 0.5, 0.0, 0.0],
+            [0.0, 0.0, 1.0, 0.0],
+        ]
+    )
+    B = np.array([1 / 6, 1 / 3, 1 / 3, 1 / 6])
+    C = np.array([0.0, 0.5, 0.5, 1.0])
+
+
+class RK8(RungeKutta):
+    """
+    An 8th order Runge-Kutta integrator.
+
+    Uses the 12 stage 8th order solution of the Dormand-Prince 8(5,3) pair
+    without its error estimators.
+    """
+
+    order = 8
+    A = dop853_coefficients.A
+    B = dop853_coefficients.B
+    C = dop853_coefficients.C
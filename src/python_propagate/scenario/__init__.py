@@ -57,6 +57,7 @@ class Scenario:
         dt: timedelta,
         agents=...,
         stations=...,
+        ensemble=False,
     ):
         """
         Initializes the Scenario with the given parameters.
@@ -75,6 +76,8 @@ class Scenario:
             A tuple of agents in the scenario.
         stations : tuple, optional
             A tuple of stations in the scenario (default is empty tuple).
+        ensemble : bool, optional
+            Propagate agents that share a setup together (default is False).
 
         """
         if isinstance(start_time, str):
@@ -96,6 +99,7 @@ class Scenario:
         self._start_time = start_time
         self._duration = duration
         self._dt = dt
+        self._ensemble = ensemble
 
         load_spice()
 
@@ -147,6 +151,18 @@ class Scenario:
         """
         return self._dt
 
+    @property
+    def ensemble(self):
+        """
+        Returns whether agents that share a setup are propagated together.
+
+        Returns
+        -------
+        bool
+            True if agents are propagated as ensembles.
+        """
+        return self._ensemble
+
     def add_dynamics(self, dynamics: tuple):
         """Adds dynamics to the agents in the scenario."""
         for agent in self.agents:
@@ -162,7 +178,17 @@ class Scenario:
         for station in stations:
             self.stations.append(station)
 
+    def propagate_agents(self):
+        """Propagates the agents in the scenario."""
+        if self.ensemble:
+            # Imported here, the agents package depends on this module
+            from python_propagate.agents.ensemble import propagate_ensembles
+
+            propagate_ensembles(self.agents)
+        else:
+            for agent in self.agents:
+                agent.propagate()
+
     def run(self):
         """Runs the simulation."""
-        for agent in self.agents:
-            agent.propagate()
+        self.propagate_agents()
@@ -21,6 +21,7 @@ import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 
 from python_propagate.scenario import Scenario
+from python_propagate.agents.ephemeris import Ephemeris
 from python_propagate.utilities.units import RAD2DEG, ARC2DEG
 
 np.random.seed(100)
@@ -41,6 +42,9 @@ class DataGenerator(Scenario):
         plots: Plotting options for the scenario.
         output_directory (str): Directory to save the output files (default: "examples/results").
         name (str): The scenario name (default: "None").
+        ensemble (bool): Propagate agents that share a setup together (default: False).
+        chunk (int): Stream each agent's propagation in chunks of this many samples and append
+            the measurements to the HDF5 and CSV files, without the Excel file (default: None).
     """
 
     def __init__(
@@ -55,6 +59,8 @@ class DataGenerator(Scenario):
         plots=None,
         output_directory: str = "examples/results",
         name: str = "None",
+        ensemble: bool = False,
+        chunk: int = None,
     ):
         """
         Initializes the DataGenerator instance.
@@ -70,12 +76,18 @@ class DataGenerator(Scenario):
             plots (optional): Plotting configurations. Defaults to None.
             output_directory (str, optional): Directory to save results. Defaults to "examples/results".
             name (str, optional): The scenario name. Defaults to "None".
+            ensemble (bool, optional): Propagate agents that share a setup together. Defaults to False.
+            chunk (int, optional): Generate measurements from each chunk of samples while the
+                agent is still propagating instead of after the whole arc. Defaults to None.
         """
-        super().__init__(central_body, start_time, duration, dt, agents, stations)
+        super().__init__(
+            central_body, start_time, duration, dt, agents, stations, ensemble
+        )
 
         self._data_types = data_types
         self._plots = plots
         self._name = name
+        self._chunk = chunk
 
         self._output_directory = Path(output_directory)
         self._output_directory.mkdir(parents=True, exist_ok=True)
@@ -100,6 +112,46 @@ class DataGenerator(Scenario):
         """Returns the scenario name."""
         return self._name
 
+    @property
+    def chunk(self):
+        """Returns the number of samples per streamed chunk."""
+        return self._chunk
+
+    def agent_states(self, agent):
+        """
+        Yields the states of an agent on the output grid, a chunk at a time.
+
+        With ``chunk`` set the agent is propagated with ``propagate_iter`` and
+        each chunk is yielded while the propagation continues. The states are
+        only kept in ``state_data``, as an ``Ephemeris``, when plots need them,
+        so plots keep the whole trajectory of every agent in memory.
+        Otherwise ``state_data`` is yielded as one chunk.
+
+        Args:
+            agent: The agent to yield the states of.
+
+        Yields:
+            Ephemeris or list: The states of a chunk.
+        """
+        if self.chunk is None:
+            yield agent.state_data
+            return
+
+        chunks = []
+        for times, positions, velocities, *_ in agent.propagate_iter(chunk=self.chunk):
+            if self.plots:
+                chunks.append((times, positions, velocities))
+            yield Ephemeris(agent.start_time, times, positions, velocities)
+
+        if chunks:
+            times, positions, velocities = zip(*chunks)
+            agent.state_data = Ephemeris(
+                agent.start_time,
+                np.concatenate(times),
+                np.concatenate(positions),
+                np.concatenate(velocities),
+            )
+
     def run(self):
         """
         Runs the DataGenerator simulation, collecting observational data from agents and saving it to HDF5, Excel, and CSV formats.
@@ -118,68 +170,107 @@ class DataGenerator(Scenario):
                               self.output_directory,
                               name=self.name)
 
-    def generate_data(self):
+    def measurements(self, agent, states, first_index, timespec):
+        """
+        Returns the noisy measurements of the stations that see an agent.
 
-        data_all = []  # List to store data for all agents
+        Args:
+            agent: The observed agent.
+            states: The states of the agent.
+            first_index (int): The output index of the first state.
+            timespec (str): The time format of ``datetime.isoformat``.
 
-        for agent in self.agents:
-            agent.propagate()  # Update agent state
-            data_agent = []  # Store data for this agent
-
-            for i, state in enumerate(agent.state_data):
-                for station in self.stations:
-                    # Calculate azimuth and elevation (convert to degrees)
-                    az, el = station.calculate_azimuth_and_elevation(state=state)
-                    az *= RAD2DEG
-                    el *= RAD2DEG
-
-                    #TODO: Hard coded noise to data
-                    az += np.random.normal(0,5 * ARC2DEG)
-                    el += np.random.normal(0,5 * ARC2DEG)
-
-                    # Calculate right ascension and declination (convert to degrees)
-                    ra, dec = station.calculate_ra_and_dec(state=state)
-                    ra *= RAD2DEG
-                    dec *= RAD2DEG
-
-                    ra += np.random.normal(0,5 * ARC2DEG)
-                    dec += np.random.normal(0,5 * ARC2DEG)
-
-                    # Calculate range and range rate
-                    rho, rhodot = station.calculate_range_and_range_rate_from_target(
-                        state=state
+        Returns:
+            list: One row per station and visible state.
+        """
+        data_agent = []  # Store data for this agent
+
+        for i, state in enumerate(states, first_index):
+            for station in self.stations:
+                # Calculate azimuth and elevation (convert to degrees)
+                az, el = station.calculate_azimuth_and_elevation(state=state)
+                az *= RAD2DEG
+                el *= RAD2DEG
+
+                #TODO: Hard coded noise to data
+                az += np.random.normal(0,5 * ARC2DEG)
+                el += np.random.normal(0,5 * ARC2DEG)
+
+                # Calculate right ascension and declination (convert to degrees)
+                ra, dec = station.calculate_ra_and_dec(state=state)
+                ra *= RAD2DEG
+                dec *= RAD2DEG
+
+                ra += np.random.normal(0,5 * ARC2DEG)
+                dec += np.random.normal(0,5 * ARC2DEG)
+
+                # Calculate range and range rate
+                rho, rhodot = station.calculate_range_and_range_rate_from_target(
+                    state=state
+                )
+                rho += np.random.normal(0,10e-3)
+                rhodot += np.random.normal(0,10e-6)
+
+                # Store data if elevation is above the station's minimum threshold
+                if el > station.minimum_elevation_angle:
+                    data_agent.append(
+                        {
+                            "agent": agent.name,
+                            "index": i,
+                            "time": state.time.isoformat(timespec=timespec),
+                            "RA_DEG": ra,
+                            "DEC_DEG": dec,
+                            "AZ_DEG": az,
+                            "EL_DEG": el,
+                            "Range_KM": rho,
+                            "Range_Rate_KMS": rhodot,
+                            "station": station.name,
+                            "station_id": station.identity,
+                        }
                     )
-                    rho += np.random.normal(0,10e-3)
-                    rhodot += np.random.normal(0,10e-6)
-
-                    # Store data if elevation is above the station's minimum threshold
-                    if el > station.minimum_elevation_angle:
-                        data_agent.append(
-                            {
-                                "agent": agent.name,
-                                "index": i,
-                                "time": state.time.strftime("%Y-%m-%dT%H:%M:%S"),
-                                "RA_DEG": ra,
-                                "DEC_DEG": dec,
-                                "AZ_DEG": az,
-                                "EL_DEG": el,
-                                "Range_KM": rho,
-                                "Range_Rate_KMS": rhodot,
-                                "station": station.name,
-                                "station_id": station.identity,
-                            }
-                        )
-
-            data_all.extend(data_agent)
 
-        # Convert data to a pandas DataFrame
-        df = pd.DataFrame(data_all)
+        return data_agent
+
+    def generate_data(self):
+        """
+        Generates the measurements of all agents and writes them to files.
+
+        With ``chunk`` set the rows of each chunk are appended to the HDF5
+        and CSV files as soon as they are generated, so only one chunk of
+        rows is in memory. The Excel file, which can only be written at once
+        and holds at most 1048576 rows, is then not written.
+        """
+        if self.chunk is None:
+            self.propagate_agents()  # Update agent states
+
+        # One time format for the whole run, milliseconds for sub-second output
+        sub_second = any(
+            agent.start_time.microsecond
+            or agent.dt.microseconds
+            or (agent.epochs is not None and np.any(agent.epochs % 1))
+            for agent in self.agents
+        )
+        timespec = "milliseconds" if sub_second else "seconds"
 
         # Define output file paths
         output_path_h5 = self.output_directory / f"{self.name}.h5"
         output_path_xlsx = self.output_directory / f"{self.name}.xlsx"
         output_path_csv = self.output_directory / f"{self.name}.csv"
 
+        if self.chunk is not None:
+            self.stream_data(timespec, output_path_h5, output_path_csv)
+            print(
+                f"Files written:\n  HDF5: {output_path_h5}\n  CSV: {output_path_csv}"
+            )
+            return
+
+        data_all = []  # List to store data for all agents
+        for agent in self.agents:
+            data_all.extend(self.measurements(agent, agent.state_data, 0, timespec))
+
+        # Convert data to a pandas DataFrame
+        df = pd.DataFrame(data_all)
+
         # Save data to various formats
         df.to_hdf(output_path_h5, key="df", mode="w")
         df.to_excel(output_path_xlsx, index=False)
@@ -188,7 +279,42 @@ class DataGenerator(Scenario):
         print(
             f"Files written:\n  HDF5: {output_path_h5}\n  Excel: {output_path_xlsx}\n  CSV: {output_path_csv}"
         )
-            
+
+    def stream_data(self, timespec, output_path_h5, output_path_csv):
+        """
+        Appends the measurements of every chunk to the HDF5 and CSV files.
+
+        Args:
+            timespec (str): The time format of ``datetime.isoformat``.
+            output_path_h5 (Path): The path of the HDF5 file.
+            output_path_csv (Path): The path of the CSV file.
+        """
+        # The string columns are sized for their longest value up front
+        min_itemsize = {
+            "agent": max(len(str(agent.name)) for agent in self.agents),
+            "station": max(len(str(station.name)) for station in self.stations),
+        }
+
+        n_rows = 0
+        with pd.HDFStore(output_path_h5, mode="w") as store, open(
+            output_path_csv, "w", newline=""
+        ) as csv_file:
+            for agent in self.agents:
+                first_index = 0
+                for states in self.agent_states(agent):
+                    rows = self.measurements(agent, states, first_index, timespec)
+                    first_index += len(states)
+                    if not rows:
+                        continue
+
+                    df = pd.DataFrame(rows, index=range(n_rows, n_rows + len(rows)))
+                    store.append("df", df, format="table", min_itemsize=min_itemsize)
+                    df.to_csv(csv_file, index=False, header=n_rows == 0)
+                    n_rows += len(rows)
+
+            if n_rows == 0:
+                store.put("df", pd.DataFrame())
+                pd.DataFrame().to_csv(csv_file, index=False)
 
     def plot_orbit(self):
         """
@@ -242,51 +368,36 @@ class DataGenerator(Scenario):
 
         # Loop through all agents to plot their orbits and key points (start and end)
         for agent in self.agents:
+            position = agent.state_data.position
+            start, final = position[0], position[-1]
+
             # Plot start and end markers along with the trajectory on the XY plane
-            axxy.plot(agent.state_data[0].position[0], agent.state_data[0].position[1],
-                    'g*', label='start', fillstyle='none')
-            axxy.plot(agent.state_data[-1].position[0], agent.state_data[-1].position[1],
-                    'rs', label='end', fillstyle='none')
-            axxy.plot([state.position[0] for state in agent.state_data],
-                    [state.position[1] for state in agent.state_data],
-                    label=agent.name, linewidth=1.0)
+            axxy.plot(start[0], start[1], 'g*', label='start', fillstyle='none')
+            axxy.plot(final[0], final[1], 'rs', label='end', fillstyle='none')
+            axxy.plot(position[:, 0], position[:, 1], label=agent.name, linewidth=1.0)
             axxy.set_xlabel('X [KM]')
             axxy.set_ylabel('Y [KM]')
 
             # Plot on the XZ plane
-            axxz.plot(agent.state_data[0].position[0], agent.state_data[0].position[2],
-                    'g*', label='start', fillstyle='none')
-            axxz.plot(agent.state_data[-1].position[0], agent.state_data[-1].position[2],
-                    'rs', label='end', fillstyle='none')
-            axxz.plot([state.position[0] for state in agent.state_data],
-                    [state.position[2] for state in agent.state_data],
-                    label=agent.name, linewidth=1.0)
+            axxz.plot(start[0], start[2], 'g*', label='start', fillstyle='none')
+            axxz.plot(final[0], final[2], 'rs', label='end', fillstyle='none')
+            axxz.plot(position[:, 0], position[:, 2], label=agent.name, linewidth=1.0)
             axxz.set_xlabel('X [KM]')
             axxz.set_ylabel('Z [KM]')
 
             # Plot on the YZ plane
-            axyz.plot(agent.state_data[0].position[1], agent.state_data[0].position[2],
-                    'g*', label='start', fillstyle='none')
-            axyz.plot(agent.state_data[-1].position[1], agent.state_data[-1].position[2],
-                    'rs', label='end', fillstyle='none')
-            axyz.plot([state.position[1] for state in agent.state_data],
-                    [state.position[2] for state in agent.state_data],
-                    label=agent.name, linewidth=1.0)
+            axyz.plot(start[1], start[2], 'g*', label='start', fillstyle='none')
+            axyz.plot(final[1], final[2], 'rs', label='end', fillstyle='none')
+            axyz.plot(position[:, 1], position[:, 2], label=agent.name, linewidth=1.0)
             axyz.set_xlabel('Y [KM]')
             axyz.set_ylabel('Z [KM]')
 
             # Plot on the 3D view
-            ax3d.plot([state.position[0] for state in agent.state_data],
-                    [state.position[1] for state in agent.state_data],
-                    [state.position[2] for state in agent.state_data],
+            ax3d.plot(position[:, 0], position[:, 1], position[:, 2],
                     label=agent.name, linewidth=1.0)
-            ax3d.plot([agent.state_data[0].position[0]],
-                    [agent.state_data[0].position[1]],
-                    [agent.state_data[0].position[2]],
+            ax3d.plot([start[0]], [start[1]], [start[2]],
                     'g*', label='start', fillstyle='none')
-            ax3d.plot([agent.state_data[-1].position[0]],
-                    [agent.state_data[-1].position[1]],
-                    [agent.state_data[-1].position[2]],
+            ax3d.plot([final[0]], [final[1]], [final[2]],
                     'rs', label='end', fillstyle='none')
             ax3d.set_xlabel('X [KM]')
             ax3d.set_ylabel('Y [KM]')
@@ -318,8 +429,8 @@ def plot_ground_track(agents, stations, output_directory, name="ground_track_vis
     where the agent's elevation exceeds the station's minimum elevation angle.
     
     Args:
-        agents (list): List of agent objects. Each must have a `state_data` attribute where each
-                       element (state) has attributes `latitude` and `longitude` in radians.
+        agents (list): List of agent objects. Each must have a `state_data` Ephemeris whose
+                       states have a `latlong` attribute in radians.
         stations (list): List of station objects. Each station must have:
                           - a method `calculate_azimuth_and_elevation(state)` that returns (az, el)
                           - an attribute `minimum_elevation_angle` (in degrees)
@@ -343,11 +454,12 @@ def plot_ground_track(agents, stations, output_directory, name="ground_track_vis
     ax.set_global()
     
     # Plot the entire ground track for each agent (in a neutral color)
+    tracks = []
     for agent in agents:
-        # Compute full track: convert longitudes and latitudes from radians to degrees
-        track_lons = [state.latlong[1] * RAD2DEG for state in agent.state_data]
-        track_lats = [state.latlong[0] * RAD2DEG for state in agent.state_data]
-        ax.plot(track_lons, track_lats, color="k", marker = 'x',linestyle = 'none',
+        # Compute full track once: latitudes and longitudes from radians to degrees
+        track = np.array([state.latlong for state in agent.state_data]).reshape(-1, 2) * RAD2DEG
+        tracks.append(track)
+        ax.plot(track[:, 1], track[:, 0], color="k", marker = 'x',linestyle = 'none',
                 transform=ccrs.PlateCarree(), label=f"{agent.name} Track")
         
     # Now, for each station, find and plot the points where the agent is visible.
@@ -356,22 +468,17 @@ def plot_ground_track(agents, stations, output_directory, name="ground_track_vis
         # Set a default color if the station does not have one
         station_color = getattr(station, "color", "magenta")
         
-        # Loop through agents and accumulate the visible points
-        for agent in agents:
-            visible_lons = []
-            visible_lats = []
-            
-            for state in agent.state_data:
-                # Calculate azimuth and elevation at the given state from this station.
-                az, el = station.calculate_azimuth_and_elevation(state=state)
-                # Convert the elevation to degrees for comparison
-                if (el * RAD2DEG) > station.minimum_elevation_angle:
-                    visible_lons.append(state.latlong[1] * RAD2DEG)
-                    visible_lats.append(state.latlong[0] * RAD2DEG)
+        # Loop through agents and select the visible points of their tracks
+        for agent, track in zip(agents, tracks):
+            # Calculate the elevation of every state from this station, in degrees
+            elevation = np.array(
+                [station.calculate_azimuth_and_elevation(state=state)[1] for state in agent.state_data]
+            ) * RAD2DEG
+            visible = track[elevation > station.minimum_elevation_angle]
             
             # If there are any visible points for this agent at this station, plot them.
-            if visible_lons:
-                ax.plot(visible_lons, visible_lats, marker="o", linestyle="None",
+            if visible.size:
+                ax.plot(visible[:, 1], visible[:, 0], marker="o", linestyle="None",
                         color=station_color, markersize=6,
                         transform=ccrs.PlateCarree(),
                         label=f"{station.name} Visibility")
@@ -0,0 +1,77 @@
+"""
+epochs.py
+
+This module contains functions for irregular output epochs.
+
+Functions:
+- load_epochs: Reads output epochs from a text file.
+- epoch_seconds: Converts output epochs to seconds after a start time.
+
+Author: Aaron Berkhoff
+Date: 2025-01-30
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+
+def load_epochs(path):
+    """
+    Reads output epochs from a text file.
+
+    The first comma separated field of every line is the epoch, either an
+    ISO 8601 time such as 2025-01-15T12:30:00.250 or the seconds after the
+    start time. Blank lines and lines starting with '#' are skipped, so
+    tracking schedules written as CSV files can be read directly.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path of the file.
+
+    Returns
+    -------
+    list
+        The epochs, datetimes or floats.
+    """
+    epochs = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            field = line.split(",")[0].strip()
+            if not field or field.startswith("#"):
+                continue
+            try:
+                epochs.append(float(field))
+            except ValueError:
+                epochs.append(datetime.fromisoformat(field))
+
+    return epochs
+
+
+def epoch_seconds(epochs, start_time):
+    """
+    Converts output epochs to seconds after a start time.
+
+    Parameters
+    ----------
+    epochs : array-like
+        The epochs, datetimes, ISO 8601 strings or seconds after the start
+        time.
+    start_time : datetime
+        The start time.
+
+    Returns
+    -------
+    np.ndarray
+        The sorted, unique seconds after the start time.
+    """
+    seconds = []
+    for epoch in epochs:
+        if isinstance(epoch, str):
+            epoch = datetime.fromisoformat(epoch)
+        if isinstance(epoch, datetime):
+            epoch = (epoch - start_time).total_seconds()
+        seconds.append(float(epoch))
+
+    return np.unique(seconds)
@@ -8,14 +8,26 @@ Functions:
 - cart2classical: Converts cartesian state vector to classical orbital elements.
 - mean2true: Converts mean anomaly to true anomaly.
 - true2mean: Converts true anomaly to mean anomaly.
+- solve_kepler: Solves Kepler's equation for arrays of mean anomalies.
+- true_anomalies: Converts arrays of mean anomalies to true and eccentric anomalies.
+- elements2cart: Converts arrays of orbital elements to cartesian states.
+- cart2elements: Converts cartesian states to arrays of orbital elements.
+- mean2osculating: Converts mean orbital elements to osculating elements.
+- osculating2mean: Converts osculating orbital elements to mean elements.
+- greenwich_sidereal_angle: Returns the Greenwich mean sidereal angle of an epoch.
 
 Author: Aaron Berkhoff
 Date: 2025-01-30
 """
 
+from datetime import datetime
+
 import numpy as np
 from scipy.optimize import newton
 
+# The J2000 epoch
+J2000 = datetime(2000, 1, 1, 12)
+
 
 def classical2cart(sma, ecc, inc, arg, raan, mu, nu=None, mean_anomaly=None):
     """Converts classical orbital elements to cartesian state vector."""
@@ -146,3 +158,379 @@ def true2mean(true_anomaly, eccentricity):
     )
     mean_anomaly = eccentric_amomaly - eccentricity * np.sin(eccentric_amomaly)
     return mean_anomaly
+
+
+def solve_kepler(mean_anomaly, eccentricity, tolerance=1e-14, max_iter=50):
+    """
+    Solves Kepler's equation for arrays of mean anomalies.
+
+    Parameters
+    ----------
+    mean_anomaly : array-like
+        The mean anomalies in radians.
+    eccentricity : array-like
+        The eccentricities, broadcast against the mean anomalies.
+    tolerance : float, optional
+        The tolerance on the eccentric anomaly (default is 1e-14).
+    max_iter : int, optional
+        The maximum number of Newton iterations (default is 50).
+
+    Returns
+    -------
+    np.ndarray
+        The eccentric anomalies in radians.
+    """
+    mean_anomaly = np.asarray(mean_anomaly, dtype=float)
+    eccentricity = np.asarray(eccentricity, dtype=float)
+
+    eccentric_anomaly = mean_anomaly + eccentricity * np.sin(mean_anomaly)
+    for _ in range(max_iter):
+        delta = (
+            eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly
+        ) / (1 - eccentricity * np.cos(eccentric_anomaly))
+        eccentric_anomaly = eccentric_anomaly - delta
+        if np.all(np.abs(delta) < tolerance):
+            break
+
+    return eccentric_anomaly
+
+
+def elements2cart(sma, ecc, inc, arg, raan, mean_anomaly, mu):
+    """
+    Converts arrays of orbital elements to cartesian states.
+
+    Parameters
+    ----------
+    sma, ecc, inc, arg, raan, mean_anomaly : array-like
+        The orbital elements, angles in radians, all of the same shape.
+    mu : float
+        The gravitational parameter of the central body.
+
+    Returns
+    -------
+    np.ndarray
+        The cartesian states, shape (6,) + shape of the elements.
+    """
+    sma, ecc, inc, arg, raan, mean_anomaly = np.broadcast_arrays(
+        *(
+            np.asarray(element, dtype=float)
+            for element in (sma, ecc, inc, arg, raan, mean_anomaly)
+        )
+    )
+
+    eccentric_anomaly = solve_kepler(mean_anomaly, ecc)
+    cos_e, sin_e = np.cos(eccentric_anomaly), np.sin(eccentric_anomaly)
+    eta = np.sqrt(1 - ecc**2)
+
+    x = sma * (cos_e - ecc)
+    y = sma * eta * sin_e
+    r = sma * (1 - ecc * cos_e)
+    vx = -np.sqrt(mu * sma) / r * sin_e
+    vy = np.sqrt(mu * sma) / r * eta * cos_e
+
+    cos_w, sin_w = np.cos(arg), np.sin(arg)
+    cos_o, sin_o = np.cos(raan), np.sin(raan)
+    cos_i, sin_i = np.cos(inc), np.sin(inc)
+
+    p_vector = np.array(
+        [
+            cos_o * cos_w - sin_o * sin_w * cos_i,
+            sin_o * cos_w + cos_o * sin_w * cos_i,
+            sin_w * sin_i,
+        ]
+    )
+    q_vector = np.array(
+        [
+            -cos_o * sin_w - sin_o * cos_w * cos_i,
+            -sin_o * sin_w + cos_o * cos_w * cos_i,
+            cos_w * sin_i,
+        ]
+    )
+
+    return np.concatenate((p_vector * x + q_vector * y, p_vector * vx + q_vector * vy))
+
+
+def cart2elements(state, mu):
+    """
+    Converts cartesian states to arrays of orbital elements.
+
+    Unlike ``cart2classical`` circular and equatorial orbits are handled, the
+    argument of periapsis is zero for circular orbits and the right ascension
+    of the ascending node is zero for equatorial orbits.
+
+    Parameters
+    ----------
+    state : array-like
+        The cartesian states, shape (6,) or (6, N).
+    mu : float
+        The gravitational parameter of the central body.
+
+    Returns
+    -------
+    tuple
+        The semi-major axis, eccentricity, inclination, argument of
+        periapsis, right ascension of the ascending node and mean anomaly,
+        angles in radians.
+    """
+    state = np.asarray(state, dtype=float)
+    position, velocity = state[0:3], state[3:6]
+
+    r = np.sqrt(np.sum(position**2, axis=0))
+    v2 = np.sum(velocity**2, axis=0)
+    h = np.cross(position, velocity, axis=0)
+    h_norm = np.sqrt(np.sum(h**2, axis=0))
+    e_vector = (
+        (v2 - mu / r) * position - np.sum(position * velocity, axis=0) * velocity
+    ) / mu
+
+    sma = 1 / (2 / r - v2 / mu)
+    ecc = np.sqrt(np.sum(e_vector**2, axis=0))
+    inc = np.arccos(h[2] / h_norm)
+
+    equatorial = np.hypot(h[0], h[1]) < 1e-12 * h_norm
+    raan = np.where(equatorial, 0.0, np.arctan2(h[0], -h[1]))
+
+    # Node line and the direction 90 degrees ahead of it in the orbit plane
+    node = np.array([np.cos(raan), np.sin(raan), np.zeros_like(raan)])
+    ahead = np.cross(h / h_norm, node, axis=0)
+
+    arg = np.arctan2(np.sum(e_vector * ahead, axis=0), np.sum(e_vector * node, axis=0))
+    latitude = np.arctan2(
+        np.sum(position * ahead, axis=0), np.sum(position * node, axis=0)
+    )
+    nu = latitude - arg
+
+    eccentric_anomaly = np.arctan2(np.sqrt(1 - ecc**2) * np.sin(nu), ecc + np.cos(nu))
+    mean_anomaly = eccentric_anomaly - ecc * np.sin(eccentric_anomaly)
+
+    return (
+        sma,
+        ecc,
+        inc,
+        arg % (2 * np.pi),
+        raan % (2 * np.pi),
+        mean_anomaly % (2 * np.pi),
+    )
+
+
+def brouwer_short_period(sma, ecc, inc, arg, raan, mean_anomaly, gamma2):
+    """
+    Applies the first order J2 short periodic terms of Brouwer's theory.
+
+    Follows the mapping of Schaub and Junkins (Analytical Mechanics of
+    Space Systems, appendix G) with the long periodic terms, which are
+    singular at the critical inclination, left out.
+
+    Parameters
+    ----------
+    sma, ecc, inc, arg, raan, mean_anomaly : np.ndarray
+        The orbital elements, angles in radians.
+    gamma2 : np.ndarray
+        J2 / 2 * (radius / sma)**2, negated for the inverse mapping.
+
+    Returns
+    -------
+    tuple
+        The mapped orbital elements.
+    """
+    eta = np.sqrt(1 - ecc**2)
+    gamma2_prime = gamma2 / eta**4
+    cos_i = np.cos(inc)
+    cos_i2 = cos_i**2
+
+    nu, _ = true_anomalies(mean_anomaly, ecc)
+    cos_f = np.cos(nu)
+    a_r = (1 + ecc * cos_f) / eta**2
+    center = (nu - mean_anomaly + np.pi) % (2 * np.pi) - np.pi + ecc * np.sin(nu)
+
+    sin_2wf = (
+        3 * np.sin(2 * arg + 2 * nu)
+        + 3 * ecc * np.sin(2 * arg + nu)
+        + ecc * np.sin(2 * arg + 3 * nu)
+    )
+
+    sma_new = sma + sma * gamma2 * (
+        (3 * cos_i2 - 1) * (a_r**3 - 1 / eta**3)
+        + 3 * (1 - cos_i2) * a_r**3 * np.cos(2 * arg + 2 * nu)
+    )
+
+    cubic = 3 * cos_f + 3 * ecc * cos_f**2 + ecc**2 * cos_f**3
+    delta_ecc = (
+        eta**2
+        / 2
+        * (
+            gamma2
+            * (
+                (3 * cos_i2 - 1) / eta**6 * (ecc * eta + ecc / (1 + eta) + cubic)
+                + 3 * (1 - cos_i2) / eta**6 * (ecc + cubic) * np.cos(2 * arg + 2 * nu)
+            )
+            - gamma2_prime
+            * (1 - cos_i2)
+            * (3 * np.cos(2 * arg + nu) + np.cos(2 * arg + 3 * nu))
+        )
+    )
+
+    delta_inc = (
+        gamma2_prime
+        / 2
+        * cos_i
+        * np.sqrt(1 - cos_i2)
+        * (
+            3 * np.cos(2 * arg + 2 * nu)
+            + 3 * ecc * np.cos(2 * arg + nu)
+            + ecc * np.cos(2 * arg + 3 * nu)
+        )
+    )
+
+    delta_raan = -gamma2_prime / 2 * cos_i * (6 * center - sin_2wf)
+
+    longitude = (
+        mean_anomaly
+        + arg
+        + raan
+        + gamma2_prime
+        / 4
+        * (-6 * (1 - 5 * cos_i2) * center + (3 - 5 * cos_i2) * sin_2wf)
+        + delta_raan
+    )
+
+    a_r_eta = (a_r * eta) ** 2
+    ecc_delta_mean = (
+        -gamma2_prime
+        / 4
+        * eta**3
+        * (
+            2 * (3 * cos_i2 - 1) * (a_r_eta + a_r + 1) * np.sin(nu)
+            + 3
+            * (1 - cos_i2)
+            * (
+                (-a_r_eta - a_r + 1) * np.sin(2 * arg + nu)
+                + (a_r_eta + a_r + 1 / 3) * np.sin(2 * arg + 3 * nu)
+            )
+        )
+    )
+
+    d1 = (ecc + delta_ecc) * np.sin(mean_anomaly) + ecc_delta_mean * np.cos(
+        mean_anomaly
+    )
+    d2 = (ecc + delta_ecc) * np.cos(mean_anomaly) - ecc_delta_mean * np.sin(
+        mean_anomaly
+    )
+    mean_new = np.arctan2(d1, d2)
+    ecc_new = np.sqrt(d1**2 + d2**2)
+
+    sin_half, cos_half = np.sin(inc / 2), np.cos(inc / 2)
+    d3 = (sin_half + cos_half * delta_inc / 2) * np.sin(
+        raan
+    ) + sin_half * delta_raan * np.cos(raan)
+    d4 = (sin_half + cos_half * delta_inc / 2) * np.cos(
+        raan
+    ) - sin_half * delta_raan * np.sin(raan)
+    raan_new = np.arctan2(d3, d4)
+    inc_new = 2 * np.arcsin(np.clip(np.sqrt(d3**2 + d4**2), 0, 1))
+
+    arg_new = longitude - mean_new - raan_new
+
+    return (
+        sma_new,
+        ecc_new,
+        inc_new,
+        arg_new % (2 * np.pi),
+        raan_new % (2 * np.pi),
+        mean_new % (2 * np.pi),
+    )
+
+
+def true_anomalies(mean_anomaly, eccentricity):
+    """Converts arrays of mean anomalies to true and eccentric anomalies."""
+    eccentric_anomaly = solve_kepler(mean_anomaly, eccentricity)
+    nu = 2 * np.arctan2(
+        np.sqrt(1 + eccentricity) * np.sin(eccentric_anomaly / 2),
+        np.sqrt(1 - eccentricity) * np.cos(eccentric_anomaly / 2),
+    )
+    return nu, eccentric_anomaly
+
+
+def mean2osculating(sma, ecc, inc, arg, raan, mean_anomaly, radius, j2):
+    """
+    Converts mean orbital elements to osculating elements.
+
+    Adds the first order J2 short periodic terms, vectorized over arrays of
+    elements.
+
+    Parameters
+    ----------
+    sma, ecc, inc, arg, raan, mean_anomaly : array-like
+        The mean orbital elements, angles in radians.
+    radius : float
+        The radius of the central body.
+    j2 : float
+        The second zonal harmonic coefficient of the central body.
+
+    Returns
+    -------
+    tuple
+        The osculating orbital elements.
+    """
+    elements = [
+        np.asarray(element, dtype=float)
+        for element in (sma, ecc, inc, arg, raan, mean_anomaly)
+    ]
+    gamma2 = j2 / 2 * (radius / elements[0]) ** 2
+    return brouwer_short_period(*elements, gamma2)
+
+
+def osculating2mean(sma, ecc, inc, arg, raan, mean_anomaly, radius, j2):
+    """
+    Converts osculating orbital elements to mean elements.
+
+    Subtracts the first order J2 short periodic terms, vectorized over
+    arrays of elements. The inverse of ``mean2osculating`` to first order in J2.
+
+    Parameters
+    ----------
+    sma, ecc, inc, arg, raan, mean_anomaly : array-like
+        The osculating orbital elements, angles in radians.
+    radius : float
+        The radius of the central body.
+    j2 : float
+        The second zonal harmonic coefficient of the central body.
+
+    Returns
+    -------
+    tuple
+        The mean orbital elements.
+    """
+    elements = [
+        np.asarray(element, dtype=float)
+        for element in (sma, ecc, inc, arg, raan, mean_anomaly)
+    ]
+    gamma2 = -j2 / 2 * (radius / elements[0]) ** 2
+    return brouwer_short_period(*elements, gamma2)
+
+
+def greenwich_sidereal_angle(epoch):
+    """
+    Returns the Greenwich mean sidereal angle of an epoch.
+
+    Uses the IAU 1982 expression with UT1 taken equal to UTC, which is
+    accurate to about a second of time and needs no Earth orientation data.
+
+    Parameters
+    ----------
+    epoch : datetime
+        The UTC epoch.
+
+    Returns
+    -------
+    float
+        The angle in radians, between 0 and 2 pi.
+    """
+    centuries = (epoch - J2000).total_seconds() / (86400 * 36525)
+    seconds = (
+        67310.54841
+        + (876600 * 3600 + 8640184.812866) * centuries
+        + 0.093104 * centuries**2
+        - 6.2e-6 * centuries**3
+    )
+    return (seconds % 86400) / 86400 * 2 * np.pi
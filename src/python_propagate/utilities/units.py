@@ -3,6 +3,9 @@ units.py
 
 This module contains functions for converting between units.
 
+Classes:
+- CanonicalUnits: The canonical units of a central body.
+
 Functions:
 - rad2deg: Converts radians to degrees.
 - deg2rad: Converts degrees to radians.
@@ -37,3 +40,177 @@ def rad2deg(radians: float):
 def deg2rad(radians: float):
     """Converts degrees to radians."""
     return radians * DEG2RAD
+
+
+class CanonicalUnits:
+    """
+    The canonical units of a central body.
+
+    The distance unit is the radius of the body and the time unit makes the
+    gravitational parameter one, so a state in canonical units is of order
+    one for any orbit around the body. State vectors with the STM appended
+    row major are scaled as S^-1 STM S, with S the scales of the state.
+
+    Attributes
+    ----------
+    distance : float
+        The distance unit in km.
+    time : float
+        The time unit in seconds.
+    velocity : float
+        The velocity unit in km/s.
+    """
+
+    def __init__(self, radius, mu):
+        """
+        Constructs all the necessary attributes for the CanonicalUnits object.
+
+        Parameters
+        ----------
+        radius : float
+            The radius of the central body in km.
+        mu : float
+            The gravitational parameter of the central body in km^3/s^2.
+        """
+        self.distance = radius
+        self.time = np.sqrt(radius**3 / mu)
+        self.velocity = radius / self.time
+
+    @classmethod
+    def of(cls, planet):
+        """Returns the canonical units of a planet."""
+        return cls(planet.radius, planet.mu)
+
+    def state_scale(self, n):
+        """
+        Returns the size of one canonical unit of each state component.
+
+        Parameters
+        ----------
+        n : int
+            The length of the state vector, 6 or 42 with the STM.
+
+        Returns
+        -------
+        np.ndarray
+            The scale of each component, shape (n,).
+        """
+        scale = np.repeat([self.distance, self.velocity], 3)
+        if n == 42:
+            scale = np.concatenate((scale, np.outer(scale, 1 / scale).ravel()))
+        return scale
+
+    def function(self, function, n):
+        """
+        Returns a right hand side in canonical units.
+
+        Parameters
+        ----------
+        function : callable
+            The right hand side ``function(time, state)`` in km, km/s and s.
+        n : int
+            The length of the state vector.
+
+        Returns
+        -------
+        callable
+            The right hand side of the canonical time and state.
+        """
+        scale = self.state_scale(n)
+        rate = self.time / scale
+
+        def canonical(time, state):
+            return function(time * self.time, state * scale) * rate
+
+        return canonical
+
+    def problem(self, function, time, initial_state, t_eval):
+        """
+        Returns an integration problem in canonical units.
+
+        Parameters
+        ----------
+        function : callable
+            The right hand side ``function(time, state)`` in km, km/s and s.
+        time : list
+            The start and end time of the integration in seconds.
+        initial_state : np.ndarray
+            The initial state vector.
+        t_eval : np.ndarray
+            The output times in seconds.
+
+        Returns
+        -------
+        tuple
+            The right hand side, start and end time, initial state and
+            output times in canonical units.
+        """
+        n = np.size(initial_state)
+        return (
+            self.function(function, n),
+            [bound / self.time for bound in time],
+            initial_state / self.state_scale(n),
+            t_eval / self.time,
+        )
+
+    def event(self, event, n):
+        """
+        Returns an event function of the canonical time and state.
+
+        Parameters
+        ----------
+        event : callable
+            The event function ``event(time, state)`` in km, km/s and s,
+            with the optional ``terminal`` and ``direction`` attributes.
+        n : int
+            The length of the state vector.
+
+        Returns
+        -------
+        callable
+            The event function of the canonical time and state.
+        """
+        scale = self.state_scale(n)
+
+        def canonical(time, state):
+            return event(time * self.time, state * scale)
+
+        canonical.terminal = getattr(event, "terminal", False)
+        canonical.direction = getattr(event, "direction", 0)
+
+        return canonical
+
+    def restore(self, result, n):
+        """
+        Converts the times and states of an integration result back, in place.
+
+        Parameters
+        ----------
+        result : IntegrationResult or OdeResult
+            The result of an integration in canonical units.
+        n : int
+            The length of the state vector.
+
+        Returns
+        -------
+        IntegrationResult or OdeResult
+            The result in km, km/s and s.
+        """
+        scale = self.state_scale(n)
+
+        result.t = result.t * self.time
+        result.y = result.y * scale[:, np.newaxis]
+
+        if getattr(result, "steps", None) is not None:
+            times, states, derivatives = result.steps
+            result.steps = (
+                times * self.time,
+                states * scale[:, np.newaxis],
+                derivatives * (scale / self.time)[:, np.newaxis],
+            )
+
+        if getattr(result, "t_events", None) is not None:
+            result.t_events = [times * self.time for times in result.t_events]
+            result.y_events = [states * scale for states in result.y_events]
+
+        return result
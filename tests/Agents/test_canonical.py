@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.environment.planets import Earth
+from python_propagate.events.apsis import ApsisEvent
+from python_propagate.utilities.units import CanonicalUnits
+
+
+def test_canonical_units():
+    earth = Earth()
+    units = CanonicalUnits.of(earth)
+
+    assert units.distance == earth.radius
+    assert_allclose(units.velocity, np.sqrt(earth.mu / earth.radius))
+    assert_allclose(units.distance / units.time, units.velocity)
+
+    # The Keplerian acceleration at one radius is one
+    def two_body(time, state):
+        radius = np.linalg.norm(state[0:3])
+        return np.concatenate((state[3:6], -earth.mu * state[0:3] / radius**3))
+
+    function = units.function(two_body, 6)
+    assert_allclose(
+        function(0.0, np.array([1.0, 0, 0, 0, 1.0, 0])), [0, 1, 0, -1, 0, 0]
+    )
+
+    # The STM is scaled as S^-1 STM S
+    stm = np.arange(36.0).reshape(6, 6)
+    scale = units.state_scale(42)
+    state = np.concatenate((np.ones(6), stm.ravel())) / scale
+    expected = np.diag(1 / scale[0:6]) @ stm @ np.diag(scale[0:6])
+    assert_allclose(state[6:].reshape(6, 6), expected)
+
+
+@pytest.mark.parametrize("integrator", ["dop853", "RK45", "rk8"])
+def test_canonical_matches_dimensional(integrator, build_sat):
+    expected = build_sat(dynamics=("kepler", "J2", "J3", "drag", "stm"), stm=np.eye(6))
+    expected.propagate(tolerance=1e-13)
+
+    canonical = build_sat(
+        integrator, ("kepler", "J2", "J3", "drag", "stm"), stm=np.eye(6), canonical=True
+    )
+    canonical.propagate(tolerance=1e-12)
+
+    assert_allclose(canonical.state.position, expected.state.position, atol=1e-4)
+    assert_allclose(canonical.state.velocity, expected.state.velocity, atol=1e-7)
+    assert_allclose(
+        canonical.state.stm,
+        expected.state.stm,
+        rtol=0,
+        atol=1e-6 * np.abs(expected.state.stm).max(),
+    )
+
+
+def test_canonical_output_events_and_ephemeris(build_sat):
+    dimensional = build_sat(duration=timedelta(hours=3))
+    dimensional.propagate(ephemeris=True, events=(ApsisEvent(),))
+
+    canonical = build_sat(duration=timedelta(hours=3), canonical=True)
+    canonical.propagate(ephemeris=True, events=(ApsisEvent(),))
+
+    assert len(canonical.state_data) == len(dimensional.state_data) == 361
+    assert canonical.state_data[-1].time == dimensional.state_data[-1].time
+    assert_allclose(
+        canonical.state_data[-1].position,
+        dimensional.state_data[-1].position,
+        atol=1e-5,
+    )
+
+    assert len(canonical.event_data) == len(dimensional.event_data) > 0
+    assert_allclose(
+        [occurrence.seconds for occurrence in canonical.event_data],
+        [occurrence.seconds for occurrence in dimensional.event_data],
+        atol=1e-4,
+    )
+
+    assert canonical.ephemeris.times[-1] == pytest.approx(3 * 3600)
+    sample = canonical.ephemeris.at(5000.0)
+    assert_allclose(
+        sample.position, dimensional.ephemeris.at(5000.0).position, atol=1e-5
+    )
+
+
+def test_canonical_propagate_iter(build_sat):
+    streamed = build_sat(duration=timedelta(hours=3), canonical=True)
+    chunks = list(streamed.propagate_iter(chunk=100))
+
+    propagated = build_sat(duration=timedelta(hours=3), canonical=True)
+    propagated.propagate()
+
+    times = np.concatenate([chunk[0] for chunk in chunks])
+    positions = np.concatenate([chunk[1] for chunk in chunks])
+
+    assert_allclose(times, np.arange(0, 3 * 3600 + 1, 30.0))
+    assert_allclose(
+        positions,
+        [state.position for state in propagated.state_data],
+        rtol=0,
+        atol=1e-9,
+    )
@@ -0,0 +1,138 @@
+import copy
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.agents.state import State
+from python_propagate.agents.ensemble import Ensemble, propagate_ensembles
+
+
+def build_sats(build_sat, areas, integrator="rk8"):
+    return [
+        build_sat(integrator, duration=timedelta(hours=3), area=area) for area in areas
+    ]
+
+
+def test_ensemble_matches_single_agents(build_sat):
+    areas = (3.6, 36.0, 360.0)
+    batched = build_sats(build_sat, areas)
+    single = build_sats(build_sat, areas)
+
+    ensemble = Ensemble.from_agents(batched)
+    ensemble.propagate()
+
+    assert ensemble.state_data.shape == (3, 3 * 3600 // 30 + 1, 6)
+
+    for batched_sat, single_sat in zip(batched, single):
+        single_sat.propagate()
+        assert_allclose(
+            batched_sat.state.compile(), single_sat.state.compile(), rtol=1e-12
+        )
+        assert len(batched_sat.state_data) == len(single_sat.state_data)
+
+    # Larger areas decay faster
+    radii = np.linalg.norm(ensemble.states[:, 0:3], axis=1)
+    assert radii[0] > radii[1] > radii[2]
+
+
+def test_propagate_ensembles_groups_by_setup(build_sat):
+    sats = build_sats(build_sat, (3.6, 36.0), integrator="dop853") + build_sats(
+        build_sat, (3.6,)
+    )
+
+    propagate_ensembles(sats)
+
+    assert all(len(sat.state_data) == 3 * 3600 // 30 + 1 for sat in sats)
+    assert sats[0].integration_statistics is sats[1].integration_statistics
+    assert sats[2].integration_statistics is not sats[0].integration_statistics
+
+
+def test_ensembles_share_formulation_and_jit(build_sat):
+    cowell = build_sats(build_sat, (3.6, 36.0))
+    encke = [
+        build_sat("rk8", duration=timedelta(hours=3), area=area, formulation="encke")
+        for area in (3.6, 36.0)
+    ]
+    jit = [
+        build_sat("rk8", duration=timedelta(hours=3), area=area, jit=True)
+        for area in (3.6, 36.0)
+    ]
+
+    with pytest.raises(ValueError):
+        Ensemble.from_agents(cowell[:1] + encke[:1])
+    with pytest.raises(ValueError):
+        Ensemble.from_agents(cowell[:1] + jit[:1])
+    with pytest.raises(NotImplementedError):
+        Ensemble.from_agents(encke).propagate()
+
+    propagate_ensembles(cowell + encke + jit)
+
+    # Encke agents are propagated on their own, jit agents in their own group
+    assert cowell[0].integration_statistics is cowell[1].integration_statistics
+    assert encke[0].integration_statistics is not encke[1].integration_statistics
+    assert jit[0].integration_statistics is jit[1].integration_statistics
+    assert jit[0].integration_statistics is not cowell[0].integration_statistics
+    assert all(len(sat.state_data) == 3 * 3600 // 30 + 1 for sat in encke)
+
+
+def test_canonical_agents_are_not_batched(build_sat):
+    dimensional = build_sats(build_sat, (3.6,))
+    canonical = [
+        build_sat("rk8", duration=timedelta(hours=3), area=area, canonical=True)
+        for area in (3.6, 36.0)
+    ]
+
+    with pytest.raises(ValueError):
+        Ensemble.from_agents(dimensional + canonical[:1])
+    with pytest.raises(NotImplementedError):
+        Ensemble.from_agents(canonical).propagate()
+
+    propagate_ensembles(dimensional + canonical)
+
+    expected = build_sat("rk8", duration=timedelta(hours=3), canonical=True)
+    expected.propagate()
+    assert (
+        canonical[0].integration_statistics is not canonical[1].integration_statistics
+    )
+    assert_allclose(canonical[0].state.compile(), expected.state.compile(), rtol=1e-14)
+
+
+def test_every_agent_is_held_to_the_tolerance(build_sat):
+    # One low orbit among slow geostationary ones
+    geo = State(position=[42164.0, 0.0, 0.0], velocity=[0.0, 3.0747, 0.01])
+
+    def build_agents():
+        return [build_sat(duration=timedelta(hours=3))] + [
+            build_sat(duration=timedelta(hours=3), state=copy.deepcopy(geo))
+            for _ in range(9)
+        ]
+
+    reference = build_sat(duration=timedelta(hours=3))
+    reference.propagate(tolerance=1e-13)
+    single = build_sat(duration=timedelta(hours=3))
+    single.propagate(tolerance=1e-9)
+
+    batched = build_agents()
+    ensemble = Ensemble.from_agents(batched)
+    ensemble.propagate(tolerance=1e-9)
+
+    error = np.abs(batched[0].state.position - reference.state.position).max()
+    single_error = np.abs(single.state.position - reference.state.position).max()
+    assert error < 1.5 * single_error
+    assert (
+        ensemble.integration_statistics["n_steps"]
+        >= single.integration_statistics["n_steps"]
+    )
+
+
+def test_two_body_agents_stay_analytic(build_sat):
+    sats = [
+        build_sat(dynamics=("kepler",), duration=timedelta(hours=3), area=area)
+        for area in (3.6, 36.0)
+    ]
+
+    propagate_ensembles(sats)
+
+    assert all(sat.integration_statistics["nfev"] == 0 for sat in sats)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.agents import State
+from python_propagate.agents.ephemeris import Ephemeris
+
+
+@pytest.mark.parametrize("integrator, atol", [("dop853", 1e-5), ("RK45", 1e-8)])
+def test_ephemeris_matches_output_grid(integrator, atol, build_sat):
+    jah_sat = build_sat(integrator)
+    jah_sat.propagate(ephemeris=True)
+
+    ephemeris = jah_sat.ephemeris
+    assert ephemeris.epoch == jah_sat.start_time
+    assert ephemeris.times[0] == 0 and ephemeris.times[-1] == 6 * 3600
+
+    times = np.arange(0, 6 * 3600 + 30, 30.0)
+    samples = ephemeris.at(times)
+
+    positions = np.array([state.position for state in jah_sat.state_data])
+    velocities = np.array([state.velocity for state in jah_sat.state_data])
+    assert_allclose(samples.position, positions, rtol=0, atol=atol)
+    assert_allclose(samples.velocity, velocities, rtol=0, atol=atol * 1e-2)
+
+    # Step boundaries are reproduced exactly
+    assert_allclose(ephemeris.at(ephemeris.times).position, ephemeris.position)
+
+    with pytest.raises(ValueError):
+        ephemeris.at(6 * 3600 + 1.0)
+
+
+def test_ephemeris_keeps_stm(build_sat):
+    jah_sat = build_sat("rk8", ("kepler", "J2", "J3", "drag", "stm"), stm=np.eye(6))
+    jah_sat.propagate(ephemeris=True)
+
+    ephemeris = jah_sat.ephemeris
+    assert ephemeris.stm.shape == (6 * 3600 // 30 + 1, 6, 6)
+    assert_allclose(ephemeris.stm[0], np.eye(6))
+    assert_allclose(ephemeris.at([ephemeris.times[-1]]).stm[0], jah_sat.state.stm)
+
+    fine_sat = build_sat(
+        "rk8",
+        ("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        dt=timedelta(seconds=15),
+    )
+    fine_sat.propagate(ephemeris=True)
+
+    stm = ephemeris.at(fine_sat.ephemeris.times).stm
+    scale = np.abs(fine_sat.ephemeris.stm).max()
+    assert_allclose(stm, fine_sat.ephemeris.stm, rtol=0, atol=1e-8 * scale)
+
+
+def test_state_data_is_columnar(build_sat):
+    jah_sat = build_sat("dop853")
+    jah_sat.propagate()
+
+    state_data = jah_sat.state_data
+    assert isinstance(state_data, Ephemeris)
+    assert len(state_data) == 6 * 3600 // 30 + 1
+    assert state_data.position.shape == state_data.velocity.shape == (721, 3)
+    assert state_data.position.flags.c_contiguous
+
+    # States are built when indexed
+    state = state_data[10]
+    assert isinstance(state, State)
+    assert state.time == jah_sat.start_time + timedelta(seconds=300)
+    assert_allclose(state.position, state_data.position[10])
+    assert_allclose(state_data[-1].position, jah_sat.state.position)
+
+    # Slices are views into the same arrays
+    window = state_data[100:200:2]
+    assert isinstance(window, Ephemeris) and len(window) == 50
+    assert np.shares_memory(window.position, state_data.position)
+    assert window.datetimes[0] == jah_sat.start_time + timedelta(seconds=3000)
+
+    positions = np.array([state.position for state in state_data])
+    assert_allclose(positions, state_data.position)
+
+
+def test_ephemeris_from_output_keeps_stm():
+    times = np.array([0.0, 60.0])
+    stm = np.stack((np.eye(6), 2 * np.eye(6)))
+    states = np.vstack((np.arange(12.0).reshape(6, 2), stm.reshape(2, 36).T))
+
+    ephemeris = Ephemeris.from_output(datetime(2025, 1, 15), times, states)
+    assert_allclose(ephemeris.position, [[0, 2, 4], [1, 3, 5]])
+    assert_allclose(ephemeris.velocity, [[6, 8, 10], [7, 9, 11]])
+    assert_allclose(ephemeris[1].stm, 2 * np.eye(6))
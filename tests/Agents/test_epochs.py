@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.utilities.epochs import load_epochs
+
+START_TIME = datetime.strptime("2025-01-15T12:30:00", "%Y-%m-%dT%H:%M:%S")
+
+
+def positions(agent):
+    return np.array([state.position for state in agent.state_data])
+
+
+@pytest.mark.parametrize("integrator", ["dop853", "RK45"])
+def test_irregular_epochs(integrator, build_sat):
+    dense = build_sat(
+        integrator, dt=timedelta(seconds=0.5), duration=timedelta(hours=2)
+    )
+    dense.propagate(tolerance=1e-12)
+
+    # A tracking schedule, unsorted and in mixed formats
+    epochs = [
+        START_TIME + timedelta(seconds=4200.5),
+        "2025-01-15T12:35:00.500",
+        1234.0,
+        START_TIME + timedelta(seconds=1234),
+    ]
+    tracked = build_sat(integrator, duration=timedelta(hours=2), epochs=epochs)
+    tracked.propagate(tolerance=1e-12)
+
+    assert_allclose(tracked.epochs, [300.5, 1234.0, 4200.5])
+    assert [state.time for state in tracked.state_data] == [
+        START_TIME + timedelta(seconds=seconds) for seconds in (300.5, 1234.0, 4200.5)
+    ]
+
+    # Dense output gives the states of the finer grid
+    expected = positions(dense)[[601, 2468, 8401]]
+    assert_allclose(positions(tracked), expected, rtol=0, atol=1e-6)
+
+    # The integration ends at the last epoch
+    assert_allclose(tracked.state.position, expected[-1], rtol=0, atol=1e-6)
+
+
+def test_sub_second_and_multi_day_steps(build_sat):
+    jah_sat = build_sat(dt=timedelta(milliseconds=250), duration=timedelta(seconds=60))
+    time, t_eval = jah_sat.output_times()
+    assert time == [0, 60.0]
+    assert t_eval.size == 241
+    assert_allclose(np.diff(t_eval), 0.25)
+
+    # Steps of a day or more keep their day part
+    jah_sat = build_sat(
+        dt=timedelta(days=1, hours=12), duration=timedelta(days=3), dynamics=("kepler",)
+    )
+    jah_sat.propagate()
+    assert [state.time for state in jah_sat.state_data] == [
+        START_TIME + timedelta(hours=hours) for hours in (0, 36, 72)
+    ]
+
+
+def test_fixed_step_sub_second_grid(build_sat):
+    coarse = build_sat("rk8", dt=timedelta(seconds=10), duration=timedelta(minutes=10))
+    coarse.propagate()
+
+    fine = build_sat("rk8", dt=timedelta(seconds=0.1), duration=timedelta(minutes=10))
+    fine.propagate()
+
+    assert len(fine.state_data) == 6001
+    assert fine.state_data[-1].time == coarse.state_data[-1].time
+    assert_allclose(positions(fine)[::100], positions(coarse), rtol=0, atol=1e-8)
+
+
+@pytest.mark.parametrize("integrator", ["RK45", "dop853", "rk8", "abm"])
+@pytest.mark.parametrize(
+    "duration, dt", [(10.2, 0.1), (0.3, 0.1), (0.7, 0.05), (60.0, 0.25)]
+)
+def test_sub_second_grid_ends_inside_span(integrator, duration, dt, build_sat):
+    jah_sat = build_sat(
+        integrator,
+        dt=timedelta(seconds=dt),
+        duration=timedelta(seconds=duration),
+        dynamics=("kepler",),
+    )
+    time, t_eval = jah_sat.output_times()
+    assert t_eval.size == round(duration / dt) + 1
+    assert t_eval[-1] == time[1] == duration
+
+    jah_sat.propagate()
+    assert len(jah_sat.state_data) == t_eval.size
+    assert jah_sat.state_data[-1].time == START_TIME + timedelta(seconds=duration)
+
+
+def test_load_epochs(tmp_path, build_sat):
+    path = tmp_path / "schedule.csv"
+    path.write_text(
+        "# epoch, station\n2025-01-15T12:40:00.250, Arecibo\n\n3600, Arecibo\n"
+    )
+    assert load_epochs(path) == [datetime(2025, 1, 15, 12, 40, 0, 250000), 3600.0]
+
+    jah_sat = build_sat(duration=timedelta(hours=2), epochs=str(path))
+    assert_allclose(jah_sat.epochs, [600.25, 3600.0])
+
+
+def test_epochs_outside_duration(build_sat):
+    jah_sat = build_sat(duration=timedelta(hours=2), epochs=[600.0, 3 * 3600.0])
+    with pytest.raises(ValueError):
+        jah_sat.propagate()
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+from python_propagate.scenario import Scenario
+from python_propagate.environment.planets import Earth
+from python_propagate.agents import State
+from python_propagate.agents.state import OrbitalElements
+from python_propagate.agents.monte_carlo import MonteCarlo, disperse
+
+START_TIME = datetime.strptime("2025-01-15T12:30:00", "%Y-%m-%dT%H:%M:%S")
+DURATION = timedelta(seconds=2 * 3600)
+DT = timedelta(seconds=60)
+POSITION = np.array([1340.745, -6663.403, -132.528])
+VELOCITY = np.array([5.457807, 1.368701, -5.614317])
+
+
+def build_study(covariance, n_samples=20, seed=7, **kwargs):
+    scenario = Scenario(
+        central_body=Earth(), start_time=START_TIME, duration=DURATION, dt=DT
+    )
+
+    study = MonteCarlo(
+        State(position=POSITION, velocity=VELOCITY),
+        covariance,
+        n_samples,
+        start_time=START_TIME,
+        duration=DURATION,
+        dt=DT,
+        coefficent_of_drag=2.0,
+        mass=1350,
+        area=3.6,
+        seed=seed,
+        **kwargs,
+    )
+    study.set_scenario(scenario=scenario)
+    study.add_dynamics(dynamics=("kepler", "J2", "J3", "drag"))
+
+    return study
+
+
+def test_zero_covariance_matches_nominal_agent(build_sat):
+    result = build_study(np.zeros((6, 6)), n_samples=4).run()
+
+    sat = build_sat(duration=DURATION, dt=DT)
+    sat.propagate()
+
+    n_points = 2 * 3600 // 60 + 1
+    assert result.states.shape == (4, n_points, 6)
+    assert result.envelope.shape == (3, n_points, 6)
+    assert result.position_deviation.shape == (3, n_points)
+    assert_allclose(result.states[:, -1], np.tile(sat.state.compile(), (4, 1)))
+    assert_allclose(result.position_deviation, 0.0, atol=1e-9)
+
+
+def test_dispersion_is_reproducible_and_grows():
+    covariance = np.diag([1e-2] * 3 + [1e-8] * 3)
+
+    first = build_study(covariance, area_sigma=0.3).run()
+    second = build_study(covariance, area_sigma=0.3).run()
+
+    assert_array_equal(first.states, second.states)
+    assert_array_equal(first.states[0, 0], np.concatenate((POSITION, VELOCITY)))
+
+    spread = first.position_deviation[-1]
+    assert spread[-1] > spread[0]
+    assert np.all(first.envelope[0] <= first.envelope[-1])
+
+
+def test_orbital_elements_nominal():
+    study = MonteCarlo(
+        OrbitalElements(sma=7000.0, ecc=0.001, inc=51.6, arg=0.0, raan=10.0, nu=0.0),
+        np.zeros((6, 6)),
+        3,
+        start_time=START_TIME,
+        duration=DURATION,
+        dt=DT,
+    )
+    study.set_scenario(
+        Scenario(central_body=Earth(), start_time=START_TIME, duration=DURATION, dt=DT)
+    )
+
+    assert study.states.shape == (3, 6)
+    assert_allclose(np.linalg.norm(study.states[:, 0:3], axis=1), 7000.0 * 0.999)
+
+
+def test_dispersed_parameters_stay_positive():
+    samples = disperse(3.6, 3.6, 10000, np.random.default_rng(3))
+
+    assert samples[0] == 3.6
+    assert np.all(samples > 0)
+    assert samples.shape == (10000,)
+
+    study = build_study(np.zeros((6, 6)), n_samples=200, area_sigma=5.0, mass_sigma=2e3)
+    assert np.all(study.area > 0)
+    assert np.all(study.mass > 0)
+
+    with pytest.raises(ValueError):
+        disperse(-1.0, 0.1, 3, np.random.default_rng(3))
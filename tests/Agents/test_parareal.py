@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.agents.parareal import propagate_parareal
+
+
+def positions(agent):
+    return np.array([state.position for state in agent.state_data])
+
+
+@pytest.mark.parametrize("coarse", ["rk4", "j2"])
+def test_parareal_matches_serial(coarse, build_sat):
+    serial = build_sat(dt=timedelta(seconds=60))
+    serial.propagate(tolerance=1e-12)
+
+    parallel = build_sat(dt=timedelta(seconds=60))
+    propagate_parareal(parallel, n_slices=4, coarse=coarse, processes=2)
+
+    assert len(parallel.state_data) == len(serial.state_data) == 361
+    assert parallel.state_data[-1].time == serial.state_data[-1].time
+    assert_allclose(positions(parallel), positions(serial), rtol=0, atol=1e-5)
+    assert parallel.integration_statistics["n_slices"] == 4
+    assert parallel.integration_statistics["n_iterations"] <= 4
+    assert parallel.integration_statistics["converged"]
+
+
+def test_parareal_epochs_after_start(build_sat):
+    epochs = np.arange(3600, 10801, 60.0)
+    serial = build_sat(dt=timedelta(seconds=60), epochs=epochs)
+    serial.propagate(tolerance=1e-12)
+
+    parallel = build_sat(dt=timedelta(seconds=60), epochs=epochs)
+    propagate_parareal(parallel, n_slices=3, processes=1)
+
+    assert len(parallel.state_data) == len(serial.state_data) == epochs.size
+    assert parallel.state_data[0].time == serial.state_data[0].time
+    assert_allclose(positions(parallel), positions(serial), rtol=0, atol=1e-5)
+
+
+def test_parareal_all_iterations_is_serial(build_sat):
+    serial = build_sat(
+        dynamics=("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        dt=timedelta(seconds=60),
+    )
+    serial.propagate(tolerance=1e-12)
+
+    # Every slice starts from the fine state after as many iterations as slices
+    parallel = build_sat(
+        dynamics=("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        dt=timedelta(seconds=60),
+    )
+    propagate_parareal(parallel, n_slices=3, convergence=0.0, processes=1)
+
+    assert parallel.integration_statistics["n_iterations"] == 3
+    assert parallel.integration_statistics["converged"]
+    assert_allclose(parallel.state.position, serial.state.position, atol=1e-7)
+    assert_allclose(
+        parallel.state.stm,
+        serial.state.stm,
+        rtol=0,
+        atol=1e-6 * np.abs(serial.state.stm).max(),
+    )
+
+
+def test_parareal_not_converged(build_sat):
+    jah_sat = build_sat(dt=timedelta(seconds=60))
+    with pytest.warns(UserWarning, match="did not converge"):
+        propagate_parareal(
+            jah_sat, n_slices=3, convergence=1e-12, max_iterations=1, processes=1
+        )
+
+    assert jah_sat.integration_statistics["n_iterations"] == 1
+    assert not jah_sat.integration_statistics["converged"]
+
+
+def test_parareal_unsupported(build_sat):
+    jah_sat = build_sat(
+        dynamics=("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        dt=timedelta(seconds=60),
+    )
+    with pytest.raises(NotImplementedError):
+        propagate_parareal(jah_sat, n_slices=2, coarse="j2", processes=1)
+    with pytest.raises(NotImplementedError):
+        propagate_parareal(jah_sat, n_slices=2, coarse="euler", processes=1)
+
+    jah_sat = build_sat(dt=timedelta(seconds=60), formulation="ks")
+    with pytest.raises(NotImplementedError):
+        propagate_parareal(jah_sat, n_slices=2, processes=1)
@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+
+@pytest.mark.parametrize("integrator", ["dop853", "rk8", "RK45"])
+def test_chunks_match_propagate(integrator, build_sat):
+    streamed = build_sat(integrator, duration=timedelta(hours=3))
+    chunks = list(streamed.propagate_iter(chunk=100))
+
+    propagated = build_sat(integrator, duration=timedelta(hours=3))
+    propagated.propagate()
+
+    assert [times.size for times, _, _ in chunks] == [100] * 3 + [61]
+    assert streamed.state_data == []
+
+    times = np.concatenate([times for times, _, _ in chunks])
+    positions = np.concatenate([positions for _, positions, _ in chunks])
+    velocities = np.concatenate([velocities for _, _, velocities in chunks])
+
+    assert_allclose(times, np.arange(0, 3 * 3600 + 30, 30))
+    assert_allclose(
+        positions, [state.position for state in propagated.state_data], rtol=1e-12
+    )
+    assert_allclose(
+        velocities, [state.velocity for state in propagated.state_data], rtol=1e-12
+    )
+    assert_allclose(streamed.state.compile(), propagated.state.compile(), rtol=1e-12)
+
+
+def test_chunks_with_stm(build_sat):
+    streamed = build_sat(
+        "rk8",
+        ("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        duration=timedelta(hours=3),
+    )
+    chunks = list(streamed.propagate_iter(chunk=200))
+
+    propagated = build_sat(
+        "rk8",
+        ("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        duration=timedelta(hours=3),
+    )
+    propagated.propagate()
+
+    times, positions, velocities, stm = chunks[-1]
+    assert stm.shape == (times.size, 6, 6)
+    assert_allclose(stm[-1], propagated.state.stm, rtol=1e-12)
+    assert_allclose(streamed.state.stm, propagated.state.stm, rtol=1e-12)
+
+
+def test_chunks_need_cowell(build_sat):
+    jah_sat = build_sat(formulation="encke")
+    with pytest.raises(NotImplementedError):
+        next(jah_sat.propagate_iter())
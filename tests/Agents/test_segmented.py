@@ -0,0 +1,90 @@
+import os
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from python_propagate.agents.segmented import (
+    propagate_segmented,
+    load_segments,
+    segment_path,
+)
+
+
+def test_segmented_matches_monolithic(tmp_path, build_sat):
+    segmented = build_sat()
+    propagate_segmented(segmented, {"hours": 1}, tmp_path, ephemeris=True)
+
+    monolithic = build_sat()
+    monolithic.propagate()
+
+    assert len(os.listdir(tmp_path)) == 6
+    assert len(segmented.state_data) == len(monolithic.state_data)
+    assert_allclose(
+        segmented.state.compile(), monolithic.state.compile(), rtol=1e-9, atol=1e-5
+    )
+    assert_allclose(
+        segmented.ephemeris.at([5400.0]).position[0],
+        monolithic.state_data[180].position,
+        rtol=1e-9,
+        atol=1e-5,
+    )
+
+
+def test_resume_is_identical(tmp_path, build_sat):
+    reference = build_sat()
+    propagate_segmented(reference, {"hours": 1}, tmp_path, ephemeris=True)
+    reference_output, reference_steps = load_segments(tmp_path, steps=True)
+
+    # A run that died during the fifth segment
+    os.remove(segment_path(tmp_path, 5))
+    os.remove(segment_path(tmp_path, 4))
+
+    resumed = build_sat()
+    propagate_segmented(resumed, {"hours": 1}, tmp_path, ephemeris=True)
+    resumed_output, resumed_steps = load_segments(tmp_path, steps=True)
+
+    assert_array_equal(resumed.state.compile(), reference.state.compile())
+    assert_array_equal(resumed_output.y, reference_output.y)
+    for resumed_array, reference_array in zip(resumed_steps, reference_steps):
+        assert_array_equal(resumed_array, reference_array)
+
+    # Resuming needs the setup the checkpoints were written with
+    moved = build_sat()
+    moved.state.position = moved.state.position + 1e-3
+    for agent, tolerance in (
+        (build_sat(), 1e-10),
+        (build_sat("rk8"), 1e-12),
+        (build_sat(dynamics=("kepler", "J2")), 1e-12),
+        (build_sat(dt=timedelta(seconds=60)), 1e-12),
+        (build_sat(area=360.0), 1e-12),
+        (build_sat(mass=135.0), 1e-12),
+        (build_sat(jit=True), 1e-12),
+        (moved, 1e-12),
+    ):
+        with pytest.raises(ValueError):
+            propagate_segmented(agent, {"hours": 1}, tmp_path, tolerance=tolerance)
+    with pytest.raises(ValueError):
+        propagate_segmented(build_sat(), {"hours": 2}, tmp_path)
+    with pytest.raises(ValueError):
+        propagate_segmented(build_sat(), {"hours": 1}, tmp_path, atol=1e-9)
+    thin = build_sat()
+    thin.scenario.central_body.atmosphere_table = (
+        thin.scenario.central_body.atmosphere_table * [1.0, 0.5, 1.0]
+    )
+    with pytest.raises(ValueError):
+        propagate_segmented(thin, {"hours": 1}, tmp_path)
+    with pytest.raises(NotImplementedError):
+        propagate_segmented(build_sat(formulation="encke"), {"hours": 1}, tmp_path)
+
+
+def test_segmented_stm(tmp_path, build_sat):
+    segmented = build_sat("rk8", ("kepler", "J2", "J3", "drag", "stm"), stm=np.eye(6))
+    propagate_segmented(segmented, {"minutes": 90}, tmp_path, keep=False)
+
+    monolithic = build_sat("rk8", ("kepler", "J2", "J3", "drag", "stm"), stm=np.eye(6))
+    monolithic.propagate()
+
+    assert segmented.state_data == []
+    assert_allclose(segmented.state.stm, monolithic.state.stm, rtol=1e-9, atol=1e-12)
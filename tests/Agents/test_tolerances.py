@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.propagators.integrators import error_tolerances
+
+
+@pytest.mark.parametrize("integrator", ["dop853", "RK45"])
+def test_stm_out_of_error_control_takes_state_steps(integrator, build_sat):
+    state_only = build_sat(integrator, dt=timedelta(seconds=60))
+    state_only.propagate(tolerance=1e-10)
+
+    controlled = build_sat(
+        integrator,
+        ("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        dt=timedelta(seconds=60),
+    )
+    controlled.propagate(tolerance=1e-10)
+
+    uncontrolled = build_sat(
+        integrator,
+        ("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        dt=timedelta(seconds=60),
+    )
+    uncontrolled.propagate(tolerance=1e-10, control_stm=False)
+
+    steps = state_only.integration_statistics["n_steps"]
+    if steps is not None:
+        assert uncontrolled.integration_statistics["n_steps"] == steps
+        assert controlled.integration_statistics["n_steps"] > steps
+    assert (
+        uncontrolled.integration_statistics["nfev"]
+        == state_only.integration_statistics["nfev"]
+    )
+    assert_allclose(uncontrolled.state.position, state_only.state.position, atol=1e-9)
+
+    # The STM still follows the state's accuracy
+    expected = build_sat(
+        integrator,
+        ("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        dt=timedelta(seconds=60),
+    )
+    expected.propagate(tolerance=1e-13)
+    assert_allclose(
+        uncontrolled.state.stm,
+        expected.state.stm,
+        rtol=0,
+        atol=1e-6 * np.abs(expected.state.stm).max(),
+    )
+
+
+def test_error_tolerances():
+    assert error_tolerances(1e-10) == (1e-10, 1e-10)
+
+    atol = np.array([1e-9, 1e-9, 1e-9, 1e-12, 1e-12, 1e-12])
+    rtol, actual = error_tolerances(1e-10, atol)
+    assert rtol == 1e-10
+    assert_allclose(actual, atol)
+
+    rtol, actual = error_tolerances(1e-10, atol, stm=True)
+    assert actual.shape == (42,)
+    assert_allclose(actual[0:6], atol)
+    assert_allclose(actual[6:], 1e-10)
+
+    rtol, actual = error_tolerances(1e-10, atol, control_stm=False, stm=True)
+    assert rtol == pytest.approx(1e-10 * np.sqrt(6 / 42))
+    assert_allclose(actual[0:6], atol * np.sqrt(6 / 42))
+    assert np.all(np.isinf(actual[6:]))
+
+
+def test_component_tolerances(build_sat):
+    tight = build_sat(dt=timedelta(seconds=60))
+    tight.propagate(tolerance=1e-10)
+
+    # Absolute tolerances of one meter on the position, one mm/s on the velocity
+    loose = build_sat(dt=timedelta(seconds=60))
+    loose.propagate(tolerance=1e-10, atol=[1e-3, 1e-3, 1e-3, 1e-6, 1e-6, 1e-6])
+
+    assert loose.integration_statistics["nfev"] <= tight.integration_statistics["nfev"]
+    assert_allclose(loose.state.position, tight.state.position, atol=0.1)
@@ -0,0 +1,41 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.io import loadmat
+
+
+def test_accel_into_all(build_sat):
+    jah_sat = build_sat()
+
+    assert all(dynamic.flat for dynamic in jah_sat.dynamics)
+
+    position = np.array(jah_sat.state.position, dtype=float)
+    velocity = np.array(jah_sat.state.velocity, dtype=float)
+    acceleration = np.zeros(3)
+    for dynamic in jah_sat.dynamics:
+        dynamic.accel_into(position, velocity, 0.0, acceleration)
+
+    data = loadmat("tests/data/Dynamics_ComparisonResults.mat")
+    expected_accel = data["accel_All"][3:6, 0]
+    assert_allclose(acceleration, expected_accel, rtol=0, atol=1e-16)
+
+
+def test_flat_propagators_match_state_propagators(build_sat):
+    jah_sat = build_sat()
+    state = jah_sat.state.compile()[:6]
+
+    assert_allclose(
+        jah_sat.flat_propagator(0.0, state),
+        jah_sat.propagator(0.0, state),
+        rtol=0,
+        atol=0,
+    )
+
+    jah_sat = build_sat(dynamics=("kepler", "J2", "J3", "drag", "stm"), stm=np.eye(6))
+    state = jah_sat.state.compile()
+
+    assert_allclose(
+        jah_sat.flat_propagator(0.0, state),
+        jah_sat.stm_propagator(0.0, state),
+        rtol=0,
+        atol=0,
+    )
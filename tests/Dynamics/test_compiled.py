@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.io import loadmat
+
+from python_propagate.environment.planets import Earth
+from python_propagate.agents import State
+from python_propagate.dynamics import Dynamic
+from python_propagate.dynamics.compiled import atmosphere_lookup, compiled_propagator
+
+numba = pytest.importorskip("numba")
+
+
+def test_compiled_accel_all(build_sat):
+    jah_sat = build_sat(
+        "RK45",
+        ("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        duration=timedelta(days=1),
+        jit=True,
+    )
+    state = jah_sat.state.compile()
+
+    state_dot = compiled_propagator(jah_sat)(0.0, state)
+
+    data = loadmat("tests/data/Dynamics_ComparisonResults.mat")
+    expected_accel = data["accel_All"]
+    assert_allclose(state_dot[3:6], expected_accel[3:6, 0], rtol=0, atol=1e-16)
+
+    stm_dot = state_dot[6:].reshape(6, 6).flatten(order="F")
+    assert_allclose(stm_dot, expected_accel[6:, 0], rtol=0, atol=1e-18)
+
+    assert_allclose(state_dot, jah_sat.flat_propagator(0.0, state), rtol=1e-14, atol=0)
+
+
+def test_compiled_end_states(build_sat):
+    jah_sat = build_sat(
+        "RK45", ("kepler", "J2", "J3"), duration=timedelta(days=1), jit=True
+    )
+    jah_sat.propagate()
+
+    data = loadmat("tests/data/Dynamics_ComparisonResults.mat")
+    actual_end = jah_sat.state.compile()[np.newaxis, :]
+    assert_allclose(actual_end, data["endState_TwoBody_J2_J3"], atol=1e-18)
+
+    compiled = build_sat("RK45", duration=timedelta(days=1), jit=True)
+    python = build_sat("RK45", duration=timedelta(days=1))
+    compiled.propagate()
+    python.propagate()
+
+    assert_allclose(compiled.state.compile(), python.state.compile(), rtol=1e-9)
+
+
+def test_atmosphere_lookup_matches_model():
+    earth = Earth()
+
+    for altitude in np.concatenate(
+        (np.linspace(-10.0, 1200.0, 1211), earth.atmosphere_table[:, 0])
+    ):
+        radius = earth.radius + altitude
+        assert atmosphere_lookup(
+            radius, earth.radius, earth.atmosphere_table
+        ) == earth.atmosphere_model(radius)
+
+
+def test_unsupported_dynamic_falls_back(build_sat):
+    class Constant(Dynamic):
+        def function(self, state, time):
+            return State(acceleration=np.zeros(3))
+
+    jah_sat = build_sat("RK45", ("kepler",), duration=timedelta(days=1), jit=True)
+    jah_sat.add_dynamics((Constant(scenario=jah_sat.scenario, agent=jah_sat),))
+
+    with pytest.warns(UserWarning):
+        assert compiled_propagator(jah_sat) is None
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.dynamics.gravity_grid import GravityGrid
+from python_propagate.dynamics.spherical_harmonics import SphericalHarmonicGravity
+
+
+def earth_like_field(degree=8, seed=1):
+    # Coefficients of the size of Kaula's rule, with the J2 of the Earth
+    rng = np.random.default_rng(seed)
+    scale = 1e-5 / np.maximum(np.arange(degree + 1), 1)[:, None] ** 2
+    c = np.tril(rng.normal(size=(degree + 1, degree + 1))) * scale
+    s = np.tril(rng.normal(size=(degree + 1, degree + 1))) * scale
+    s[:, 0] = 0.0
+    c[2, 0] = -4.84165e-4
+    return c, s
+
+
+def build_field(jah_sat, **grid):
+    # The default resolution is meant for fields of high degree
+    if grid:
+        grid.setdefault("resolution", 16)
+    return SphericalHarmonicGravity(
+        jah_sat.scenario, jah_sat, coefficients=earth_like_field(), grid=grid or None
+    )
+
+
+def test_grid_matches_direct_evaluation(build_sat):
+    jah_sat = build_sat(dynamics=())
+    field = build_field(jah_sat, altitudes=(300, 700), tolerance=1e-9)
+    assert field.grid.error < 1e-9
+
+    rng = np.random.default_rng(5)
+    directions = rng.normal(size=(20, 3))
+    directions /= np.linalg.norm(directions, axis=1)[:, None]
+    for position in directions * (field.radius + 450.0):
+        assert_allclose(
+            field.body_acceleration(position),
+            field.direct_acceleration(position),
+            rtol=0,
+            atol=1e-9,
+        )
+
+    # Outside the band the harmonic sum is evaluated directly
+    position = directions[0] * (field.radius + 1500.0)
+    assert not field.grid.contains(position)
+    assert np.array_equal(
+        field.body_acceleration(position), field.direct_acceleration(position)
+    )
+
+
+def test_grid_is_cached_to_disk(tmp_path, monkeypatch, build_sat):
+    jah_sat = build_sat(dynamics=())
+    field = build_field(jah_sat, altitudes=(300, 700), cache_dir=tmp_path)
+    assert [path.name for path in tmp_path.iterdir()] == [
+        f"gravity_grid_{field.grid.key()}.npy"
+    ]
+
+    # The second grid of the same field and band maps the file
+    def build(self):
+        raise AssertionError("The cached grid was rebuilt")
+
+    monkeypatch.setattr(GravityGrid, "build", build)
+    cached = build_field(jah_sat, altitudes=(300, 700), cache_dir=tmp_path)
+    assert isinstance(cached.grid.data.base, np.memmap)
+    assert np.array_equal(cached.grid.data, field.grid.data)
+
+    position = np.array([1340.745, -6663.403, 3000.0])
+    assert_allclose(
+        cached.body_acceleration(position), field.body_acceleration(position)
+    )
+
+
+def test_failed_build_leaves_no_file(tmp_path, monkeypatch, build_sat):
+    def sample(self, data):
+        data[0] = 0.0
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(GravityGrid, "sample", sample)
+    with pytest.raises(KeyboardInterrupt):
+        build_field(build_sat(dynamics=()), altitudes=(300, 700), cache_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_grid_above_tolerance(build_sat):
+    jah_sat = build_sat(dynamics=())
+    with pytest.raises(ValueError):
+        build_field(jah_sat, altitudes=(300, 700), resolution=2, tolerance=1e-14)
+
+
+def test_propagation_with_grid(build_sat):
+    direct = build_sat(
+        dynamics=(), duration=timedelta(hours=1), dt=timedelta(seconds=60)
+    )
+    direct.add_dynamics((build_field(direct),))
+    direct.propagate(tolerance=1e-12)
+
+    gridded = build_sat(
+        dynamics=(), duration=timedelta(hours=1), dt=timedelta(seconds=60)
+    )
+    gridded.add_dynamics((build_field(gridded, altitudes=(200, 900)),))
+    gridded.propagate(tolerance=1e-12)
+
+    assert_allclose(gridded.state.position, direct.state.position, rtol=0, atol=1e-4)
@@ -0,0 +1,198 @@
+from datetime import datetime, timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.special import lpmv
+
+from python_propagate.dynamics.zonal import ZonalGravity
+from python_propagate.dynamics.spherical_harmonics import (
+    SphericalHarmonicGravity,
+    load_coefficients,
+    unnormalize,
+)
+from python_propagate.utilities.transforms import greenwich_sidereal_angle
+
+
+def random_field(degree, seed=3):
+    rng = np.random.default_rng(seed)
+    c = np.tril(rng.normal(size=(degree + 1, degree + 1))) * 1e-3
+    s = np.tril(rng.normal(size=(degree + 1, degree + 1))) * 1e-3
+    s[:, 0] = 0.0
+    return c, s
+
+
+def test_load_coefficients(tmp_path, build_sat):
+    path = tmp_path / "egm.txt"
+    path.write_text(
+        "    2    0 -0.484165143790815D-03  0.000000000000000D+00  0.7D-11  0.0D+00\n"
+        "    2    1 -0.206615509074176D-09  0.138441389137979D-08  0.7D-11  0.7D-11\n"
+        "    3    3  0.721072657057000D-06  0.141435626958000D-05  0.7D-11  0.7D-11\n"
+    )
+    c, s, header = load_coefficients(path)
+    assert c.shape == s.shape == (4, 4)
+    assert c[2, 0] == -0.484165143790815e-03
+    assert s[2, 1] == 0.138441389137979e-08
+    assert header == {}
+
+    # Truncated to degree and order 2
+    c, s, _ = load_coefficients(path, degree=3, order=2)
+    assert c[3, 3] == 0.0 and c[2, 1] != 0.0
+
+    path = tmp_path / "field.gfc"
+    path.write_text(
+        "product_type gravity_field\n"
+        "earth_gravity_constant 3.986004415E+14\n"
+        "radius 6378136.3\n"
+        "key n m C S sigmaC sigmaS\n"
+        "end_of_head\n"
+        "gfc 0 0 1.0 0.0 0.0 0.0\n"
+        "gfc 2 0 -4.84165E-04 0.0 0.0 0.0\n"
+    )
+    c, s, header = load_coefficients(path)
+    assert c[2, 0] == -4.84165e-04
+    assert header == {"mu": 398600.4415, "radius": 6378.1363}
+
+    jah_sat = build_sat(dynamics=())
+    field = SphericalHarmonicGravity(jah_sat.scenario, jah_sat, coefficients=path)
+    assert (field.mu, field.radius, field.degree) == (398600.4415, 6378.1363, 2)
+
+
+def test_zonal_field_matches_zonal_gravity(build_sat):
+    jah_sat = build_sat(dynamics=())
+    field = SphericalHarmonicGravity(jah_sat.scenario, jah_sat)
+    zonal = ZonalGravity(jah_sat.scenario, jah_sat)
+
+    rng = np.random.default_rng(7)
+    positions = rng.normal(size=(3, 20)) * 8000
+    velocities = np.zeros((3, 20))
+
+    expected = np.zeros((3, 20))
+    zonal.accel_into(positions, velocities, 0.0, expected)
+
+    actual = np.zeros((3, 20))
+    field.accel_into(positions, velocities, 1234.5, actual)
+    assert_allclose(actual, expected, rtol=1e-12, atol=0)
+
+
+def test_acceleration_matches_potential(build_sat):
+    jah_sat = build_sat(dynamics=())
+    c, s = random_field(8)
+    field = SphericalHarmonicGravity(jah_sat.scenario, jah_sat, coefficients=(c, s))
+
+    def potential(position):
+        r = np.linalg.norm(position)
+        sin_lat = position[2] / r
+        longitude = np.arctan2(position[1], position[0])
+        total = 0.0
+        for n in range(9):
+            for m in range(n + 1):
+                c_nm = 1.0 if n == m == 0 else c[n, m]
+                # lpmv includes the Condon-Shortley phase
+                legendre = (-1) ** m * lpmv(m, n, sin_lat) * unnormalize(n, m)
+                total += (
+                    (field.radius / r) ** n
+                    * legendre
+                    * (c_nm * np.cos(m * longitude) + s[n, m] * np.sin(m * longitude))
+                )
+        return field.mu / r * total
+
+    position = np.array([1340.745, -6663.403, 3000.0])
+    step = 1e-3
+    expected = [
+        (potential(position + step * axis) - potential(position - step * axis))
+        / (2 * step)
+        for axis in np.eye(3)
+    ]
+    assert_allclose(field.body_acceleration(position), expected, rtol=1e-8)
+
+
+def test_gradient_matches_finite_differences(build_sat):
+    jah_sat = build_sat(dynamics=())
+    field = SphericalHarmonicGravity(
+        jah_sat.scenario, jah_sat, coefficients=random_field(12)
+    )
+
+    position = np.array([1340.745, -6663.403, 3000.0])
+    step = 1e-3
+    expected = np.array(
+        [
+            (
+                field.body_acceleration(position + step * axis)
+                - field.body_acceleration(position - step * axis)
+            )
+            / (2 * step)
+            for axis in np.eye(3)
+        ]
+    ).T
+
+    gradient = field.body_gradient(position)
+    assert_allclose(gradient, expected, rtol=0, atol=1e-9 * np.abs(gradient).max())
+    assert_allclose(gradient, gradient.T, rtol=1e-12)
+    assert abs(np.trace(gradient)) < 1e-12 * np.abs(gradient).max()
+
+
+def test_rotation_is_cached_per_time(build_sat):
+    jah_sat = build_sat(dynamics=())
+    field = SphericalHarmonicGravity(
+        jah_sat.scenario, jah_sat, coefficients=random_field(6)
+    )
+
+    rotation = field.rotation(600.0)
+    assert field.rotation(600.0) is rotation
+    assert field.rotation(660.0) is not rotation
+
+    angle = greenwich_sidereal_angle(jah_sat.start_time)
+    angle += jah_sat.scenario.central_body.angular_velocity * 600.0
+    assert_allclose(rotation[0, :2], [np.cos(angle), np.sin(angle)])
+
+    # The acceleration is the body-fixed one turned back to the inertial frame
+    position = np.array([1340.745, -6663.403, 3000.0])
+    acceleration = np.zeros(3)
+    field.accel_into(position, np.zeros(3), 600.0, acceleration)
+    assert_allclose(
+        acceleration, rotation.T @ field.body_acceleration(rotation @ position)
+    )
+
+
+def test_greenwich_sidereal_angle():
+    # Vallado, Example 3-5
+    angle = greenwich_sidereal_angle(datetime(1992, 8, 20, 12, 14))
+    assert_allclose(np.degrees(angle), 152.578787810, atol=1e-6)
+
+
+def test_gradient_feeds_stm(build_sat):
+    reference = build_sat(
+        dynamics=("kepler", "J2", "J3", "drag", "stm"),
+        stm=np.eye(6),
+        duration=timedelta(hours=1),
+        dt=timedelta(seconds=60),
+    )
+    reference.propagate(tolerance=1e-12)
+
+    jah_sat = build_sat(
+        dynamics=(),
+        stm=np.eye(6),
+        duration=timedelta(hours=1),
+        dt=timedelta(seconds=60),
+    )
+    field = SphericalHarmonicGravity(jah_sat.scenario, gradient=True)
+    jah_sat.add_dynamics((field, "drag", "stm"))
+    assert field.agent is jah_sat
+    jah_sat.propagate(tolerance=1e-12)
+
+    assert_allclose(jah_sat.state.position, reference.state.position, atol=1e-6)
+    assert_allclose(
+        jah_sat.state.stm,
+        reference.state.stm,
+        rtol=0,
+        atol=1e-8 * np.abs(reference.state.stm).max(),
+    )
+
+
+def test_degree_above_coefficients(build_sat):
+    jah_sat = build_sat(dynamics=())
+    with pytest.raises(ValueError):
+        SphericalHarmonicGravity(
+            jah_sat.scenario, jah_sat, coefficients=random_field(4), degree=6
+        )
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.dynamics.keplerian import Keplerian
+from python_propagate.dynamics.j2 import J2
+from python_propagate.dynamics.j3 import J3
+from python_propagate.dynamics.drag import Drag
+from python_propagate.dynamics.zonal import ZonalGravity
+from python_propagate.propagators.encke import perturbing_acceleration
+
+
+def standalone(jah_sat, types):
+    return [dynamic(scenario=jah_sat.scenario, agent=jah_sat) for dynamic in types]
+
+
+def test_add_dynamics_fuses_zonal_terms(build_sat):
+    jah_sat = build_sat()
+    assert [type(dynamic) for dynamic in jah_sat.dynamics] == [ZonalGravity, Drag]
+    assert jah_sat.dynamics[0].terms == (Keplerian, J2, J3)
+
+    jah_sat = build_sat(dynamics=("drag", "kepler", "J2"))
+    assert [type(dynamic) for dynamic in jah_sat.dynamics] == [Drag, ZonalGravity]
+    assert jah_sat.dynamics[1].degrees == (2,)
+
+    # Added in two calls, as a scenario does for each agent
+    jah_sat.add_dynamics(("J3",))
+    assert len(jah_sat.dynamics) == 2
+    assert jah_sat.dynamics[1].terms == (Keplerian, J2, J3)
+
+    # A single term is kept, pure two-body agents stay analytic
+    jah_sat = build_sat(dynamics=("kepler",))
+    assert [type(dynamic) for dynamic in jah_sat.dynamics] == [Keplerian]
+    assert jah_sat.two_body
+
+
+@pytest.mark.parametrize(
+    "types", [(Keplerian, J2, J3), (Keplerian, J2), (J2, J3), (Keplerian, J3)]
+)
+def test_zonal_matches_standalone(types, build_sat):
+    jah_sat = build_sat(dynamics=())
+    fused = ZonalGravity(
+        jah_sat.scenario,
+        jah_sat,
+        point_mass=Keplerian in types,
+        degrees=[degree for degree, term in ((2, J2), (3, J3)) if term in types],
+    )
+    assert fused.terms == types
+
+    rng = np.random.default_rng(7)
+    positions = rng.normal(size=(3, 50)) * 8000
+    velocities = np.zeros((3, 50))
+
+    expected = np.zeros((3, 50))
+    for dynamic in standalone(jah_sat, types):
+        dynamic.accel_into(positions, velocities, 0.0, expected)
+
+    actual = np.zeros((3, 50))
+    fused.accel_into(positions, velocities, 0.0, actual)
+    assert_allclose(actual, expected, rtol=1e-14, atol=0)
+
+    # The same for a single state
+    actual = np.zeros(3)
+    fused.accel_into(positions[:, 0], velocities[:, 0], 0.0, actual)
+    assert_allclose(actual, expected[:, 0], rtol=1e-14, atol=0)
+
+
+def test_fused_propagation_matches_standalone(build_sat):
+    fused = build_sat(dt=timedelta(seconds=60))
+    fused.propagate(tolerance=1e-12)
+
+    split = build_sat(dynamics=(), dt=timedelta(seconds=60))
+    split.dynamics = standalone(split, (Keplerian, J2, J3, Drag))
+    split.propagate(tolerance=1e-12)
+
+    fused_positions = np.array([state.position for state in fused.state_data])
+    split_positions = np.array([state.position for state in split.state_data])
+    # Rounding differences only, well below the error of the integration
+    assert_allclose(fused_positions, split_positions, rtol=0, atol=1e-6)
+
+
+def test_perturbing_acceleration_leaves_out_point_mass(build_sat):
+    jah_sat = build_sat(dynamics=("kepler", "J2", "J3"))
+    position = np.array(jah_sat.state.position, dtype=float)
+    velocity = np.array(jah_sat.state.velocity, dtype=float)
+
+    expected = np.zeros(3)
+    for dynamic in standalone(jah_sat, (J2, J3)):
+        dynamic.accel_into(position, velocity, 0.0, expected)
+
+    assert_allclose(
+        perturbing_acceleration(jah_sat.dynamics, 0.0, position, velocity),
+        expected,
+        rtol=1e-14,
+    )
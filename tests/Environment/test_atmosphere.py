@@ -0,0 +1,207 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.environment.planets import (
+    Earth,
+    EXPONENTIAL_ATMOSPHERE,
+    load_atmosphere_table,
+)
+from python_propagate.environment.atmosphere import LogDensitySpline
+from python_propagate.agents import State
+from python_propagate.dynamics.drag import Drag
+from python_propagate.utilities.transforms import classical2cart
+
+
+def reference_layer(table, altitude):
+    # The last layer whose base is below the altitude, the first below the table
+    below = [row for row in table if row[0] < altitude]
+    base, density, scale_height = below[-1] if below else table[0]
+    return density, base, scale_height
+
+
+def test_scalar_lookup_matches_layers():
+    earth = Earth()
+
+    # Every layer, its base altitude, which belongs to the layer below
+    altitudes = np.concatenate(
+        (np.linspace(-10.0, 1200.0, 1211), EXPONENTIAL_ATMOSPHERE[:, 0])
+    )
+    for altitude in altitudes:
+        layer = earth.atmosphere_model(earth.radius + altitude)
+        assert layer == reference_layer(EXPONENTIAL_ATMOSPHERE, altitude)
+
+    assert earth.atmosphere_model(earth.radius + 900.0) == (1.170e-14, 800.0, 124.64)
+    assert earth.atmosphere_model(earth.radius + 1500.0) == (3.019e-15, 1000.0, 268.0)
+
+
+def test_array_lookup_matches_scalar():
+    earth = Earth()
+    radii = earth.radius + np.linspace(-10.0, 1200.0, 242).reshape(2, 121)
+
+    rho0, h0, scale_height = earth.atmosphere_model(radii)
+    assert rho0.shape == h0.shape == scale_height.shape == (2, 121)
+
+    for index in np.ndindex(radii.shape):
+        assert (rho0[index], h0[index], scale_height[index]) == earth.atmosphere_model(
+            float(radii[index])
+        )
+
+
+def test_custom_atmosphere_table(tmp_path):
+    path = tmp_path / "atmosphere.csv"
+    path.write_text(
+        "# Two layer atmosphere\n"
+        "base altitude, nominal density, scale height\n"
+        "300, 2.418e-11, 53.628\n"
+        "\n"
+        "0 1.225 7.249\n"
+    )
+    assert_allclose(
+        load_atmosphere_table(path), [[300, 2.418e-11, 53.628], [0, 1.225, 7.249]]
+    )
+
+    for earth in (Earth(atmosphere_table=path), Earth(atmosphere_table=str(path))):
+        # The rows are sorted by base altitude
+        assert_allclose(earth.atmosphere_table[:, 0], [0, 300])
+        assert earth.atmosphere_model(earth.radius + 200.0) == (1.225, 0.0, 7.249)
+        assert earth.atmosphere_model(earth.radius + 400.0) == (
+            2.418e-11,
+            300.0,
+            53.628,
+        )
+
+    earth = Earth()
+    earth.atmosphere_table = [(0, 1.0, 10.0)]
+    assert earth.atmosphere_model(earth.radius + 400.0) == (1.0, 0.0, 10.0)
+
+    # Only header lines before the first layer are skipped
+    for text, number in (
+        ("0 1.225 7.249\nscale height\n300 2.418e-11 53.628\n", 2),
+        ("altitude\n0 1.225 7.249\n\n300 2.418e-11\n", 4),
+        ("0 1.225 7.249 100\n", 1),
+    ):
+        path.write_text(text)
+        with pytest.raises(ValueError, match=f"Line <{number}>"):
+            load_atmosphere_table(path)
+
+    with pytest.raises(ValueError):
+        Earth(atmosphere_table=[(0, 1.225)])
+    with pytest.raises(ValueError):
+        Earth(atmosphere_table=[(0, 1.225, -7.249)])
+
+
+def test_drag_of_arrays_matches_states(build_sat):
+    earth = Earth()
+    jah_sat = build_sat(
+        dynamics=(),
+        duration=timedelta(hours=1),
+        dt=timedelta(seconds=60),
+        central_body=earth,
+    )
+    drag = Drag(jah_sat.scenario, jah_sat)
+
+    # Positions spread over the layers of the table
+    rng = np.random.default_rng(2)
+    directions = rng.normal(size=(3, 40))
+    directions /= np.linalg.norm(directions, axis=0)
+    positions = directions * (earth.radius + np.linspace(100.0, 1100.0, 40))
+    velocities = rng.normal(size=(3, 40)) * 7.5
+
+    actual = np.zeros((3, 40))
+    drag.accel_into(positions, velocities, 0.0, actual)
+
+    for column in range(40):
+        expected = np.zeros(3)
+        drag.accel_into(positions[:, column], velocities[:, column], 0.0, expected)
+        assert_allclose(actual[:, column], expected, rtol=1e-15)
+
+
+def test_log_density_spline_is_smooth():
+    spline = LogDensitySpline(EXPONENTIAL_ATMOSPHERE)
+    bases, densities, scale_heights = EXPONENTIAL_ATMOSPHERE.T
+
+    # Through the nominal densities, continuous across every base altitude
+    assert_allclose(spline.density(bases), densities, rtol=1e-12)
+    for base in bases:
+        below, above = base - 1e-7, base + 1e-7
+        assert_allclose(spline.density(below), spline.density(above), rtol=1e-6)
+        assert_allclose(spline.gradient(below), spline.gradient(above), rtol=1e-5)
+
+    # The gradient is the derivative of the density
+    altitudes = np.linspace(-20.0, 1200.0, 245)
+    step = 1e-4
+    difference = (
+        spline.density(altitudes + step) - spline.density(altitudes - step)
+    ) / (2 * step)
+    assert_allclose(spline.gradient(altitudes), difference, rtol=1e-6)
+
+    # Scalars and arrays alike, the end layers continue as exponentials
+    for altitude in altitudes:
+        assert_allclose(spline.density(float(altitude)), spline.density(altitude))
+    assert_allclose(
+        spline.density(1200.0), densities[-1] * np.exp(-200.0 / scale_heights[-1])
+    )
+    assert_allclose(
+        spline.density(-20.0), densities[0] * np.exp(20.0 / scale_heights[0])
+    )
+
+
+def test_spline_atmosphere_model():
+    earth = Earth(atmosphere="spline")
+    spline = earth.log_density_spline
+    assert earth.log_density_spline is spline
+
+    for altitude in (95.0, 420.0, np.array([[150.0, 420.0], [800.0, 1100.0]])):
+        rho0, h0, scale_height = earth.atmosphere_model(earth.radius + altitude)
+        assert_allclose(h0, altitude)
+        assert_allclose(rho0, spline.density(altitude))
+        # The drag partials of the STM use -rho0 / scale_height
+        assert_allclose(-rho0 / scale_height, spline.gradient(altitude))
+
+    # A new table is fitted again
+    earth.atmosphere_table = EXPONENTIAL_ATMOSPHERE[5:]
+    assert earth.log_density_spline is not spline
+
+    with pytest.raises(NotImplementedError):
+        Earth(atmosphere="jacchia")
+
+
+def crossing_orbit(build_sat, atmosphere, dynamics):
+    earth = Earth(atmosphere=atmosphere)
+
+    # Perigee at 180 km and apogee at 900 km cross most of the layers
+    perigee, apogee = earth.radius + 180.0, earth.radius + 900.0
+    state = classical2cart(
+        (perigee + apogee) / 2,
+        (apogee - perigee) / (apogee + perigee),
+        np.radians(51.6),
+        0.3,
+        0.2,
+        earth.mu,
+        nu=0.0,
+    )
+    jah_sat = build_sat(
+        dynamics=dynamics,
+        duration=timedelta(days=1),
+        dt=timedelta(seconds=60),
+        state=State(position=state[:3], velocity=state[3:]),
+        central_body=earth,
+        coefficent_of_drag=2.2,
+        mass=500,
+        area=2.0,
+    )
+    jah_sat.propagate(tolerance=1e-12)
+
+    return jah_sat.integration_statistics["n_rejected"]
+
+
+def test_spline_removes_layer_rejections(build_sat):
+    without_drag = crossing_orbit(build_sat, "exponential", ("kepler", "J2", "J3"))
+    layers = crossing_orbit(build_sat, "exponential", ("kepler", "J2", "J3", "drag"))
+    spline = crossing_orbit(build_sat, "spline", ("kepler", "J2", "J3", "drag"))
+
+    # Drag with the smooth density rejects no more steps than no drag at all
+    assert spline == without_drag < layers
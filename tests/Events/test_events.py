@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from python_propagate.events.altitude import AltitudeEvent
+from python_propagate.events.apsis import ApsisEvent
+from python_propagate.events.shadow import ShadowEvent
+
+POSITION = np.array([1340.745, -6663.403, -132.528])
+VELOCITY = np.array([5.457807, 1.368701, -5.614317])
+
+
+def kepler_orbit(mu):
+    radius = np.linalg.norm(POSITION)
+    energy = np.dot(VELOCITY, VELOCITY) / 2 - mu / radius
+    semimajor_axis = -mu / (2 * energy)
+    h = np.cross(POSITION, VELOCITY)
+    eccentricity = np.sqrt(1 - np.dot(h, h) / (mu * semimajor_axis))
+    period = 2 * np.pi * np.sqrt(semimajor_axis**3 / mu)
+    return semimajor_axis, eccentricity, period
+
+
+@pytest.mark.parametrize("integrator", ["dop853", "RK45"])
+def test_apsis_events_match_kepler(integrator, build_sat):
+    jah_sat = build_sat(integrator, ("kepler",))
+    mu = jah_sat.scenario.central_body.mu
+    semimajor_axis, eccentricity, period = kepler_orbit(mu)
+
+    periapsis, apoapsis = ApsisEvent("periapsis"), ApsisEvent("apoapsis")
+    jah_sat.propagate(events=(periapsis, apoapsis))
+
+    periapses = [o for o in jah_sat.event_data if o.event is periapsis]
+    apoapses = [o for o in jah_sat.event_data if o.event is apoapsis]
+    assert len(periapses) in (3, 4) and len(apoapses) in (3, 4)
+
+    radii = [np.linalg.norm(o.state[0:3]) for o in periapses]
+    assert_allclose(radii, semimajor_axis * (1 - eccentricity), rtol=1e-9)
+    radii = [np.linalg.norm(o.state[0:3]) for o in apoapses]
+    assert_allclose(radii, semimajor_axis * (1 + eccentricity), rtol=1e-9)
+
+    assert_allclose(np.diff([o.seconds for o in periapses]), period, atol=1e-3)
+    assert jah_sat.event_data[0].time == jah_sat.start_time + timedelta(
+        seconds=jah_sat.event_data[0].seconds
+    )
+
+    # The output grid is untouched by non terminal events
+    assert len(jah_sat.state_data) == 6 * 3600 // 30 + 1
+
+
+@pytest.mark.parametrize("integrator", ["dop853", "rk8", "RK45"])
+def test_terminal_altitude_event(integrator, build_sat):
+    jah_sat = build_sat(integrator, ("kepler",))
+    radius = jah_sat.scenario.central_body.radius
+    semimajor_axis, eccentricity, _ = kepler_orbit(jah_sat.scenario.central_body.mu)
+    altitude = semimajor_axis - radius
+
+    jah_sat.propagate(events=(AltitudeEvent(altitude, radius),))
+
+    assert len(jah_sat.event_data) == 1
+    event_time = jah_sat.event_data[0].seconds
+    assert 0 < event_time < 6 * 3600
+
+    assert_allclose(np.linalg.norm(jah_sat.state.position), semimajor_axis)
+    assert np.dot(jah_sat.state.position, jah_sat.state.velocity) < 0
+
+    last = (jah_sat.state_data[-1].time - jah_sat.start_time).total_seconds()
+    assert last <= event_time < last + 30
+
+
+def test_shadow_entries_and_exits(build_sat):
+    times = []
+    for integrator in ("dop853", "RK45"):
+        jah_sat = build_sat(integrator, ("kepler",))
+        radius = jah_sat.scenario.central_body.radius
+        entry = ShadowEvent(radius, jah_sat.start_time, direction=-1)
+        exit = ShadowEvent(radius, jah_sat.start_time, direction=1)
+        jah_sat.propagate(events=(entry, exit))
+
+        occurrences = jah_sat.event_data
+        assert len(occurrences) >= 6
+
+        # Entries and exits alternate and the function is zero at the events
+        kinds = [occurrence.event is entry for occurrence in occurrences]
+        assert all(a != b for a, b in zip(kinds, kinds[1:]))
+        for occurrence in occurrences:
+            value = occurrence.event(occurrence.seconds, occurrence.state)
+            assert abs(value) < 1e-6
+
+        times.append([occurrence.seconds for occurrence in occurrences])
+
+    assert_allclose(times[0], times[1], atol=1e-3)
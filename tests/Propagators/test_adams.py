@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from scipy.io import loadmat
+
+from python_propagate.propagators.adams import (
+    AdamsBashforthMoulton,
+    adams_coefficients,
+)
+
+
+def test_adams_coefficients():
+    assert_allclose(adams_coefficients([0, -1, -2, -3]) * 24, [55, -59, 37, -9])
+    assert_allclose(adams_coefficients([1, 0, -1, -2]) * 24, [9, 19, -5, 1])
+
+
+@pytest.mark.parametrize("order", [4, 8])
+def test_convergence_order(order):
+    # y'' = -y on [0, 5], exact solution (cos t, -sin t)
+    def function(time, state):
+        return np.array([state[1], -state[0]])
+
+    errors = []
+    for step_size in (0.1, 0.05):
+        integrator = AdamsBashforthMoulton(
+            function, 0.0, [1.0, 0.0], 5.0, step_size, order=order
+        )
+        result = integrator.integrate([0.0, 5.0])
+        errors.append(abs(result.y[0, -1] - np.cos(5.0)))
+
+    assert np.log2(errors[0] / errors[1]) == pytest.approx(order, abs=0.5)
+
+
+def test_end_states_are_equal_abm(build_sat):
+    jah_sat = build_sat("abm", ("kepler", "J2"), duration=timedelta(days=1))
+    jah_sat.propagate()
+
+    actual_end = jah_sat.state.compile()[np.newaxis, :]
+    data = loadmat("tests/data/Dynamics_ComparisonResults.mat")
+    expected_end = data["endState_TwoBody_J2"]
+    assert_allclose(actual_end, expected_end, rtol=1e-7)
+    assert jah_sat.integration_statistics["nfev"] < 3 * 86400 // 30
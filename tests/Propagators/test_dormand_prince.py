@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.io import loadmat
+from scipy.integrate import solve_ivp
+
+from python_propagate.propagators.dormand_prince import DOP853
+
+
+def test_end_states_are_equal_dop853(build_sat):
+    jah_sat = build_sat("dop853", ("kepler", "J2", "J3"), duration=timedelta(days=1))
+    jah_sat.propagate()
+
+    actual_end = jah_sat.state.compile()[np.newaxis, :]
+    data = loadmat("tests/data/Dynamics_ComparisonResults.mat")
+    expected_end = data["endState_TwoBody_J2_J3"]
+    assert_allclose(actual_end, expected_end, rtol=1e-7)
+
+    statistics = jah_sat.integration_statistics
+    assert statistics["n_steps"] < 86400 // 30
+    assert statistics["nfev"] > 12 * statistics["n_steps"]
+
+
+def test_dense_output_matches_scipy():
+    def function(time, state):
+        return np.array([state[1], -state[0]])
+
+    t_eval = np.linspace(0.0, 10.0, 101)
+
+    integrator = DOP853(function, 0.0, [1.0, 0.0], 10.0, rtol=1e-10, atol=1e-10)
+    result = integrator.integrate(t_eval)
+
+    expected = solve_ivp(
+        function,
+        [0.0, 10.0],
+        [1.0, 0.0],
+        method="DOP853",
+        rtol=1e-10,
+        atol=1e-10,
+        t_eval=t_eval,
+    )
+
+    assert_allclose(result.y, expected.y, rtol=0, atol=1e-13)
+    assert_allclose(result.y[0], np.cos(t_eval), rtol=0, atol=1e-8)
+
+
+def test_step_to_bound_keeps_step_size():
+    def function(time, state):
+        return np.array([state[1], -state[0]])
+
+    integrator = DOP853(function, 0.0, [1.0, 0.0], 1e-3, first_step=0.5)
+    integrator.step()
+
+    assert integrator.t == 1e-3
+    assert integrator.step_size == 0.5
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from python_propagate.environment.planets import Earth
+from python_propagate.agents.state import OrbitalElements
+from python_propagate.propagators.encke import KeplerReference, encke_f
+from python_propagate.propagators.kepler import kepler_propagate
+
+EARTH = Earth()
+STATE = np.array([1340.745, -6663.403, -132.528, 5.457807, 1.368701, -5.614317])
+
+
+def build_orbit(build_sat, formulation, sma, dynamics, stm=None):
+    return build_sat(
+        dynamics=dynamics,
+        stm=stm,
+        duration=timedelta(days=2),
+        dt=timedelta(seconds=600),
+        state=OrbitalElements(
+            sma=sma, ecc=0.001, inc=51.6, arg=30.0, raan=40.0, nu=10.0
+        ),
+        central_body=EARTH,
+        coefficent_of_drag=2.2,
+        mass=100.0,
+        area=1.0,
+        formulation=formulation,
+    )
+
+
+def positions(agent):
+    return np.array([state.position for state in agent.state_data])
+
+
+def test_encke_f():
+    q = np.array([-0.1, -1e-9, 0.0, 1e-9, 0.1])
+    assert_allclose(encke_f(q), (1 + q) ** 1.5 - 1, rtol=1e-7, atol=0)
+
+
+def test_reference_matches_kepler():
+    times = np.linspace(0, 86400, 41)
+    reference = KeplerReference(EARTH.mu, 100.0, STATE)
+
+    position, velocity = reference(times + 100.0)
+    expected = kepler_propagate(STATE, times, EARTH.mu)
+
+    assert_allclose(position, expected[0:3], rtol=0, atol=1e-8)
+    assert_allclose(velocity, expected[3:6], rtol=0, atol=1e-11)
+
+    position, _ = reference(100.0 + times[7])
+    assert_allclose(position, expected[0:3, 7], rtol=0, atol=1e-8)
+
+
+def test_encke_two_body(build_sat):
+    jah_sat = build_orbit(build_sat, "encke", 26560.0, ("kepler",))
+    jah_sat.propagate()
+
+    assert jah_sat.integration_statistics["n_rectifications"] == 0
+
+    times = np.arange(0, 2 * 86400 + 1, 600.0)
+    expected = kepler_propagate(jah_sat.state_data[0].compile(), times, EARTH.mu)
+    assert_allclose(positions(jah_sat), expected[0:3].T, rtol=0, atol=1e-8)
+
+
+def test_encke_follows_cowell_with_fewer_steps(build_sat):
+    dynamics = ("kepler", "J2", "J3")
+    expected = build_orbit(build_sat, "cowell", 42164.0, dynamics)
+    expected.propagate(tolerance=1e-14)
+
+    cowell = build_orbit(build_sat, "cowell", 42164.0, dynamics)
+    cowell.propagate(tolerance=1e-12)
+
+    encke = build_orbit(build_sat, "encke", 42164.0, dynamics)
+    encke.propagate(tolerance=1e-12)
+
+    assert len(encke.state_data) == len(cowell.state_data) == 289
+    assert (
+        encke.integration_statistics["n_steps"]
+        < cowell.integration_statistics["n_steps"] / 2
+    )
+    assert np.abs(positions(encke) - positions(expected)).max() < 1e-5
+
+
+def test_encke_rectifies(build_sat):
+    dynamics = ("kepler", "J2", "drag")
+    cowell = build_orbit(build_sat, "cowell", 6778.0, dynamics)
+    cowell.propagate(tolerance=1e-12)
+
+    encke = build_orbit(build_sat, "encke", 6778.0, dynamics)
+    encke.propagate(tolerance=1e-12)
+
+    assert encke.integration_statistics["n_rectifications"] > 0
+    assert np.abs(positions(encke) - positions(cowell)).max() < 1e-4
+    assert_allclose(encke.state.position, cowell.state.position, atol=1e-4)
+
+
+def test_encke_unsupported(build_sat):
+    jah_sat = build_orbit(
+        build_sat, "encke", 6778.0, ("kepler", "J2", "stm"), stm=np.eye(6)
+    )
+    with pytest.raises(NotImplementedError):
+        jah_sat.propagate()
+
+    jah_sat = build_orbit(build_sat, "encke", 6778.0, ("J2",))
+    with pytest.raises(NotImplementedError):
+        jah_sat.propagate()
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from python_propagate.environment.planets import Earth
+from python_propagate.agents.state import OrbitalElements
+from python_propagate.utilities.transforms import (
+    cart2elements,
+    elements2cart,
+    mean2osculating,
+    osculating2mean,
+)
+
+EARTH = Earth()
+
+
+def test_elements_round_trip():
+    elements = (
+        np.array([7000.0, 7000.0, 26000.0]),
+        np.array([0.0, 0.01, 0.7]),
+        np.radians([0.0, 51.6, 63.4]),
+        np.array([0.0, 0.5, 4.0]),
+        np.array([0.0, 1.0, 2.0]),
+        np.array([0.3, 2.0, 6.0]),
+    )
+    states = elements2cart(*elements, EARTH.mu)
+    assert states.shape == (6, 3)
+
+    actual = cart2elements(states, EARTH.mu)
+    assert_allclose(actual[0], elements[0])
+    assert_allclose(actual[1][1:], elements[1][1:])
+    assert_allclose(actual[2], elements[2], atol=1e-12)
+
+    # Circular and equatorial orbits only keep the true longitude
+    longitude = (actual[3] + actual[4] + actual[5]) % (2 * np.pi)
+    expected = (elements[3] + elements[4] + elements[5]) % (2 * np.pi)
+    assert_allclose(longitude, expected)
+    assert_allclose(np.array(actual[3:])[:, 1:], np.array(elements[3:])[:, 1:])
+
+    assert_allclose(elements2cart(*actual, EARTH.mu), states, atol=1e-8)
+
+
+def test_mean_osculating_round_trip():
+    mean = (
+        np.full(4, 6778.0),
+        np.array([0.0, 0.001, 0.01, 0.1]),
+        np.radians([28.5, 51.6, 98.0, 45.0]),
+        np.array([0.0, 0.5, 2.0, 4.0]),
+        np.array([1.0, 2.0, 3.0, 4.0]),
+        np.array([0.1, 2.5, 4.0, 5.0]),
+    )
+    osculating = mean2osculating(*mean, EARTH.radius, EARTH.j2)
+    back = osculating2mean(*osculating, EARTH.radius, EARTH.j2)
+
+    # The mapping is first order in J2, tens of meters of semi-major axis
+    assert np.all(np.abs(osculating[0] - mean[0]) > 1.0)
+    assert_allclose(back[0], mean[0], atol=0.05)
+    assert_allclose(back[2], mean[2], atol=1e-6)
+
+    states = elements2cart(*back, EARTH.mu)
+    expected = elements2cart(*mean, EARTH.mu)
+    assert_allclose(states, expected, atol=0.05)
+
+
+def build_orbit(build_sat, formulation, dynamics, stm=None):
+    return build_sat(
+        dynamics=dynamics,
+        stm=stm,
+        duration=timedelta(days=1),
+        dt=timedelta(seconds=60),
+        state=OrbitalElements(
+            sma=6778.0, ecc=0.001, inc=51.6, arg=30.0, raan=40.0, nu=10.0
+        ),
+        central_body=EARTH,
+        coefficent_of_drag=2.2,
+        mass=150.0,
+        area=2.0,
+        formulation=formulation,
+    )
+
+
+@pytest.mark.parametrize("dynamics", [("kepler", "J2"), ("kepler", "J2", "J3", "drag")])
+def test_mean_elements_follow_cowell(dynamics, build_sat):
+    cowell = build_orbit(build_sat, "cowell", dynamics)
+    cowell.propagate()
+
+    mean = build_orbit(build_sat, "mean_elements", dynamics)
+    mean.propagate()
+
+    assert len(mean.state_data) == len(cowell.state_data) == 1441
+    assert mean.integration_statistics["nfev"] < 500
+
+    error = np.linalg.norm(
+        [a.position - b.position for a, b in zip(mean.state_data, cowell.state_data)],
+        axis=1,
+    )
+    assert error.max() < 0.5
+
+    assert mean.mean_elements.shape == (6, 1441)
+    decay = mean.mean_elements[0, -1] - mean.mean_elements[0, 0]
+    if "drag" in dynamics:
+        assert -1.0 < decay < -0.1
+    else:
+        assert abs(decay) < 1e-9
+
+
+def test_mean_elements_unsupported(build_sat):
+    jah_sat = build_orbit(
+        build_sat, "mean_elements", ("kepler", "J2", "stm"), stm=np.eye(6)
+    )
+    with pytest.raises(NotImplementedError):
+        jah_sat.propagate()
+
+    jah_sat = build_orbit(build_sat, "osculating", ("kepler", "J2"))
+    with pytest.raises(NotImplementedError):
+        jah_sat.propagate()
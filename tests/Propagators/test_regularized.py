@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from python_propagate.environment.planets import Earth
+from python_propagate.agents.state import OrbitalElements
+from python_propagate.propagators.kepler import kepler_propagate
+from python_propagate.propagators.regularized import cart2ks, ks2cart
+
+EARTH = Earth()
+
+
+def build_orbit(build_sat, formulation, dynamics, integrator="RK45", stm=None):
+    # Geostationary transfer orbit, starting at perigee
+    return build_sat(
+        integrator,
+        dynamics,
+        stm=stm,
+        duration=timedelta(days=2),
+        dt=timedelta(seconds=600),
+        state=OrbitalElements(
+            sma=24400.0, ecc=0.73, inc=28.5, arg=180.0, raan=40.0, nu=0.0
+        ),
+        central_body=EARTH,
+        formulation=formulation,
+    )
+
+
+def positions(agent):
+    return np.array([state.position for state in agent.state_data])
+
+
+@pytest.mark.parametrize("sign", [1.0, -1.0])
+def test_ks_round_trip(sign):
+    state = np.array(
+        [sign * 6524.834, 6862.875, 6448.296, 4.901327, 5.533756, -1.976341]
+    )
+    ks = cart2ks(state, EARTH.mu)
+    u, u_prime = ks[0:4], ks[4:8]
+
+    assert_allclose(ks2cart(u, u_prime), state, rtol=1e-14)
+    assert_allclose(np.dot(u, u), np.linalg.norm(state[0:3]), rtol=1e-14)
+
+    # The bilinear constraint keeps the fourth velocity component zero
+    bilinear = (
+        u[3] * u_prime[0] - u[2] * u_prime[1] + u[1] * u_prime[2] - u[0] * u_prime[3]
+    )
+    assert abs(bilinear) < 1e-13 * np.linalg.norm(u) * np.linalg.norm(u_prime)
+
+    energy = np.dot(state[3:6], state[3:6]) / 2 - EARTH.mu / np.linalg.norm(state[0:3])
+    assert_allclose(ks[8], energy)
+
+
+def test_ks_two_body(build_sat):
+    jah_sat = build_orbit(build_sat, "ks", ("kepler",), integrator="dop853")
+    jah_sat.propagate(tolerance=1e-12)
+
+    times = np.arange(0, 2 * 86400 + 1, 600.0)
+    expected = kepler_propagate(jah_sat.state_data[0].compile(), times, EARTH.mu)
+
+    assert len(jah_sat.state_data) == times.size
+    assert_allclose(positions(jah_sat), expected[0:3].T, rtol=0, atol=1e-5)
+
+
+def test_ks_fewer_evaluations_than_cowell(build_sat):
+    dynamics = ("kepler", "J2", "J3")
+    expected = build_orbit(build_sat, "cowell", dynamics, integrator="dop853")
+    expected.propagate(tolerance=1e-14)
+
+    cowell = build_orbit(build_sat, "cowell", dynamics)
+    cowell.propagate(tolerance=1e-12)
+
+    ks = build_orbit(build_sat, "ks", dynamics)
+    ks.propagate(tolerance=1e-11)
+
+    cowell_error = np.abs(positions(cowell) - positions(expected)).max()
+    ks_error = np.abs(positions(ks) - positions(expected)).max()
+
+    assert ks_error < cowell_error
+    assert ks.integration_statistics["nfev"] < cowell.integration_statistics["nfev"] / 3
+    assert_allclose(ks.state.position, expected.state.position, atol=1e-5)
+
+
+def test_ks_fixed_step(build_sat):
+    dynamics = ("kepler", "J2", "J3")
+    expected = build_orbit(build_sat, "cowell", dynamics, integrator="dop853")
+    expected.propagate(tolerance=1e-14)
+
+    # The same number of steps in fictitious time resolves the perigee passes
+    ks = build_orbit(build_sat, "ks", dynamics, integrator="rk8")
+    ks.propagate()
+    cowell = build_orbit(build_sat, "cowell", dynamics, integrator="rk8")
+    cowell.propagate()
+
+    assert np.abs(positions(ks) - positions(expected)).max() < 0.1
+    assert np.abs(positions(cowell) - positions(expected)).max() > 1.0
+
+
+def test_ks_unsupported(build_sat):
+    jah_sat = build_orbit(build_sat, "ks", ("kepler", "J2", "stm"), stm=np.eye(6))
+    with pytest.raises(NotImplementedError):
+        jah_sat.propagate()
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from scipy.io import loadmat
+
+from python_propagate.propagators.runge_kutta import RK4, RK8
+
+
+def test_end_states_are_equal_rk8(build_sat):
+    jah_sat = build_sat("rk8", ("kepler", "J2", "J3"), duration=timedelta(days=1))
+    jah_sat.propagate()
+
+    actual_end = jah_sat.state.compile()[np.newaxis, :]
+    data = loadmat("tests/data/Dynamics_ComparisonResults.mat")
+    expected_end = data["endState_TwoBody_J2_J3"]
+    assert_allclose(actual_end, expected_end, rtol=1e-7)
+
+
+def test_output_on_dt_grid(build_sat):
+    jah_sat = build_sat("rk4", ("kepler",), duration=timedelta(days=1))
+    jah_sat.propagate()
+
+    assert len(jah_sat.state_data) == 86400 // 30 + 1
+    assert jah_sat.state_data[1].time - jah_sat.state_data[0].time == timedelta(
+        seconds=30
+    )
+
+
+@pytest.mark.parametrize("integrator_class", [RK4, RK8])
+def test_convergence_order(integrator_class):
+    # y'' = -y on [0, 2], exact solution (cos t, -sin t)
+    def function(time, state):
+        return np.array([state[1], -state[0]])
+
+    errors = []
+    for step_size in (0.2, 0.1):
+        integrator = integrator_class(function, 0.0, [1.0, 0.0], 2.0, step_size)
+        result = integrator.integrate([0.0, 2.0])
+        errors.append(abs(result.y[0, -1] - np.cos(2.0)))
+
+    order = np.log2(errors[0] / errors[1])
+    assert order == pytest.approx(integrator_class.order, abs=0.5)
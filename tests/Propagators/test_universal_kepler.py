@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from python_propagate.environment.planets import Earth
+from python_propagate.propagators.dormand_prince import DOP853
+from python_propagate.propagators.kepler import kepler_propagate, stumpff
+
+MU = Earth().mu
+STATE = np.array([1340.745, -6663.403, -132.528, 5.457807, 1.368701, -5.614317])
+
+
+def two_body(time, state):
+    radius = np.linalg.norm(state[0:3])
+    return np.concatenate((state[3:6], -MU * state[0:3] / radius**3))
+
+
+@pytest.mark.parametrize("speed", [1.0, 1.6])
+def test_matches_numerical_integration(speed):
+    # Elliptic and hyperbolic
+    state = STATE * np.array([1, 1, 1, speed, speed, speed])
+    times = np.linspace(0, 86400, 41)
+
+    expected = DOP853(two_body, 0.0, state, 86400, rtol=1e-13, atol=1e-13)
+    expected = expected.integrate(times).y
+
+    actual = kepler_propagate(state, times, MU)
+    assert_allclose(actual, expected, rtol=0, atol=1e-9 * np.abs(expected).max())
+
+
+def test_stumpff_series_matches_closed_form():
+    z = np.array([-1.5, -0.999, -1e-6, 0.0, 1e-6, 0.999, 1.5])
+    c2, c3, c4, c5 = stumpff(z)
+
+    root = np.sqrt(np.abs(z[[0, -1]]))
+    assert_allclose(
+        c2[[0, -1]], [(np.cosh(root[0]) - 1) / 1.5, (1 - np.cos(root[1])) / 1.5]
+    )
+    assert_allclose(c2[3], 1 / 2)
+    assert_allclose(c3[3], 1 / 6)
+    assert_allclose(c4[3], 1 / 24)
+    assert_allclose(c5[3], 1 / 120)
+    assert np.all(np.diff(c2) < 0) and np.all(np.diff(c5) < 0)
+
+
+def test_stm_matches_finite_differences():
+    times = np.linspace(0, 86400, 7)
+    _, stms = kepler_propagate(STATE, times, MU, stm=True)
+
+    assert_allclose(stms[0], np.eye(6), atol=1e-15)
+
+    steps = np.array([1e-3, 1e-3, 1e-3, 1e-6, 1e-6, 1e-6])
+    expected = np.empty_like(stms)
+    for column, step in enumerate(steps):
+        delta = np.zeros(6)
+        delta[column] = step
+        expected[:, :, column] = (
+            kepler_propagate(STATE + delta, times, MU)
+            - kepler_propagate(STATE - delta, times, MU)
+        ).T / (2 * step)
+
+    assert_allclose(stms, expected, rtol=0, atol=1e-7 * np.abs(expected).max())
+
+
+def test_two_body_agents_are_analytic(build_sat):
+    jah_sat = build_sat(dynamics=("kepler",), duration=timedelta(days=1))
+    assert jah_sat.two_body
+    jah_sat.propagate()
+
+    assert jah_sat.integration_statistics["nfev"] == 0
+    assert len(jah_sat.state_data) == 86400 // 30 + 1
+
+    expected = kepler_propagate(STATE, [86400.0], MU)[:, 0]
+    assert_allclose(jah_sat.state.compile(), expected)
+
+    stm_sat = build_sat(
+        dynamics=("kepler", "stm"), stm=np.eye(6), duration=timedelta(days=1)
+    )
+    assert stm_sat.two_body
+    stm_sat.propagate()
+
+    assert_allclose(stm_sat.state.position, jah_sat.state.position)
+    _, stms = kepler_propagate(STATE, [86400.0], MU, stm=True)
+    assert_allclose(stm_sat.state.stm, stms[0])
+
+    stm_sat.add_dynamics(("J2",))
+    assert not stm_sat.two_body
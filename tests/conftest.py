@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 
 from python_propagate.scenario import Scenario
 from python_propagate.environment.planets import Earth
@@ -38,3 +39,54 @@ def test_scenario():
     )
 
     return {"sat": jah_sat, "scenario": scenario, "initial_state": initial_state}
+
+
+@pytest.fixture
+def build_sat():
+    # Factory of the test satellite, on its own scenario for every call
+    def build(
+        integrator="dop853",
+        dynamics=("kepler", "J2", "J3", "drag"),
+        stm=None,
+        duration=timedelta(hours=6),
+        dt=timedelta(seconds=30),
+        state=None,
+        central_body=None,
+        **parameters,
+    ):
+        start_time = datetime.strptime("2025-01-15T12:30:00", "%Y-%m-%dT%H:%M:%S")
+
+        scenario = Scenario(
+            central_body=Earth() if central_body is None else central_body,
+            start_time=start_time,
+            duration=duration,
+            dt=dt,
+        )
+
+        if state is None:
+            position = np.array([1340.745, -6663.403, -132.528])
+            velocity = np.array([5.457807, 1.368701, -5.614317])
+            state = State(position=position, velocity=velocity)
+
+        parameters = {
+            "coefficent_of_drag": 2.0,
+            "mass": 1350,
+            "area": 3.6,
+            **parameters,
+        }
+        jah_sat = Spacecraft(
+            state,
+            start_time=start_time,
+            duration=duration,
+            dt=dt,
+            integrator=integrator,
+            **parameters,
+        )
+        jah_sat.set_scenario(scenario=scenario)
+        if stm is not None:
+            jah_sat.state.stm = stm
+        jah_sat.add_dynamics(dynamics=dynamics)
+
+        return jah_sat
+
+    return build